@@ -0,0 +1,286 @@
+"""
+Storage benchmark suite: LocalStorage vs S3Storage
+
+Times the core StorageInterface operations (save_binary, read_binary, exists,
+list_files, copy) across file sizes, plus upload_directory (compared with a
+serial save_binary loop) across file counts, and writes a machine-readable
+JSON report that can be compared between releases.
+
+S3 runs against a local stand-in so no AWS account is needed: by default an
+in-process moto server is started; pass --endpoint to use MinIO or similar.
+
+Usage:
+    python benchmark_storage.py
+    python benchmark_storage.py --backends local --sizes 1KB,1MB --ops 100
+    python benchmark_storage.py --endpoint http://localhost:9000 --bucket bench
+    python benchmark_storage.py --output report.json --baseline previous.json
+"""
+
+import os
+import sys
+import time
+import json
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import boto3
+
+from services.s3interface import StorageInterface, LocalStorage, S3Storage
+
+REPORT_VERSION = 1
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 * 1024}
+
+
+def parse_size(value: str) -> int:
+    """Parse "64KB" / "1MB" / "512" into bytes."""
+    value = value.strip().upper()
+    for unit in ("KB", "MB", "B"):
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(value)
+
+
+def log(message: str):
+    # Progress goes to stderr: stdout is silenced while timing (storage backends print per file)
+    print(message, file=sys.stderr)
+
+
+def summarize(latencies: list[float], total_bytes: int = 0) -> dict:
+    """Throughput and latency percentiles (ms) for a list of per-operation timings (s)."""
+    elapsed = sum(latencies)
+    ordered = sorted(latencies)
+    result = {
+        "ops": len(latencies),
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+    if total_bytes:
+        result["mb_per_sec"] = round(total_bytes / (1024 * 1024) / elapsed, 1) if elapsed else None
+    return result
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_operations(storage: StorageInterface, prefix: str, size: int, ops: int) -> dict:
+    """save_binary, read_binary, exists, copy and list_files on `ops` objects of `size` bytes."""
+    payload = os.urandom(size)
+    keys = [f"{prefix}/obj_{i}.bin" for i in range(ops)]
+
+    results = {}
+    results["save_binary"] = summarize([timed(storage.save_binary, key, payload) for key in keys], size * ops)
+    results["read_binary"] = summarize([timed(storage.read_binary, key) for key in keys], size * ops)
+    results["exists"] = summarize(
+        [timed(storage.exists, key) for key in keys]
+        + [timed(storage.exists, f"{key}.missing") for key in keys]
+    )
+    results["copy"] = summarize(
+        [timed(storage.copy, key, f"{prefix}/copies/obj_{i}.bin") for i, key in enumerate(keys)], size * ops
+    )
+    results["list_files"] = summarize([timed(storage.list_files, f"{prefix}/") for _ in range(5)])
+    results["list_files"]["listed"] = len(storage.list_files(f"{prefix}/"))
+    return results
+
+
+def make_directory(root: Path, count: int, size: int) -> int:
+    """Write `count` files of `size` bytes under root, spread over a few subfolders. Returns total bytes."""
+    for i in range(count):
+        path = root / f"dir_{i % 8}" / f"file_{i}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(size))
+    return count * size
+
+
+def upload_serial(storage: StorageInterface, local_dir: Path, prefix: str) -> int:
+    """Baseline: one save_binary per file, each read fully into memory."""
+    count = 0
+    for file_path in local_dir.rglob("*"):
+        if file_path.is_file():
+            relative_path = file_path.relative_to(local_dir)
+            storage.save_binary(f"{prefix}/{relative_path}", file_path.read_bytes())
+            count += 1
+    return count
+
+
+def upload_tree(storage: StorageInterface, local_dir: Path, prefix: str) -> int:
+    """The backend's directory upload (parallel transfer manager on S3, copytree locally)."""
+    if isinstance(storage, S3Storage):
+        return len(storage.upload_directory(str(local_dir), prefix))
+    storage.copy_directory(str(local_dir), prefix)
+    return sum(1 for path in local_dir.rglob("*") if path.is_file())
+
+
+def bench_upload_directory(storage: StorageInterface, prefix: str, work_dir: Path, count: int, size: int) -> dict:
+    local_dir = work_dir / f"upload_{count}x{size}"
+    total_bytes = make_directory(local_dir, count, size)
+
+    results = {}
+    for name, upload in (("serial", upload_serial), ("upload_directory", upload_tree)):
+        start = time.perf_counter()
+        uploaded = upload(storage, local_dir, f"{prefix}/{name}")
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "files": uploaded,
+            "seconds": round(elapsed, 4),
+            "files_per_sec": round(uploaded / elapsed, 1),
+            "mb_per_sec": round(total_bytes / (1024 * 1024) / elapsed, 1),
+        }
+    return results
+
+
+def run_backend(name: str, storage: StorageInterface, work_dir: Path, args) -> dict:
+    """Run every benchmark against one backend."""
+    report = {"operations": {}, "upload_directory": {}}
+    run_prefix = f"bench/{int(time.time())}"
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for size_label in args.sizes:
+            log(f"[{name}] operations x{args.ops} @ {size_label}")
+            report["operations"][size_label] = bench_operations(
+                storage, f"{run_prefix}/ops_{size_label}", parse_size(size_label), args.ops
+            )
+
+        upload_size = parse_size(args.upload_size)
+        for count in args.counts:
+            log(f"[{name}] upload_directory {count} files @ {args.upload_size}")
+            report["upload_directory"][str(count)] = bench_upload_directory(
+                storage, f"{run_prefix}/upload_{count}", work_dir, count, upload_size
+            )
+
+    return report
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(report: dict):
+    print("Results (ops/sec, p50 ms):")
+    for backend, results in report["backends"].items():
+        for size_label, operations in results["operations"].items():
+            line = ", ".join(f"{op} {s['ops_per_sec']}/s {s['p50_ms']}ms" for op, s in operations.items())
+            print(f"  {backend:>5} {size_label:>6}: {line}")
+        for count, strategies in results["upload_directory"].items():
+            line = ", ".join(
+                f"{strategy} {s['files_per_sec']} files/s {s['mb_per_sec']} MB/s" for strategy, s in strategies.items()
+            )
+            print(f"  {backend:>5} upload {count} files: {line}")
+
+
+def compare(report: dict, baseline: dict):
+    """Print throughput ratios of this run against a previous report (>1 is faster)."""
+    print("\nComparison with baseline (current / baseline):")
+    for backend, current in report["backends"].items():
+        previous = baseline.get("backends", {}).get(backend)
+        if not previous:
+            continue
+        for size_label, operations in current["operations"].items():
+            for op, stats in operations.items():
+                old = previous.get("operations", {}).get(size_label, {}).get(op, {})
+                if stats.get("ops_per_sec") and old.get("ops_per_sec"):
+                    print(f"  {backend:>5} {op:<12} {size_label:>6}: {stats['ops_per_sec'] / old['ops_per_sec']:.2f}x")
+        for count, strategies in current["upload_directory"].items():
+            for strategy, stats in strategies.items():
+                old = previous.get("upload_directory", {}).get(count, {}).get(strategy, {})
+                if old.get("files_per_sec"):
+                    print(f"  {backend:>5} {strategy:<16} {count:>4} files: "
+                          f"{stats['files_per_sec'] / old['files_per_sec']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LocalStorage and S3Storage operations")
+    parser.add_argument("--backends", default="local,s3", help="Comma-separated backends to run (local, s3)")
+    parser.add_argument("--sizes", default="1KB,64KB,1MB", help="Object sizes for single-object operations")
+    parser.add_argument("--ops", type=int, default=50, help="Objects per size for single-object operations")
+    parser.add_argument("--counts", default="10,100", help="File counts for upload_directory")
+    parser.add_argument("--upload-size", default="32KB", help="File size for upload_directory")
+    parser.add_argument("--endpoint", help="S3-compatible endpoint (default: start a local moto server)")
+    parser.add_argument("--bucket", default="cc-forever-bench")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", default="storage_benchmark.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    args = parser.parse_args()
+
+    args.sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    args.counts = [int(count) for count in args.counts.split(",") if count.strip()]
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            "sizes": args.sizes,
+            "ops": args.ops,
+            "counts": args.counts,
+            "upload_size": args.upload_size,
+            "concurrency": args.concurrency,
+        },
+        "backends": {},
+    }
+
+    server = None
+    work_dir = Path(tempfile.mkdtemp(prefix="storage-bench-"))
+    try:
+        if "local" in backends:
+            storage = LocalStorage(base_path=str(work_dir / "local_store"))
+            report["backends"]["local"] = run_backend("local", storage, work_dir, args)
+
+        if "s3" in backends:
+            endpoint = args.endpoint
+            if not endpoint:
+                from moto.server import ThreadedMotoServer
+
+                logging.getLogger("werkzeug").setLevel(logging.ERROR)
+                server = ThreadedMotoServer(port=0, verbose=False)
+                server.start()
+                host, port = server.get_host_and_port()
+                endpoint = f"http://{host}:{port}"
+                os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+                os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+            boto3.client("s3", endpoint_url=endpoint, region_name="us-east-1").create_bucket(Bucket=args.bucket)
+            storage = S3Storage(args.bucket, custom_endpoint=endpoint, max_concurrency=args.concurrency)
+            report["parameters"]["s3_endpoint"] = "moto" if server else endpoint
+            report["backends"]["s3"] = run_backend("s3", storage, work_dir, args)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if server:
+            server.stop()
+
+    print_summary(report)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from typing import Optional
+
+from services.packages.game.interface import get_game_index
+from services.packages.game.index import project_fields, SORT_KEYS
+
+# Router
+games_router = APIRouter(prefix="/games", tags=["games"])
+
+MAX_PAGE_SIZE = 100
+
+
+class GamesPage(BaseModel):
+    projects: list[dict]
+    next_cursor: Optional[str] = None
+    total_count: int
+
+
+def split_list(value: Optional[str]) -> Optional[list[str]]:
+    """Comma-separated query parameter -> list (None if not given)."""
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_project_keys(value: Optional[str]) -> Optional[list[tuple[str, str]]]:
+    """"<timestamp>:<id>,..." -> [(timestamp, id), ...]"""
+    items = split_list(value)
+    if items is None:
+        return None
+    keys = []
+    for item in items:
+        timestamp, sep, project_id = item.partition(":")
+        if not sep:
+            raise HTTPException(status_code=400, detail=f"Expected <timestamp>:<id>, got {item}")
+        keys.append((timestamp, project_id))
+    return keys
+
+
+@games_router.get("", response_model=GamesPage)
+def list_games(
+    base_game: Optional[str] = None,
+    genre: Optional[str] = None,
+    session: Optional[str] = Query(None, description="Session timestamp, e.g. 20251205_202015"),
+    include: Optional[str] = Query(None, description="Only these projects: <timestamp>:<id>,..."),
+    exclude: Optional[str] = Query(None, description="Never these projects: <timestamp>:<id>,..."),
+    sort: str = Query("oldest", description=f"One of: {', '.join(SORT_KEYS)}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Dotted fields to return, e.g. id,timestamp,metadata.name"),
+    omit: Optional[str] = Query(None, description="Dotted fields to leave out, e.g. job_report.summary"),
+):
+    """
+    A page of games from the catalog.
+
+    Filters combine (AND). Pass next_cursor back as `cursor` for the following
+    page; it stays valid while new games are added.
+    """
+    try:
+        entries, next_cursor, total = get_game_index().query(
+            base_game=base_game,
+            genre=genre,
+            session=session,
+            include=parse_project_keys(include),
+            exclude=parse_project_keys(exclude),
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    field_list, omit_list = split_list(fields), split_list(omit)
+    return GamesPage(
+        projects=[project_fields(entry, field_list, omit_list) for entry in entries],
+        next_cursor=next_cursor,
+        total_count=total,
+    )
+
+
+@games_router.get("/search", response_model=GamesPage)
+def search_games(
+    q: str = Query(..., min_length=1, description="Search text, e.g. dungeon fish"),
+    base_game: Optional[str] = None,
+    genre: Optional[str] = None,
+    session: Optional[str] = Query(None, description="Session timestamp, e.g. 20251205_202015"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Dotted fields to return, e.g. id,timestamp,metadata.name"),
+    omit: Optional[str] = Query(None, description="Dotted fields to leave out, e.g. job_report.summary"),
+):
+    """
+    Games matching every word of `q` in their name, genres, base game, prompt
+    or summary (words also match as prefixes: "dung" finds "dungeon"), best
+    match first. Filters work as in GET /games.
+    """
+    try:
+        entries, next_cursor, total = get_game_index().search(
+            q,
+            base_game=base_game,
+            genre=genre,
+            session=session,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    field_list, omit_list = split_list(fields), split_list(omit)
+    return GamesPage(
+        projects=[project_fields(entry, field_list, omit_list) for entry in entries],
+        next_cursor=next_cursor,
+        total_count=total,
+    )
+
+
+@games_router.get("/facets")
+def get_game_facets():
+    """Project counts per base game, genre and session (for filter dropdowns)."""
+    return get_game_index().facets()
@@ -1,15 +1,45 @@
 import os
-import json
 import re
+import json
+import time
+import hashlib
+import random
+import argparse
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 from enum import Enum
-from openai import OpenAI
-from pydantic import BaseModel, Field
+import anyio
+import openai
+from bs4 import BeautifulSoup
+from openai import AsyncOpenAI
+from pydantic import BaseModel, Field, create_model
 from dotenv import load_dotenv
 
+from services.packages.game.catalog import GameCatalog
+from services.packages.game.interface import GameInterface
+from services.packages.game.manifests import write_atomic, INDEX_FILENAME
+from services.packages.game import types as catalog_types
+from services.resources.modifiers import modifiers
+
 load_dotenv()
 
+DEFAULT_MODEL = "gpt-4o-2024-08-06"
+DEFAULT_CONCURRENCY = int(os.getenv("MANIFEST_CONCURRENCY", "8"))
+DEFAULT_RATE = float(os.getenv("MANIFEST_RATE_LIMIT", "5"))  # requests per second
+DEFAULT_MAX_RETRIES = 5
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+CACHE_VERSION = 2
+DEFAULT_CACHE_FILENAME = "manifest_cache.json"
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
 # Define enums for base_game and genre
 class BaseGame(str, Enum):
     SNAKE = "snake"
@@ -67,6 +97,7 @@ class GameMetadata(BaseModel):
 
 class ProjectEntry(BaseModel):
     id: str
+    timestamp: Optional[str] = None
     path_to_index_html: str
     path_to_banner_art: Optional[str] = None
     path_to_cover_art: Optional[str] = None
@@ -113,10 +144,7 @@ def find_art_files(cartridge_arts_path: str, timestamp: str, id_folder: str) ->
 
     return banner_art_path, cover_art_path
 
-def analyze_game_with_openai(html_content: str, client: OpenAI) -> Optional[GameMetadata]:
-    """Use OpenAI to analyze the game HTML and extract metadata"""
-
-    system_prompt = """Analyze the following HTML game code and extract metadata about it.
+SYSTEM_PROMPT = """Analyze the following digest of an HTML game's code (title, scenes, controls, assets, on-screen text and an excerpt) and extract metadata about it.
 
 Valid base_game options (choose exactly one):
 - snake
@@ -137,34 +165,420 @@ Please provide:
 4. Genre tags (1-2 from the list above)
 5. A prompt that could have been used to generate this game (e.g., "make me a snake game with power-ups")"""
 
-    user_prompt = f"HTML Code:\n{html_content[:8000]}"
-
+class AnalysisCache:
+    """
+    Results of earlier analyses, keyed by "<timestamp>/<id>".
+
+    Each record holds the SHA-256 of the project's source (index.html plus
+    the local scripts it loads, everything the digest is built from), the
+    mtimes of its art files and the metadata the model returned. Metadata is
+    reused as long as the source is unchanged; art is looked up again when
+    its mtimes differ.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.records: dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.records = data.get("projects", {})
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"Ignoring unreadable analysis cache {self.path}: {e}")
+
+    def lookup(self, key: str, source_hash: str) -> Optional[GameMetadata]:
+        record = self.records.get(key)
+        if not record or record.get("source_hash") != source_hash:
+            return None
+        try:
+            return GameMetadata(**record["metadata"])
+        except (KeyError, ValueError):
+            return None
+
+    def art_changed(self, key: str, art_mtimes: dict[str, Optional[float]]) -> bool:
+        record = self.records.get(key)
+        return not record or record.get("art_mtimes") != art_mtimes
+
+    def store(self, key: str, source_hash: str, art_mtimes: dict[str, Optional[float]], metadata: GameMetadata):
+        self.records[key] = {
+            "source_hash": source_hash,
+            "art_mtimes": art_mtimes,
+            "metadata": metadata.model_dump(mode="json"),
+        }
+
+    def prune(self, keep: set[str]) -> int:
+        """Drop records of projects not in `keep`; returns how many were dropped."""
+        stale = [key for key in self.records if key not in keep]
+        for key in stale:
+            del self.records[key]
+        return len(stale)
+
+    def save(self):
+        write_atomic(self.path, json.dumps({"version": CACHE_VERSION, "projects": self.records}, indent=2))
+
+def art_mtimes(cartridge_arts_path: str, timestamp: str, id_folder: str) -> dict[str, Optional[float]]:
+    """mtime of every art file candidate for a project (None if missing)."""
+    art_folder = os.path.join(cartridge_arts_path, timestamp, id_folder)
+    mtimes = {}
+    for name in ("banner_art.png_0", "banner_art.png", "cover_art.png_0", "cover_art.png"):
+        try:
+            mtimes[name] = os.path.getmtime(os.path.join(art_folder, name))
+        except OSError:
+            mtimes[name] = None
+    return mtimes
+
+# Compact digest of a game's source for the analysis prompt. The first few
+# thousand characters of index.html are mostly CSS and Phaser bootstrap code;
+# the parts that say what the game is are spread throughout.
+
+DIGEST_MAX_CHARS = int(os.getenv("MANIFEST_DIGEST_MAX_CHARS", "4000"))
+
+# (section title, pattern, max items); the first group of each pattern is collected
+DIGEST_PATTERNS = [
+    ("Scenes", re.compile(r"class\s+(\w+)\s+extends\s+(?:Phaser\.)?Scene\b"), 20),
+    ("Scene keys", re.compile(r"super\(\s*\{\s*key\s*:\s*['\"]([^'\"]+)['\"]"), 20),
+    ("Classes", re.compile(r"class\s+(\w+)(?:\s+extends\s+[\w.]+)?\s*\{"), 30),
+    ("Keyboard keys", re.compile(r"KeyCodes\.(\w+)|keydown-(\w+)|addKeys\(\s*['\"]([^'\"]+)['\"]|create(CursorKeys)\("), 30),
+    ("Input events", re.compile(r"\.on\(\s*['\"]((?:pointer|key|game)\w*(?:-\w+)?)['\"]"), 20),
+    ("Assets", re.compile(r"\.load\.(?:image|spritesheet|audio|atlas|tilemapTiledJSON)\(\s*['\"]([^'\"]+)['\"]"), 40),
+    ("Functions", re.compile(r"(?:function\s+(\w+)\s*\(|^\s{2,}(\w+)\s*\([^)]*\)\s*\{)", re.MULTILINE), 60),
+]
+
+# String literals shown to the player: this.add.text(x, y, '...'), setText('...'), alert('...')
+TEXT_PATTERN = re.compile(r"(?:add\.text\([^,]+,[^,]+,|setText\(|alert\()\s*(['\"`])((?:(?!\1).){2,120})\1")
+
+# Method-call lookalikes that say nothing about the game
+DIGEST_IGNORED_NAMES = {
+    "if", "for", "while", "switch", "catch", "function", "return", "constructor",
+    "preload", "create", "update", "init",
+}
+
+def read_local_scripts(project_path: str, html_content: str) -> dict[str, str]:
+    """Contents of the local <script src> files index.html loads (CDN scripts are skipped)."""
+    scripts = {}
+    for tag in BeautifulSoup(html_content, "html.parser").find_all("script", src=True):
+        src = tag["src"].split("?")[0]
+        if re.match(r"^(https?:)?//", src):
+            continue
+        path = os.path.normpath(os.path.join(project_path, src.lstrip("/")))
+        if not path.startswith(os.path.normpath(project_path) + os.sep):
+            continue
+        content = read_html_file(path)
+        if content:
+            scripts[src] = content
+    return scripts
+
+def game_source_hash(html_content: str, scripts: dict[str, str]) -> str:
+    """SHA-256 over index.html and its local scripts (by path), i.e. every input of the digest."""
+    digest = hashlib.sha256(html_content.encode("utf-8"))
+    for src in sorted(scripts):
+        digest.update(b"\0" + src.encode("utf-8") + b"\0" + scripts[src].encode("utf-8"))
+    return digest.hexdigest()
+
+def build_html_digest(html_content: str, scripts: Optional[dict[str, str]] = None, max_chars: int = DIGEST_MAX_CHARS) -> str:
+    """
+    Summarize a game's source into the parts that describe it.
+
+    Collects the page title and visible text, scene and class names, keyboard
+    and pointer handlers, asset keys, function names and strings shown to the
+    player, from index.html's inline scripts plus any local scripts it loads.
+    Whatever budget is left is filled with the start of the game code itself
+    (CSS and markup are dropped).
+
+    Args:
+        html_content: The game's index.html
+        scripts: Local script files by path (see read_local_scripts)
+        max_chars: Upper bound on the digest's length
+
+    Returns:
+        The digest, at most max_chars characters
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+    code = "\n".join(tag.get_text() for tag in soup.find_all("script") if not tag.get("src"))
+    code += "".join(f"\n{content}" for content in (scripts or {}).values())
+
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    for tag in soup.find_all(["script", "style"]):
+        tag.decompose()
+    page_text = " ".join((soup.body or soup).get_text(" ", strip=True).split())
+
+    sections = []
+    if title:
+        sections.append(f"Title: {title}")
+    if page_text:
+        sections.append(f"Page text: {page_text[:300]}")
+
+    for heading, pattern, limit in DIGEST_PATTERNS:
+        found = []
+        for match in pattern.finditer(code):
+            name = next((group for group in match.groups() if group), None)
+            if name and name not in found and name not in DIGEST_IGNORED_NAMES:
+                found.append(name)
+        if found:
+            sections.append(f"{heading}: {', '.join(found[:limit])}")
+
+    texts = []
+    for match in TEXT_PATTERN.finditer(code):
+        text = match.group(2).strip()
+        if text and text not in texts:
+            texts.append(text)
+    if texts:
+        sections.append("Text shown to the player:\n" + "\n".join(f"- {text}" for text in texts[:40]))
+
+    digest = "\n".join(sections)[:max_chars]
+
+    # Spend what is left on the code itself (minus blank lines and comments)
+    remaining = max_chars - len(digest) - len("\n\nCode excerpt:\n")
+    if remaining > 200 and code.strip():
+        lines = [line.strip() for line in code.splitlines()]
+        excerpt = "\n".join(line for line in lines if line and not line.startswith("//"))
+        digest += "\n\nCode excerpt:\n" + excerpt[:remaining]
+    return digest
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = anyio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await anyio.sleep((1 - self._tokens) / self.rate)
+
+class Progress:
+    """Prints one line per finished project with throughput and ETA."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    def update(self, label: str, ok: bool):
+        self.done += 1
+        if not ok:
+            self.failed += 1
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        eta = (self.total - self.done) / rate if rate else 0.0
+        status = "ok" if ok else "FAILED"
+        print(f"[{self.done}/{self.total}] {label} {status} ({rate:.1f}/s, ETA {eta:.0f}s)")
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff with jitter."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF)
+        except ValueError:
+            pass
+    return random.uniform(0, min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** attempt))
+
+@lru_cache(maxsize=None)
+def metadata_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """A response model with only some of GameMetadata's fields (same descriptions and constraints)."""
+    return create_model(
+        "GameMetadataFields",
+        **{name: (GameMetadata.model_fields[name].annotation, GameMetadata.model_fields[name]) for name in fields},
+    )
+
+async def analyze_game_with_openai(
+    game_digest: str,
+    client: AsyncOpenAI,
+    rate_limiter: TokenBucket,
+    model: str = DEFAULT_MODEL,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    fields: Optional[tuple[str, ...]] = None,
+) -> Optional[BaseModel]:
+    """
+    Use OpenAI to analyze a game (from its digest) and extract metadata.
+
+    Rate limits, timeouts, connection errors and 5xx responses are retried with
+    backoff; every attempt takes a token from the rate limiter.
+
+    Args:
+        game_digest: build_html_digest of the game's source
+        client: AsyncOpenAI client (its own retries disabled)
+        rate_limiter: Shared request rate limiter
+        model: Model used for structured extraction
+        max_retries: Retries after the first attempt
+        fields: Only ask for these GameMetadata fields (default: all of them)
+
+    Returns:
+        The parsed metadata (a GameMetadata, or a model with just `fields`), or None if every attempt failed
+    """
+    response_format = metadata_fields_model(fields) if fields else GameMetadata
+    user_prompt = f"Game digest:\n{game_digest}"
+    if fields:
+        user_prompt = f"Only these fields are needed: {', '.join(fields)}\n\n{user_prompt}"
+
+    for attempt in range(max_retries + 1):
+        await rate_limiter.acquire()
+        try:
+            response = await client.beta.chat.completions.parse(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=response_format,
+            )
+            return response.choices[0].message.parsed
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                print(f"Error analyzing game with OpenAI (giving up after {attempt + 1} attempts): {e}")
+                return None
+            delay = retry_delay(e, attempt)
+            print(f"OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            await anyio.sleep(delay)
+        except Exception as e:
+            print(f"Error analyzing game with OpenAI: {e}")
+            return None
+    return None
+
+# Offline metadata extraction: most games were generated from a known idea
+# (building block + modifiers, see services.ideas.propose_idea), so base_game,
+# genre, prompt and often name and summary can be recovered without the model.
+
+IDEA_FILENAME = "idea.json"
+METADATA_FIELDS = tuple(GameMetadata.model_fields)
+
+# Prompt phrases from services.ideas.propose_idea that don't contain the base game's name
+BASE_GAME_ALIASES = {
+    "block stacking": BaseGame.STACKER,
+    "dungeon crawler": BaseGame.DUNGEON,
+}
+
+# <title> values that say nothing about the game
+GENERIC_TITLES = {"", "game", "index", "document", "phaser", "phaser game", "phaser 3 game", "my game"}
+
+MODIFIER_PATTERN = re.compile(r"that also has (.+?) aspects", re.IGNORECASE)
+
+def read_idea(project_path: str) -> dict:
+    """The idea a project was generated from (resources/idea.json, written by services.claude), or {}."""
     try:
-        response = client.beta.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format=GameMetadata,
-        )
-
-        metadata = response.choices[0].message.parsed
-        return metadata
-    except Exception as e:
-        print(f"Error analyzing game with OpenAI: {e}")
+        with open(os.path.join(project_path, "resources", IDEA_FILENAME), "r", encoding="utf-8") as f:
+            idea = json.load(f)
+        return idea if isinstance(idea, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def base_game_from_text(text: Optional[str]) -> Optional[BaseGame]:
+    """The first base game named in a prompt, folder name or title."""
+    text = (text or "").lower()
+    for phrase, base_game in BASE_GAME_ALIASES.items():
+        if phrase in text:
+            return base_game
+    for base_game in BaseGame:
+        if re.search(rf"\b{base_game.value}\b", text):
+            return base_game
+    return None
+
+def genres_from_prompt(prompt: Optional[str]) -> list[Genre]:
+    """The modifiers in a prompt like "make me a snake game that also has Fishing and Horror aspects"."""
+    match = MODIFIER_PATTERN.search(prompt or "")
+    if not match:
+        return []
+    named = match.group(1)
+    genres = [Genre(modifier) for modifier in modifiers if modifier.lower() in named.lower()]
+    return genres[:2]
+
+def extract_title(html_content: str) -> Optional[str]:
+    title = BeautifulSoup(html_content, "html.parser").title
+    text = title.get_text(strip=True) if title else ""
+    return None if text.lower() in GENERIC_TITLES else text
+
+def extract_metadata(project_path: str, html_content: str, stored: Optional[dict] = None) -> dict:
+    """
+    Derive as much of GameMetadata as possible without the model.
+
+    Sources, most trusted first: the building blocks copied into resources/,
+    the stored idea (resources/idea.json), the game catalog entry, and the
+    page <title>.
+
+    Args:
+        project_path: The project folder (projects/<timestamp>/<id>)
+        html_content: The project's index.html
+        stored: The project's metadata from the game catalog, if any
+
+    Returns:
+        The fields that could be determined, by GameMetadata field name
+    """
+    stored = stored or {}
+    idea = read_idea(project_path)
+    prompt = idea.get("prompt") or stored.get("prompt")
+    title = extract_title(html_content)
+    known = {}
+
+    resources_path = os.path.join(project_path, "resources")
+    block_names = list(idea.get("blocks") or [])
+    if os.path.isdir(resources_path):
+        block_names = sorted(os.listdir(resources_path)) + block_names
+    for candidate in block_names + [stored.get("base_game"), prompt, title]:
+        base_game = base_game_from_text(candidate)
+        if base_game:
+            known["base_game"] = base_game
+            break
+
+    genres = genres_from_prompt(prompt)
+    if not genres:
+        genres = [Genre(genre) for genre in stored.get("genre", []) if genre in Genre._value2member_map_][:2]
+    if genres:
+        known["genre"] = genres
+
+    if prompt:
+        known["prompt"] = prompt
+    if stored.get("name") or title:
+        known["name"] = stored.get("name") or title
+    if stored.get("summary"):
+        known["summary"] = stored["summary"]
+    return known
+
+def fill_offline(known: dict, id_folder: str) -> Optional[GameMetadata]:
+    """Complete partially extracted metadata without the model; None if base_game is unknown."""
+    if "base_game" not in known:
         return None
-
-def scan_projects_folder(projects_path: str, cartridge_arts_path: str) -> List[TimestampGroup]:
-    """Scan the projects folder and build the manifest structure"""
-
-    # Initialize OpenAI client
-    client = OpenAI()
-
-    timestamp_groups = {}
-
-    # Walk through the projects directory
-    for timestamp_folder in os.listdir(projects_path):
+    defaults = {
+        "name": f"{known['base_game'].value.title()} #{id_folder}",
+        "summary": "",
+        "genre": [],
+        "prompt": "",
+    }
+    # Not validated: genre may be empty when the prompt named no modifiers
+    return GameMetadata.model_construct(**{**defaults, **known})
+
+def stored_metadata(catalog: Optional[GameCatalog], timestamp: str, id_folder: str) -> Optional[dict]:
+    entry = catalog.get(timestamp, id_folder) if catalog else None
+    return entry.metadata.model_dump() if entry else None
+
+def find_projects(projects_path: str) -> list[tuple[str, str, str]]:
+    """
+    Find every project with an index.html.
+
+    Returns:
+        (timestamp folder, id folder, path to index.html) tuples, sorted
+    """
+    found = []
+    for timestamp_folder in sorted(os.listdir(projects_path)):
         timestamp_path = os.path.join(projects_path, timestamp_folder)
 
         # Skip if not a directory or doesn't match timestamp format
@@ -175,12 +589,8 @@ def scan_projects_folder(projects_path: str, cartridge_arts_path: str) -> List[T
             print(f"Skipping non-timestamp folder: {timestamp_folder}")
             continue
 
-        # Initialize timestamp group if not exists
-        if timestamp_folder not in timestamp_groups:
-            timestamp_groups[timestamp_folder] = []
-
         # Look for id subfolders
-        for id_folder in os.listdir(timestamp_path):
+        for id_folder in sorted(os.listdir(timestamp_path), key=lambda name: (not name.isdigit(), name.zfill(12))):
             id_path = os.path.join(timestamp_path, id_folder)
 
             if not os.path.isdir(id_path):
@@ -192,49 +602,211 @@ def scan_projects_folder(projects_path: str, cartridge_arts_path: str) -> List[T
                 print(f"No index.html found in {id_path}")
                 continue
 
-            print(f"Processing: {timestamp_folder}/{id_folder}")
-
-            # Read HTML content
-            html_content = read_html_file(index_html_path)
-            if not html_content:
-                continue
-
-            # Analyze with OpenAI
-            metadata = analyze_game_with_openai(html_content, client)
-            if not metadata:
-                print(f"Failed to analyze {timestamp_folder}/{id_folder}")
-                continue
-
-            # Build relative path to index.html
-            relative_path = f"{timestamp_folder}/{id_folder}/index.html"
+            found.append((timestamp_folder, id_folder, index_html_path))
+    return found
+
+async def scan_projects_folder(
+    projects_path: str,
+    cartridge_arts_path: str,
+    client: Optional[AsyncOpenAI],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_limiter: Optional[TokenBucket] = None,
+    model: str = DEFAULT_MODEL,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    cache: Optional[AnalysisCache] = None,
+    incremental: bool = False,
+    catalog: Optional[GameCatalog] = None,
+    offline: bool = False,
+) -> List[TimestampGroup]:
+    """
+    Scan the projects folder and build the manifest structure.
+
+    Projects are analyzed concurrently, at most `concurrency` requests in
+    flight and no faster than the rate limiter allows. The result is ordered
+    by session and project folder regardless of completion order.
+
+    With a cache, every analysis is recorded in it. In incremental mode only
+    new or changed games are analyzed and only those (plus games whose art
+    changed) are returned, for updating in the game catalog.
+
+    Metadata is first extracted locally (see extract_metadata); the model is
+    only asked for the fields that are still missing. In offline mode it is
+    never called and missing fields get placeholders.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    projects = find_projects(projects_path)
+    rate_limiter = rate_limiter or TokenBucket(DEFAULT_RATE)
+    limiter = anyio.CapacityLimiter(concurrency)
+    entries: list[Optional[ProjectEntry]] = [None] * len(projects)
+
+    # Decide up front which projects need the model
+    pending, unchanged = [], 0
+    for position, (timestamp_folder, id_folder, index_html_path) in enumerate(projects):
+        key = f"{timestamp_folder}/{id_folder}"
+        html_content = read_html_file(index_html_path)
+        if not html_content:
+            continue
+        scripts = read_local_scripts(os.path.dirname(index_html_path), html_content)
+        source_hash = game_source_hash(html_content, scripts)
+        mtimes = art_mtimes(cartridge_arts_path, timestamp_folder, id_folder)
+        cached = cache.lookup(key, source_hash) if cache and incremental else None
+        if cached is not None and not cache.art_changed(key, mtimes):
+            unchanged += 1
+            continue
+        known = {} if cached is not None else extract_metadata(
+            os.path.dirname(index_html_path), html_content, stored_metadata(catalog, timestamp_folder, id_folder)
+        )
+        pending.append((position, timestamp_folder, id_folder, html_content, scripts, source_hash, mtimes, cached, known))
+
+    progress = Progress(len(pending))
+    used_model = 0
+
+    async def analyze(position: int, timestamp_folder: str, id_folder: str, html_content: str, scripts: dict,
+                      source_hash: str, mtimes: dict, cached: Optional[GameMetadata], known: dict):
+        nonlocal used_model
+        metadata, complete = cached, True
+        missing = tuple(field for field in METADATA_FIELDS if field not in known)
+        if metadata is None and not missing:
+            metadata = GameMetadata(**known)
+        elif metadata is None and offline:
+            metadata, complete = fill_offline(known, id_folder), False
+        elif metadata is None:
+            used_model += 1
+            # Parsing and regex scanning is CPU work: off the event loop, and not holding a request slot
+            game_digest = await anyio.to_thread.run_sync(build_html_digest, html_content, scripts)
+            async with limiter:
+                partial = await analyze_game_with_openai(
+                    game_digest, client, rate_limiter, model, max_retries,
+                    fields=missing if known else None,
+                )
+            if partial is not None:
+                metadata = GameMetadata(**{**partial.model_dump(), **known})
+
+        progress.update(f"{timestamp_folder}/{id_folder}", metadata is not None)
+        if not metadata:
+            return
+        # Placeholder fields from offline mode are not cached, so a later run can fill them in
+        if cache and complete:
+            cache.store(f"{timestamp_folder}/{id_folder}", source_hash, mtimes, metadata)
+
+        # Find art files
+        banner_art_path, cover_art_path = find_art_files(cartridge_arts_path, timestamp_folder, id_folder)
+
+        entries[position] = ProjectEntry(
+            id=id_folder,
+            timestamp=timestamp_folder,
+            path_to_index_html=f"{timestamp_folder}/{id_folder}/index.html",
+            path_to_banner_art=banner_art_path,
+            path_to_cover_art=cover_art_path,
+            metadata=metadata
+        )
 
-            # Find art files
-            banner_art_path, cover_art_path = find_art_files(cartridge_arts_path, timestamp_folder, id_folder)
+    if incremental:
+        print(f"{unchanged} projects unchanged since the last run")
+    print(f"Analyzing {len(pending)} projects (concurrency {concurrency}, {rate_limiter.rate:g} requests/s)")
+    async with anyio.create_task_group() as tg:
+        for project in pending:
+            tg.start_soon(analyze, *project)
 
-            # Create project entry
-            project_entry = ProjectEntry(
-                id=id_folder,
-                path_to_index_html=relative_path,
-                path_to_banner_art=banner_art_path,
-                path_to_cover_art=cover_art_path,
-                metadata=metadata
-            )
+    timestamp_groups: dict[str, list[ProjectEntry]] = {}
+    for entry in entries:
+        if entry is not None:
+            timestamp_groups.setdefault(entry.timestamp, []).append(entry)
 
-            timestamp_groups[timestamp_folder].append(project_entry)
+    print(f"{progress.total - used_model} projects described without the model, {used_model} sent to it")
+    if progress.failed:
+        print(f"{progress.failed} of {progress.total} projects failed to analyze")
 
     # Convert to final format with indices
-    result = []
-    for idx, (timestamp, projects) in enumerate(sorted(timestamp_groups.items())):
-        if projects:  # Only include timestamps that have valid projects
-            result.append(TimestampGroup(
-                index=idx,
-                id=timestamp,
-                projects=projects
-            ))
-
-    return result
+    return [
+        TimestampGroup(index=idx, id=timestamp, projects=projects)
+        for idx, (timestamp, projects) in enumerate(sorted(timestamp_groups.items()))
+    ]
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Analyze every project with OpenAI, store the results in the game catalog and export the manifests"
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum requests in flight (env MANIFEST_CONCURRENCY)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="Maximum requests per second (env MANIFEST_RATE_LIMIT)")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket size (default: one second of --rate)")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help="Retries per project on rate limits and transient errors")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--base-url", default=None,
+                        help="OpenAI-compatible endpoint, e.g. a local stub (default: OPENAI_BASE_URL or api.openai.com)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never call the model; fields that can't be extracted locally get placeholders")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only analyze new or changed games and update them in the game catalog")
+    parser.add_argument("--cache", default=None,
+                        help=f"Analysis cache file (default: {DEFAULT_CACHE_FILENAME} next to this script)")
+    args = parser.parse_args()
+
+    # Defaults come from the environment, so they are checked here rather than by argparse
+    if args.concurrency < 1:
+        parser.error(f"--concurrency (or MANIFEST_CONCURRENCY) must be at least 1, got {args.concurrency}")
+    if args.rate <= 0:
+        parser.error(f"--rate (or MANIFEST_RATE_LIMIT) must be positive, got {args.rate:g}")
+    if args.burst is not None and args.burst < 1:
+        parser.error(f"--burst must be at least 1, got {args.burst:g}")
+    if args.max_retries < 0:
+        parser.error(f"--max-retries can't be negative, got {args.max_retries}")
+    return args
+
+def store_in_catalog(catalog: GameCatalog, groups: List[TimestampGroup]) -> int:
+    """
+    Upsert analyzed projects into the game catalog.
+
+    Fields the analysis doesn't produce (e.g. the agent's job_report) are kept
+    from the existing catalog entry.
+
+    Returns:
+        Number of projects stored
+    """
+    entries = []
+    for group in groups:
+        for project in group.projects:
+            update = project.model_dump(mode="json")
+            existing = catalog.get(project.timestamp, project.id)
+            if existing is not None:
+                update = {**existing.model_dump(mode="json"), **update}
+            entries.append(catalog_types.ProjectEntry.model_validate(update))
+    if entries:
+        catalog.upsert(entries)
+    return len(entries)
+
+def prune_missing(games: GameInterface, cache: AnalysisCache, projects_path: Path) -> int:
+    """
+    Forget projects whose folder (or index.html) is gone from disk.
+
+    Removes them from the game catalog, so the next export drops them from
+    the manifests, and from the analysis cache.
+
+    Returns:
+        Number of projects removed from the catalog
+    """
+    on_disk = {(timestamp, id_folder) for timestamp, id_folder, _ in find_projects(str(projects_path))}
+    missing = [
+        (entry.timestamp, entry.id)
+        for entry in games.list_projects()
+        # Entries without a session were never exported and can't be matched to a folder
+        if entry.timestamp and (entry.timestamp, entry.id) not in on_disk
+    ]
+    for timestamp, project_id in missing:
+        print(f"Removing {timestamp}/{project_id} from the game catalog: no longer on disk")
+    removed = games.remove_projects(missing)
+    dropped = cache.prune({f"{timestamp}/{id_folder}" for timestamp, id_folder in on_disk})
+    if dropped:
+        print(f"Dropped {dropped} analysis cache records of projects no longer on disk")
+    return removed
 
 def main():
+    args = parse_args()
+
     # Get the projects folder path
     backend_dir = Path(__file__).parent
     projects_path = backend_dir / "projects"
@@ -250,21 +822,43 @@ def main():
 
     print(f"Scanning projects folder: {projects_path}")
 
-    # Scan and analyze all projects
-    manifest_data = scan_projects_folder(str(projects_path), str(cartridge_arts_path))
-
-    # Convert to dict for JSON serialization
-    manifest_dict = [group.model_dump() for group in manifest_data]
+    # Retries are handled here (with the rate limiter), not by the client
+    client = None if args.offline else AsyncOpenAI(base_url=args.base_url, max_retries=0)
+    # Results go into the game catalog (projects/catalog.sqlite3), which the
+    # server reads and exports the manifests from
+    games = GameInterface()
+    catalog = games.catalog
+    cache = AnalysisCache(Path(args.cache) if args.cache else backend_dir / DEFAULT_CACHE_FILENAME)
 
-    # Write manifest.json
-    manifest_path = projects_path / "manifest.json"
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest_dict, f, indent=2)
-
-    print(f"\nManifest generated successfully: {manifest_path}")
-    print(f"Total timestamp groups: {len(manifest_dict)}")
-    total_projects = sum(len(group['projects']) for group in manifest_dict)
-    print(f"Total projects analyzed: {total_projects}")
+    # Scan and analyze all projects (the cache is saved even if the run is interrupted)
+    try:
+        manifest_data = anyio.run(lambda: scan_projects_folder(
+            str(projects_path),
+            str(cartridge_arts_path),
+            client,
+            concurrency=args.concurrency,
+            rate_limiter=TokenBucket(args.rate, args.burst),
+            model=args.model,
+            max_retries=args.max_retries,
+            cache=cache,
+            incremental=args.incremental,
+            catalog=catalog,
+            offline=args.offline,
+        ))
+    finally:
+        cache.save()
+
+    stored = store_in_catalog(catalog, manifest_data)
+    print(f"\nStored {stored} projects in the game catalog")
+    removed = prune_missing(games, cache, projects_path)
+    cache.save()
+    if removed:
+        print(f"Removed {removed} projects no longer on disk")
+
+    # One manifest per session plus the root index (projects/index.json), from the whole catalog
+    exported = games.export_manifests()
+    print(f"Manifests generated successfully: {projects_path / INDEX_FILENAME}")
+    print(f"Total projects in manifests: {exported}")
 
 if __name__ == "__main__":
     main()
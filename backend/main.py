@@ -1,7 +1,6 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import threading
 import signal
 import sys
@@ -10,14 +9,19 @@ from dotenv import load_dotenv
 from pathlib import Path
 load_dotenv()
 
-from services.s3interface import get_storage, S3Storage
+from services.s3interface import get_storage, get_content_store, S3Storage, TieredStorage
+from services import tracing
+from services.http_caching import CachingStaticFiles
 
 from idea_routes import idea_router
 from stats_routes import stats_router
 from s3_routes import s3_router
+from games_routes import games_router
 from services.claude import start as claude_start
 from services.ideas import start as ideas_start
 from services.state import get_state as get_agent_state, request_stop, is_online, get_all_ideas
+from services.tool_metrics import get_tool_stats
+from services.project_index import get_project_index
 
 claude_thread: threading.Thread
 ideas_thread: threading.Thread
@@ -35,6 +39,12 @@ def test():
 def cleanup():
     global count
     # TODO: kill threads
+    storage = get_storage()
+    if isinstance(storage, TieredStorage):
+        failed = storage.flush()
+        if failed:
+            print(f"{failed} write-back uploads to S3 still failing at shutdown")
+    tracing.shutdown()
     print(f"Final count: {count}")
 
 
@@ -69,17 +79,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with tracing.span(f"{request.method} {request.url.path}", {
+        "http.method": request.method,
+        "http.target": request.url.path,
+    }):
+        response = await call_next(request)
+        tracing.annotate({"http.status_code": response.status_code})
+        return response
+
+
 app.include_router(idea_router)
 app.include_router(stats_router)
 app.include_router(s3_router)
+app.include_router(games_router)
 
-# Mount static files for projects
-app.mount("/projects", StaticFiles(directory="projects", html=True), name="projects")
+# Mount static files for projects (Cache-Control is chosen per path, see services.http_caching)
+app.mount("/projects", CachingStaticFiles(directory="projects", html=True, prefix="projects"), name="projects")
 
 # Mount static files for cartridge arts
-app.mount("/cartridge_arts", StaticFiles(directory="cartridge_arts"), name="cartridge_arts")
+app.mount("/cartridge_arts", CachingStaticFiles(directory="cartridge_arts", prefix="cartridge_arts"), name="cartridge_arts")
 
-app.mount("/assets", StaticFiles(directory="assets"), name="assets")
+app.mount("/assets", CachingStaticFiles(directory="assets", prefix="assets"), name="assets")
 
 
 @app.get("/agent/status")
@@ -87,6 +109,12 @@ def agent_status():
     return get_agent_state()
 
 
+@app.get("/agent/tool-stats")
+def agent_tool_stats(job_id: int | None = None, session: str | None = None):
+    """Latency, payload size and error counts per tool, globally or for one job (latest run unless session is given)."""
+    return get_tool_stats(job_id, session)
+
+
 @app.post("/agent/start")
 def start_agent():
     global claude_thread
@@ -143,24 +171,42 @@ def list_projects():
     return result
 
 
+def project_file_url(storage: S3Storage, path: str) -> str:
+    """URL of a project file in S3; deduplicated projects are only reachable through the /s3 proxy."""
+    if get_content_store() is not None and path.startswith("projects/"):
+        return f"/s3/{path}"
+    return storage.get_url(path)
+
+
 @app.get("/get-entry-point/{timestamp}/{job_id}")
 def get_entry_point(timestamp: str, job_id: int):
     """Find the index.html entry point for a project, searching recursively if needed"""
+    tracing.annotate({"job.id": job_id, "job.timestamp": timestamp})
     storage = get_storage()
 
+    # Projects finished since indexes were introduced answer straight from the index
+    project_index = get_project_index(timestamp, job_id)
+    if project_index is not None:
+        if project_index.entry_point is None:
+            return {"error": "No index.html found", "path": None}
+        entry_path = f"projects/{timestamp}/{job_id}/{project_index.entry_point}"
+        if isinstance(storage, S3Storage):
+            return {"path": project_file_url(storage, entry_path), "storage": "s3"}
+        return {"path": f"/{entry_path}", "storage": "local"}
+
     # Check if using S3 storage
     if isinstance(storage, S3Storage):
         # For S3, return the S3 URL directly
         s3_path = f"projects/{timestamp}/{job_id}/index.html"
         if storage.exists(s3_path):
-            return {"path": storage.get_url(s3_path), "storage": "s3"}
+            return {"path": project_file_url(storage, s3_path), "storage": "s3"}
 
         # Search for index.html in S3 bucket under the project prefix
         files = storage.list_files(f"projects/{timestamp}/{job_id}/")
         index_files = [f for f in files if f.endswith("index.html")]
 
         if index_files:
-            return {"path": storage.get_url(index_files[0]), "storage": "s3"}
+            return {"path": project_file_url(storage, index_files[0]), "storage": "s3"}
 
         return {"error": "No index.html found in S3", "path": None}
 
@@ -193,6 +239,7 @@ def get_asset_url(asset_type: str, timestamp: str, job_id: int, filename: str):
 
     asset_type: "cartridge_arts" or "projects"
     """
+    tracing.annotate({"job.id": job_id, "job.timestamp": timestamp})
     storage = get_storage()
 
     if asset_type == "cartridge_arts":
@@ -200,9 +247,22 @@ def get_asset_url(asset_type: str, timestamp: str, job_id: int, filename: str):
     else:
         path = f"projects/{timestamp}/{job_id}/assets/{filename}"
 
+    project_index = get_project_index(timestamp, job_id)
+    if project_index is not None:
+        if asset_type == "cartridge_arts":
+            found = project_index.has_art(filename)
+        else:
+            found = project_index.has_file(f"assets/{filename}")
+
+        if not found:
+            return {"error": "Asset not found", "url": None}
+        if isinstance(storage, S3Storage):
+            return {"url": project_file_url(storage, path), "storage": "s3"}
+        return {"url": f"/{path}", "storage": "local"}
+
     if isinstance(storage, S3Storage):
         if storage.exists(path):
-            return {"url": storage.get_url(path), "storage": "s3"}
+            return {"url": project_file_url(storage, path), "storage": "s3"}
         return {"error": "Asset not found in S3", "url": None}
 
     # Local storage
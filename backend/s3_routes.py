@@ -2,24 +2,63 @@
 S3 Proxy Routes
 
 Provides endpoints to serve files from S3 storage, mirroring the functionality
-of FastAPI's StaticFiles for local storage.
+of FastAPI's StaticFiles for local storage. Object bodies are streamed to the
+client in chunks, and Range requests are passed through to S3 (206 responses).
+Responses carry ETag/Last-Modified from storage plus a per-prefix Cache-Control
+policy, and conditional requests are answered with 304. Project text files with
+precompressed variants (written at sync time) are served as Brotli or gzip
+according to Accept-Encoding. With the local storage backend the same routes
+serve files by path through FileResponse, so bodies never pass through Python bytes.
+Projects stored deduplicated (CONTENT_ADDRESSED_STORAGE) are resolved to their
+blobs through the project's content manifest.
+
+With S3_PROXY_MODE=redirect, files other than HTML documents are answered with a
+307 to a presigned S3 URL (or the CloudFront URL when a distribution is
+configured), so game bytes go straight from S3/CloudFront to the browser. HTML
+is still streamed so relative links in games keep resolving against /s3/.
 
 Endpoints:
     GET /s3/projects/{path} - Serve project files from S3
     GET /s3/cartridge_arts/{path} - Serve cartridge art files from S3
     GET /s3/assets/{path} - Serve asset files from S3
+    GET /s3/cache/stats - Hit rate and eviction statistics for the object cache
     POST /s3/test/upload - Upload a test file to S3
     GET /s3/test/{filename} - Retrieve a test file from S3
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+import os
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from pathlib import Path
-
-from services.s3interface import get_storage, S3Storage
+from typing import Optional
+
+from services.s3interface import (
+    get_async_storage,
+    get_content_store,
+    S3Storage,
+    TieredStorage,
+    InvalidRangeError,
+    NotModifiedError,
+    ENCODING_SUFFIXES,
+    is_compressible,
+)
+from services.object_cache import get_object_cache
+from services.http_caching import (
+    is_not_modified,
+    validator_headers,
+    cache_control_for,
+    choose_encoding,
+    local_file_response,
+    project_index_for,
+)
+from services.project_index import ProjectIndex
 
 s3_router = APIRouter(prefix="/s3", tags=["s3"])
 
+# Browsers may reuse a redirect this long; presigned URLs stay valid for
+# at least PRESIGN_REFRESH_SECONDS after they're handed out
+REDIRECT_MAX_AGE = 60
+
 
 def get_content_type(path: str) -> str:
     """Determine content type from file extension."""
@@ -52,33 +91,156 @@ def get_content_type(path: str) -> str:
     return content_types.get(extension, "application/octet-stream")
 
 
-def serve_s3_file(prefix: str, path: str) -> Response:
+def choose_variant(project_index: Optional[ProjectIndex], path: str, request: Request) -> Optional[str]:
     """
-    Fetch a file from S3 and return it as a Response.
+    Pick a precompressed variant of a project file for this request.
+
+    Only variants listed in the project's index are considered, so choosing
+    one costs no storage round trips. Range requests always get the identity body.
+
+    Args:
+        project_index: Index of the project the file belongs to (from project_index_for)
+        path: The path within projects/ (e.g., "20231123_120000/1/main.js")
+        request: Incoming request, used for its Range and Accept-Encoding headers
+
+    Returns:
+        Content-Encoding of the chosen variant, or None
+    """
+    if project_index is None or request.headers.get("range"):
+        return None
+
+    parts = path.split("/", 2)
+    if len(parts) < 3:
+        return None
+
+    relative_path = parts[2]
+
+    available = {
+        encoding for encoding, suffix in ENCODING_SUFFIXES.items()
+        if project_index.has_file(relative_path + suffix)
+    }
+    return choose_encoding(request.headers.get("accept-encoding"), available)
+
+
+def is_redirect_mode() -> bool:
+    """Whether S3_PROXY_MODE asks for redirects instead of streaming bodies."""
+    return os.getenv("S3_PROXY_MODE", "stream").lower() == "redirect"
+
+
+def redirect_url(storage: S3Storage, object_key: str, content_type: str, encoding: Optional[str], content_addressed: bool) -> str:
+    """
+    Where to send the browser for an object in redirect mode.
+
+    CloudFront URLs are used when a distribution is configured, except for
+    content-addressed blobs whose stored metadata doesn't carry the file's
+    type; those (and private buckets without CloudFront) get a presigned URL
+    that sets Content-Type/Content-Encoding on the response.
+    """
+    if storage.cloudfront_domain and not content_addressed:
+        return storage.get_url(object_key)
+    return storage.presigned_url(object_key, content_type=content_type, content_encoding=encoding)
+
+
+async def serve_s3_file(prefix: str, path: str, request: Request) -> Response:
+    """
+    Stream a file from S3 as a Response.
+
+    The S3 round trip runs in a worker thread so it never blocks the event loop,
+    and the body is forwarded in chunks instead of being buffered in memory.
+    Small objects are served from the read-through object cache when enabled.
+    Files kept on local disk (local storage backend) are served by path instead.
 
     Args:
         prefix: The S3 prefix/directory (e.g., "projects", "cartridge_arts")
         path: The path within the prefix
+        request: Incoming request, used for its Range and conditional headers
 
     Returns:
-        Response with file content and appropriate content-type
+        StreamingResponse or FileResponse (200, or 206 for a satisfiable Range
+        request), 304 if the client's cached copy is still current, or a 307
+        to S3/CloudFront in redirect mode
     """
-    storage = get_storage()
+    storage = get_async_storage()
+    content_store = get_content_store()
+    full_path = f"{prefix}/{path}"
 
-    if not isinstance(storage, S3Storage):
-        raise HTTPException(
-            status_code=404,
-            detail="S3 storage not configured. Use local static file mounts instead."
-        )
+    if not isinstance(storage.storage, S3Storage):
+        key = await storage.run(content_store.resolve, full_path) if content_store else full_path
+        local_file = await storage.local_path(key)
+        if local_file is None:
+            raise HTTPException(status_code=404, detail=f"File not found: {full_path}")
+        return await storage.run(local_file_response, full_path, local_file, request.headers)
+
+    # Decides the Cache-Control policy and which variants exist; read in a
+    # worker thread since a cache miss is a storage round trip
+    project_index = await storage.run(project_index_for, full_path)
+    finished = project_index is not None
+
+    encoding_headers = {}
+    object_key = full_path
+    encoding = None
+    if is_compressible(path):
+        encoding_headers["Vary"] = "Accept-Encoding"
+        encoding = choose_variant(project_index, path, request)
+        if encoding:
+            encoding_headers["Content-Encoding"] = encoding
+            object_key = full_path + ENCODING_SUFFIXES[encoding]
+
+    if content_store:
+        object_key = await storage.run(content_store.resolve, object_key)
 
-    full_path = f"{prefix}/{path}"
-    data = storage.read_binary(full_path)
+    content_type = get_content_type(path)
+    if is_redirect_mode() and content_type != "text/html":
+        url = await storage.run(
+            redirect_url, storage.storage, object_key, content_type, encoding, content_store is not None
+        )
+        headers = {"Cache-Control": f"private, max-age={REDIRECT_MAX_AGE}"}
+        if "Vary" in encoding_headers:
+            headers["Vary"] = encoding_headers["Vary"]
+        return RedirectResponse(url, status_code=307, headers=headers)
 
-    if data is None:
+    cache = get_object_cache()
+    if_none_match = request.headers.get("if-none-match")
+    try:
+        if cache:
+            stream = await storage.run(cache.open, object_key, request.headers.get("range"))
+        else:
+            # Let S3 answer a single-ETag revalidation without sending the body
+            stream = await storage.open_stream(
+                object_key,
+                request.headers.get("range"),
+                if_none_match=if_none_match if if_none_match and "," not in if_none_match else None,
+            )
+    except NotModifiedError:
+        return Response(status_code=304, headers={
+            "ETag": if_none_match,
+            "Cache-Control": cache_control_for(full_path, finished),
+            **encoding_headers,
+        })
+    except InvalidRangeError as e:
+        headers = {"Content-Range": f"bytes */{e.object_size}"} if e.object_size is not None else {}
+        return Response(status_code=416, headers=headers)
+
+    if stream is None:
         raise HTTPException(status_code=404, detail=f"File not found: {full_path}")
 
-    content_type = get_content_type(path)
-    return Response(content=data, media_type=content_type)
+    validators = validator_headers(full_path, stream.etag, stream.last_modified, finished)
+    if is_not_modified(request.headers, stream.etag, stream.last_modified):
+        stream.chunks.close()
+        return Response(status_code=304, headers={**validators, **encoding_headers})
+
+    headers = {
+        **validators,
+        **encoding_headers,
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stream.content_length),
+    }
+    status_code = 200
+    if stream.content_range:
+        headers["Content-Range"] = stream.content_range
+        status_code = 206
+
+    return StreamingResponse(stream.chunks, status_code=status_code, media_type=content_type, headers=headers)
 
 
 # =============================================================================
@@ -86,7 +248,7 @@ def serve_s3_file(prefix: str, path: str) -> Response:
 # =============================================================================
 
 @s3_router.get("/projects/{path:path}")
-async def get_s3_project_file(path: str):
+async def get_s3_project_file(path: str, request: Request):
     """
     Serve a project file from S3.
 
@@ -94,11 +256,11 @@ async def get_s3_project_file(path: str):
 
     Example: GET /s3/projects/20231123/1/index.html
     """
-    return serve_s3_file("projects", path)
+    return await serve_s3_file("projects", path, request)
 
 
 @s3_router.get("/cartridge_arts/{path:path}")
-async def get_s3_cartridge_art(path: str):
+async def get_s3_cartridge_art(path: str, request: Request):
     """
     Serve a cartridge art file from S3.
 
@@ -106,11 +268,11 @@ async def get_s3_cartridge_art(path: str):
 
     Example: GET /s3/cartridge_arts/20231123/1/cover.png
     """
-    return serve_s3_file("cartridge_arts", path)
+    return await serve_s3_file("cartridge_arts", path, request)
 
 
 @s3_router.get("/assets/{path:path}")
-async def get_s3_asset(path: str):
+async def get_s3_asset(path: str, request: Request):
     """
     Serve an asset file from S3.
 
@@ -118,7 +280,22 @@ async def get_s3_asset(path: str):
 
     Example: GET /s3/assets/logo.png
     """
-    return serve_s3_file("assets", path)
+    return await serve_s3_file("assets", path, request)
+
+
+@s3_router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Report object cache statistics (hits, misses, revalidations, evictions, size),
+    plus the local disk tier's size and write-back queue when TieredStorage is in use.
+    """
+    cache = get_object_cache()
+    stats = {"enabled": False} if cache is None else {"enabled": True, **cache.get_stats()}
+
+    storage = get_async_storage().storage
+    if isinstance(storage, TieredStorage):
+        stats["disk_tier"] = storage.get_tier_stats()
+    return stats
 
 
 # =============================================================================
@@ -133,9 +310,9 @@ async def test_upload():
     Returns:
         URL of the uploaded file and storage info
     """
-    storage = get_storage()
+    storage = get_async_storage()
 
-    if not isinstance(storage, S3Storage):
+    if not isinstance(storage.storage, S3Storage):
         raise HTTPException(
             status_code=400,
             detail="S3 storage not configured. Set STORAGE_BACKEND=s3 in environment."
@@ -144,7 +321,7 @@ async def test_upload():
     manifest_path = "projects/manifest.json"
     content = "[]"
 
-    url = storage.save_text(manifest_path, content)
+    url = await storage.save_text(manifest_path, content)
 
     return {
         "success": True,
@@ -157,13 +334,13 @@ async def test_upload():
 
 
 @s3_router.get("/test/{filename}")
-async def test_retrieve(filename: str):
+async def test_retrieve(filename: str, request: Request):
     """
     Retrieve a test file from S3.
 
     Use this after /test/upload to verify roundtrip works.
     """
-    return serve_s3_file("_test", filename)
+    return await serve_s3_file("_test", filename, request)
 
 
 @s3_router.get("/test/check")
@@ -173,9 +350,9 @@ async def test_check():
 
     Returns storage configuration and connection status.
     """
-    storage = get_storage()
+    storage = get_async_storage()
 
-    if not isinstance(storage, S3Storage):
+    if not isinstance(storage.storage, S3Storage):
         return {
             "storage_type": "local",
             "s3_configured": False,
@@ -184,7 +361,7 @@ async def test_check():
 
     # Try to list files to verify connection
     try:
-        files = storage.list_files("_test/")
+        files = await storage.list_files("_test/")
         return {
             "storage_type": "s3",
             "s3_configured": True,
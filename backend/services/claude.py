@@ -21,7 +21,19 @@ from pydantic import BaseModel, Field, ValidationError
 from datetime import datetime
 
 from services.state import Idea, start_job, add_message, finish_job, set_online, should_stop, pop_idea, update_idea, get_session_timestamp
-from services.s3interface import get_storage
+from services.s3interface import (
+    get_storage,
+    get_content_store,
+    S3Storage,
+    is_compressible,
+    compress_variants,
+    map_file,
+    replace_file,
+    ENCODING_SUFFIXES,
+)
+from services import tracing
+from services import tool_metrics
+from services.project_index import build_project_index, write_project_index
 
 
 def fetch_from_queue():
@@ -68,6 +80,7 @@ def save_binary_file(file_name, data):
     return storage.save_binary(normalized_path, data)
 
 
+@tracing.traced("gemini.generate_cover_art")
 def generate_cover_art_image(file_name: str, prompt: str, background_color: str):
     """Generate cover art for games - PS2 style box art."""
     client = genai.Client(
@@ -115,6 +128,7 @@ def generate_cover_art_image(file_name: str, prompt: str, background_color: str)
         else:
             print(chunk.text)
 
+@tracing.traced("gemini.generate_banner_art")
 def generate_banner_art_image(file_name: str, prompt: str):
     """Generate banner art for games - vertical banner art."""
     client = genai.Client(
@@ -160,6 +174,7 @@ def generate_banner_art_image(file_name: str, prompt: str):
             print(chunk.text)
 
 
+@tracing.traced("gemini.generate")
 def generate(file_name: str, prompt: str, background_color: str):
     """Generate images for tool use - with transparent white background."""
     client = genai.Client(
@@ -226,10 +241,36 @@ async def generate_cover_art(session_timestamp: str, job_id: int, prompt: str):
     return generate_cover_art_image(storage_path, prompt, "#ffffff")
 
 
+def precompress_project(local_path: Path) -> int:
+    """
+    Write gzip/Brotli variants next to every compressible file (html, js, css, json, svg),
+    e.g. index.html -> index.html.gz / index.html.br, so requests never compress on the fly.
+
+    Returns:
+        Number of variant files written
+    """
+    written = 0
+    for file_path in list(local_path.rglob("*")):
+        if not file_path.is_file() or not is_compressible(file_path.name):
+            continue
+
+        with map_file(file_path) as data:
+            variants = compress_variants(data)
+
+        for encoding, body in variants.items():
+            # Replaced, not rewritten: a synced variant may be linked to a shared blob
+            replace_file(f"{file_path}{ENCODING_SUFFIXES[encoding]}", body)
+            written += 1
+
+    return written
+
+
 def sync_project_to_storage(local_project_path: str, storage_prefix: str):
     """
     Sync a local project directory to storage (S3 or local).
-    This uploads all HTML, JS, CSS, and image files from the local project.
+    This uploads all HTML, JS, CSS, and image files from the local project,
+    along with precompressed variants of the text files (stored with Content-Encoding).
+    With CONTENT_ADDRESSED_STORAGE enabled, files are stored as deduplicated blobs.
 
     Args:
         local_project_path: Local path to the project (e.g., "./projects/20231123/1")
@@ -246,8 +287,22 @@ def sync_project_to_storage(local_project_path: str, storage_prefix: str):
         print(f"Project path does not exist: {local_project_path}")
         return uploaded_urls
 
+    precompress_project(local_path)
+
+    content_store = get_content_store()
+    if content_store:
+        # Only blobs storage doesn't have yet are uploaded; files are served via the /s3 proxy
+        manifest = content_store.upload_directory(str(local_path), storage_prefix)
+        return [f"/s3/{storage_prefix}/{relative_path}" for relative_path in manifest]
+
+    if isinstance(storage, S3Storage):
+        # Parallel, streaming (and multipart for large files) upload of the whole tree
+        uploaded_urls = storage.upload_directory(str(local_path), storage_prefix)
+        print(f"Synced {len(uploaded_urls)} files to storage: {storage_prefix}")
+        return uploaded_urls
+
     # Walk through all files in the project directory
-    for file_path in local_path.rglob("*"):
+    for file_path in list(local_path.rglob("*")):
         if file_path.is_file():
             # Get relative path from project root
             relative_path = file_path.relative_to(local_path)
@@ -263,11 +318,13 @@ def sync_project_to_storage(local_project_path: str, storage_prefix: str):
     return uploaded_urls
 
 @tool("use_image_generation_tool", "Use the image generation tool to generate an image, with the background color in hex value", {"file_name": str, "prompt": str, "background_color": str})
+@tracing.traced("mcp.use_image_generation_tool")
 async def use_image_generation_tool(args) -> str:
     return generate(args["file_name"], args["prompt"], "#ffffff")
 
 
 @tool("validate_javascript_tool", "Use the validate javascript tool to validate your index.html file at the end to see if there are any bugs left to fix", {"path_to_file": str})
+@tracing.traced("mcp.validate_javascript_tool")
 async def validate_javascript_tool(args) -> list[str]:
     return validate_javascript(args["path_to_file"])
 
@@ -366,6 +423,12 @@ class RunOnceResult(BaseModel):
 
 
 async def run_once(idea: Dict) -> RunOnceResult | None:
+    # Every span opened while the job runs (agent, Gemini, MCP tools, storage) is tagged with its id
+    with tracing.job_context(idea["id"]), tracing.span("run_once", {"job.prompt": idea["prompt"]}):
+        return await _run_once(idea)
+
+
+async def _run_once(idea: Dict) -> RunOnceResult | None:
     prompt = idea["prompt"]
     job_id = idea["id"]
     session_timestamp = get_session_timestamp()
@@ -380,6 +443,7 @@ async def run_once(idea: Dict) -> RunOnceResult | None:
     update_idea(job_id, project_path=relative_project_path)
 
     start_job(job_id, prompt)
+    tool_metrics.start_job(job_id, session_timestamp)
 
     # Set global project path for image generation tool
     global _current_project_path
@@ -419,6 +483,13 @@ async def run_once(idea: Dict) -> RunOnceResult | None:
                     else:
                         print("Error: % s" % err)
 
+            # Keep the idea with the project so manifest metadata can be derived offline (see generate_manifest.py)
+            with open(project_resources_path + "/idea.json", "w") as f:
+                json.dump({
+                    "prompt": prompt,
+                    "blocks": [block["folder_path"].split("/")[-1] for block in idea["blocks"]],
+                }, f, indent=2)
+
             server = create_sdk_mcp_server(
                 name="gemini",
                 version="1.0.0",
@@ -449,15 +520,23 @@ You must NEVER use cdn link for images. You ALWAYS use the local image files fou
             instructions = f"We are using Phaser 3 to make web games. First read all the files in the resources folder. When you are done, please summarize what you made and how you did it. For certain games, you may need to generate images. Use the following instructions to generate images: {image_gen_instructions}. Make sure only one index.html file is present in the root of this project."
 
             async with ClaudeSDKClient(options=options) as client:
-                await client.query(f"{prompt} using phaser.js. \n\n{instructions}")
+                with tracing.span("agent.query"):
+                    await client.query(f"{prompt} using phaser.js. \n\n{instructions}")
+
+                # One span per streamed message, covering the wait since the previous one
+                waiting_since = time.time_ns()
                 async for msg in client.receive_response():
+                    tracing.record_span("agent.message", waiting_since, attributes={"message.type": type(msg).__name__})
                     print(msg)
                     add_message(msg)
+                    tool_metrics.observe_message(msg)
 
                     if hasattr(msg, 'structured_output'):
                         # Validate and get fully typed result
                         job_report = JobReport.model_validate(msg.structured_output)
 
+                    waiting_since = time.time_ns()
+
         except ValidationError as e:
             print(f"Validation error: {e}")
         except Exception as e:
@@ -482,9 +561,19 @@ You must NEVER use cdn link for images. You ALWAYS use the local image files fou
     finally:
         # Sync the completed project to storage (S3 or local depending on config)
         storage_prefix = f"projects/{session_timestamp}/{job_id}"
-        sync_project_to_storage(project_path, storage_prefix)
+        with tracing.span("storage.sync_project", {"storage.path": storage_prefix}):
+            sync_project_to_storage(project_path, storage_prefix)
         print(f"Project synced to storage: {storage_prefix}")
 
+        # Precompute the entry point / asset index so lookups need no storage round trips
+        try:
+            project_index = build_project_index(project_path, session_timestamp, job_id)
+            if project_index.files:
+                write_project_index(project_index)
+        except Exception as e:
+            print(f"Error writing project index for {storage_prefix}: {e}")
+
+        tool_metrics.finish_job()
         finish_job()
         # Clean up empty directories in projects folder (including nested timestamp dirs)
         projects_dir = Path("./projects")
@@ -0,0 +1,282 @@
+"""
+HTTP Caching
+
+Cache-Control policies, conditional-request handling and precompressed
+variant selection shared by the /s3 proxy routes and the local static file
+mounts.
+
+Policies are chosen by storage key:
+    - Manifests and indexes (*.json directly under projects/) are short-lived,
+      since they change every time a game finishes
+    - Hashed session manifests (projects/<timestamp>/manifest.<hash>.json)
+      never change, so they are immutable
+    - Project files are immutable once their job has finished (its project
+      index exists); until then the agent may still be rewriting them, so
+      they are revalidated on every request
+    - Cartridge art is immutable once written
+    - Shared assets get a moderate lifetime
+
+Whether a job has finished is looked up separately (project_index_for reads
+storage on a cache miss, so it runs in a worker thread) and passed in, which
+keeps cache_control_for free of I/O and safe to call on the event loop.
+
+Usage:
+    from services.http_caching import cache_control_for, is_not_modified, project_index_for
+
+    finished = await anyio.to_thread.run_sync(project_index_for, key) is not None
+    headers["Cache-Control"] = cache_control_for(key, finished)
+    if is_not_modified(request.headers, etag, last_modified):
+        ...  # respond 304
+"""
+
+import os
+import re
+import mimetypes
+
+import anyio
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from services.project_index import ProjectIndex, get_project_index
+from services.s3interface import ENCODING_SUFFIXES, is_compressible
+
+SHORT_LIVED = "public, max-age=60, must-revalidate"
+IMMUTABLE = "public, max-age=31536000, immutable"
+ASSET = "public, max-age=86400"
+DEFAULT = "no-cache"
+
+PROJECT_FILE_PATTERN = re.compile(r"^projects/(\d{8}_\d{6})/([^/]+)/")
+
+# Request scope key CachingStaticFiles.get_response passes the lookup to file_response under
+FINISHED_SCOPE_KEY = "http_caching.project_finished"
+
+
+def project_index_for(key: str) -> Optional[ProjectIndex]:
+    """
+    Project index of the project a storage key belongs to.
+
+    Blocking: reads storage when the index isn't cached, so call it from a
+    worker thread when on the event loop.
+
+    Returns:
+        The index, or None if the key isn't a project file or its job hasn't finished
+    """
+    match = PROJECT_FILE_PATTERN.search(key.lstrip("/"))
+    if match is None:
+        return None
+    timestamp, job_id = match.groups()
+    return get_project_index(timestamp, job_id)
+
+
+def _project_file_policy(finished: bool) -> str:
+    """Project files: immutable once the job wrote its project index, revalidated before."""
+    return IMMUTABLE if finished else DEFAULT
+
+
+# (pattern, Cache-Control or function of whether the job finished) pairs, first match wins
+CACHE_POLICIES = [
+    (re.compile(r"^projects/\d{8}_\d{6}/manifest\.[0-9a-f]{16}\.json$"), IMMUTABLE),
+    (re.compile(r"(^|/)manifest\.json$"), SHORT_LIVED),
+    (re.compile(r"^projects/[^/]+\.json$"), SHORT_LIVED),
+    (PROJECT_FILE_PATTERN, _project_file_policy),
+    (re.compile(r"^cartridge_arts/\d{8}_\d{6}/[^/]+/"), IMMUTABLE),
+    (re.compile(r"^assets/"), ASSET),
+]
+
+
+def cache_control_for(key: str, finished: bool = False) -> str:
+    """
+    Cache-Control value for a storage key. Does no I/O.
+
+    Args:
+        key: Storage key (e.g., "projects/20231123_120000/1/index.html")
+        finished: Whether the key's project job has finished (project_index_for
+            found its index); only matters for project files
+    """
+    key = key.lstrip("/")
+    for pattern, policy in CACHE_POLICIES:
+        if pattern.search(key):
+            return policy(finished) if callable(policy) else policy
+    return DEFAULT
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """Format a datetime as an HTTP date (RFC 7231), e.g. for Last-Modified."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _strip_weak(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against an object's validators.
+
+    If-None-Match takes precedence when present (weak comparison, as required
+    for GET), otherwise If-Modified-Since is compared at one-second resolution.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {_strip_weak(tag) for tag in if_none_match.split(",")}
+        return _strip_weak(etag) in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None or last_modified.tzinfo is None:
+            return False
+        return int(last_modified.timestamp()) <= int(since.timestamp())
+
+    return False
+
+
+def validator_headers(key: str, etag: Optional[str], last_modified: Optional[datetime], finished: bool = False) -> dict:
+    """ETag, Last-Modified and Cache-Control headers for a stored object (finished as in cache_control_for)."""
+    headers = {"Cache-Control": cache_control_for(key, finished)}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """
+    Pick the best precompressed variant the client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding header value (e.g., "gzip, deflate, br")
+        available: Encodings stored for the file (e.g., {"gzip", "br"})
+
+    Returns:
+        "br" or "gzip" (Brotli preferred), or None to serve the identity body
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in ENCODING_SUFFIXES:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and quality > 0:
+            return encoding
+    return None
+
+
+def local_file_response(
+    key: str,
+    full_path,
+    request_headers: Mapping[str, str],
+    stat_result: Optional[os.stat_result] = None,
+    status_code: int = 200,
+    finished: Optional[bool] = None,
+):
+    """
+    Serve a file on local disk by path, without reading it into memory.
+
+    Starlette's FileResponse hands the path to the server (pathsend, i.e.
+    sendfile, where supported) or streams it in chunks, and answers Range
+    requests itself. This adds the key's Cache-Control policy, picks a
+    precompressed .br/.gz sibling of text files when the client accepts one,
+    and answers conditional requests with 304.
+
+    Args:
+        key: Storage key the file is served as (e.g., "projects/20231123_120000/1/index.html")
+        full_path: Filesystem path of the file
+        request_headers: Incoming request headers
+        stat_result: os.stat() of full_path, if already known
+        status_code: Status for the full response (StaticFiles uses 404 for its html 404 page)
+        finished: Whether the key's project job has finished; None looks it up
+            with project_index_for, which may read storage (fine in a worker thread)
+    """
+    if finished is None:
+        finished = project_index_for(key) is not None
+    headers = {"Cache-Control": cache_control_for(key, finished)}
+    # Typed by the key: the file itself may be a variant or a content-addressed blob
+    media_type = mimetypes.guess_type(key)[0]
+    if is_compressible(str(full_path)):
+        headers["Vary"] = "Accept-Encoding"
+        available = {
+            encoding: f"{full_path}{suffix}"
+            for encoding, suffix in ENCODING_SUFFIXES.items()
+            if os.path.isfile(f"{full_path}{suffix}")
+        }
+        encoding = choose_encoding(request_headers.get("accept-encoding"), available)
+        if encoding:
+            full_path = available[encoding]
+            stat_result = None
+            headers["Content-Encoding"] = encoding
+
+    if stat_result is None:
+        stat_result = os.stat(full_path)
+
+    response = FileResponse(
+        full_path, status_code=status_code, stat_result=stat_result, headers=headers, media_type=media_type
+    )
+    last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+    if is_not_modified(request_headers, response.headers.get("etag"), last_modified):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+class CachingStaticFiles(StaticFiles):
+    """
+    StaticFiles that adds a per-prefix Cache-Control policy and serves
+    precompressed .br/.gz siblings of text files when the client accepts them.
+
+    ETag/Last-Modified come from Starlette's FileResponse; see local_file_response.
+    """
+
+    def __init__(self, *args, prefix: str, **kwargs):
+        """
+        Args:
+            prefix: Storage prefix this mount serves (e.g., "projects"), used to pick the policy
+        """
+        super().__init__(*args, **kwargs)
+        self.prefix = prefix.strip("/")
+
+    def _key(self, path: str) -> str:
+        return f"{self.prefix}/{path}".replace(os.sep, "/")
+
+    async def get_response(self, path: str, scope):
+        # file_response runs on the event loop, so the project index lookup
+        # (a storage read on a miss) happens here, in a worker thread
+        key = self._key(path)
+        if PROJECT_FILE_PATTERN.search(key):
+            scope[FINISHED_SCOPE_KEY] = await anyio.to_thread.run_sync(project_index_for, key) is not None
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200):
+        return local_file_response(
+            self._key(self.get_path(scope)), full_path, Headers(scope=scope), stat_result, status_code,
+            finished=scope.get(FINISHED_SCOPE_KEY, False),
+        )
@@ -0,0 +1,304 @@
+"""
+Object Cache
+
+Bounded read-through LRU cache in front of the storage backend, used by the
+/s3 proxy routes so popular game files aren't fetched from S3 on every request.
+
+Entries are keyed by object key and bounded by a total byte budget; objects
+larger than the per-object limit are streamed straight through and never
+cached. After `revalidate_after` seconds an entry is revalidated with a
+conditional request (If-None-Match with the cached ETag), so an unchanged
+object costs a round trip but no transfer.
+
+Cached bodies live in memory, or on disk when a cache directory is configured.
+
+Usage:
+    from services.object_cache import get_object_cache
+
+    cache = get_object_cache()
+    stream = cache.open("projects/20231123/1/index.html")
+    stats = cache.get_stats()
+"""
+
+import os
+import time
+import hashlib
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from services.s3interface import (
+    StorageInterface,
+    StorageStream,
+    NotModifiedError,
+    STREAM_CHUNK_SIZE,
+    get_storage,
+    parse_byte_range,
+    iter_body,
+    replace_file,
+)
+
+
+@dataclass
+class _CacheEntry:
+    size: int
+    etag: Optional[str]
+    content_type: Optional[str]
+    last_modified: Optional[datetime]
+    checked_at: float
+    data: Optional[bytes] = None  # None when the body lives on disk
+
+
+class ObjectCache:
+    """LRU cache of whole objects with a byte budget and ETag revalidation."""
+
+    def __init__(
+        self,
+        storage: StorageInterface,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_object_bytes: int = 8 * 1024 * 1024,
+        revalidate_after: float = 60.0,
+        disk_path: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            storage: Backend to read through to
+            max_bytes: Total byte budget across all cached bodies
+            max_object_bytes: Objects larger than this are never cached
+            revalidate_after: Seconds an entry is served without asking storage
+            disk_path: Optional directory to keep bodies on disk instead of in memory
+        """
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self.max_object_bytes = min(max_object_bytes, max_bytes)
+        self.revalidate_after = revalidate_after
+        self.disk_path = Path(disk_path) if disk_path else None
+
+        self._lock = Lock()
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._size = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "refreshed": 0,
+            "evictions": 0,
+            "bypassed": 0,
+        }
+
+        if self.disk_path:
+            # The index is in memory only, so bodies left by a previous process are unreachable
+            shutil.rmtree(self.disk_path, ignore_errors=True)
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _stream_entry(self, key: str, entry: _CacheEntry, byte_range: Optional[str]) -> StorageStream:
+        """Serve a cached body, slicing it locally for Range requests."""
+        byte_span = parse_byte_range(byte_range, entry.size)
+        start, end = byte_span if byte_span else (0, entry.size - 1)
+        length = end - start + 1 if entry.size else 0
+
+        if entry.data is not None:
+            chunks = (
+                entry.data[offset:min(offset + STREAM_CHUNK_SIZE, end + 1)]
+                for offset in range(start, end + 1, STREAM_CHUNK_SIZE)
+            )
+        else:
+            f = open(self._disk_file(key), "rb")
+            f.seek(start)
+            chunks = iter_body(f, remaining=length)
+
+        return StorageStream(
+            chunks=chunks,
+            content_length=length,
+            content_type=entry.content_type,
+            content_range=f"bytes {start}-{end}/{entry.size}" if byte_span else None,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+        )
+
+    def _store(self, key: str, stream: StorageStream) -> _CacheEntry:
+        """Read a full stream into the cache and evict down to the byte budget."""
+        data = b"".join(stream.chunks)
+        entry = _CacheEntry(
+            size=len(data),
+            etag=stream.etag,
+            content_type=stream.content_type,
+            last_modified=stream.last_modified,
+            checked_at=time.monotonic(),
+        )
+
+        if self.disk_path:
+            # Unique temp name per writer: concurrent misses on a key may store it at once
+            replace_file(self._disk_file(key), data)
+        else:
+            entry.data = data
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._size -= old_entry.size
+                self._stats["evictions"] += 1
+                evicted.append(old_key)
+
+        if self.disk_path:
+            for old_key in evicted:
+                self._disk_file(old_key).unlink(missing_ok=True)
+
+        if entry.data is None:
+            # Keep the bytes around for this response even though the entry lives on disk
+            entry = replace(entry, data=data)
+        return entry
+
+    def _drop(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._size -= entry.size
+        if entry and self.disk_path:
+            self._disk_file(key).unlink(missing_ok=True)
+
+    def open(self, key: str, byte_range: Optional[str] = None) -> Optional[StorageStream]:
+        """
+        Open an object through the cache.
+
+        Args:
+            key: Object key (e.g., "projects/20231123/1/index.html")
+            byte_range: Optional HTTP Range header value
+
+        Returns:
+            StorageStream, or None if the object doesn't exist
+
+        Raises:
+            InvalidRangeError: If the range can't be satisfied
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+
+        if entry and time.monotonic() - entry.checked_at < self.revalidate_after:
+            try:
+                stream = self._stream_entry(key, entry, byte_range)
+                self._count("hits")
+                return stream
+            except FileNotFoundError:
+                # Evicted from disk by another request since the lookup
+                entry = None
+
+        if entry:
+
+            try:
+                stream = self.storage.open_stream(key, if_none_match=entry.etag)
+            except NotModifiedError:
+                entry.checked_at = time.monotonic()
+                try:
+                    stream = self._stream_entry(key, entry, byte_range)
+                    self._count("revalidated")
+                    self._count("hits")
+                    return stream
+                except FileNotFoundError:
+                    # Evicted from disk by another request while revalidating
+                    stream = self.storage.open_stream(key)
+
+            if stream is None:
+                self._drop(key)
+                return None
+
+            self._count("refreshed")
+        else:
+            self._count("misses")
+            if byte_range:
+                # Don't pull a whole object to answer a partial request for something uncached
+                return self.storage.open_stream(key, byte_range)
+            stream = self.storage.open_stream(key)
+            if stream is None:
+                return None
+
+        if stream.content_length > self.max_object_bytes:
+            self._drop(key)
+            self._count("bypassed")
+            if byte_range:
+                stream.chunks.close()
+                return self.storage.open_stream(key, byte_range)
+            return stream
+
+        entry = self._store(key, stream)
+        return self._stream_entry(key, entry, byte_range)
+
+    def get_stats(self) -> dict:
+        """Hit rate, eviction and size statistics."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"] + self._stats["refreshed"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "max_object_bytes": self.max_object_bytes,
+                "storage": "disk" if self.disk_path else "memory",
+            }
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        if self.disk_path:
+            for key in keys:
+                self._disk_file(key).unlink(missing_ok=True)
+
+
+# Cache instance singleton
+_cache_instance: Optional[ObjectCache] = None
+
+
+def get_object_cache() -> Optional[ObjectCache]:
+    """
+    Get the shared object cache for the configured storage backend.
+
+    Uses environment variables:
+    - S3_CACHE_MAX_BYTES: Total byte budget (default: 256 MiB, "0" disables the cache)
+    - S3_CACHE_MAX_OBJECT_BYTES: Largest object that will be cached (default: 8 MiB)
+    - S3_CACHE_REVALIDATE_SECONDS: Seconds before an entry is revalidated (default: 60)
+    - S3_CACHE_DIR: Keep cached bodies in this directory instead of memory
+
+    Returns:
+        ObjectCache instance, or None if caching is disabled
+    """
+    global _cache_instance
+
+    max_bytes = int(os.getenv("S3_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    if max_bytes <= 0:
+        return None
+
+    if _cache_instance is None:
+        _cache_instance = ObjectCache(
+            get_storage(),
+            max_bytes=max_bytes,
+            max_object_bytes=int(os.getenv("S3_CACHE_MAX_OBJECT_BYTES", str(8 * 1024 * 1024))),
+            revalidate_after=float(os.getenv("S3_CACHE_REVALIDATE_SECONDS", "60")),
+            disk_path=os.getenv("S3_CACHE_DIR"),
+        )
+
+    return _cache_instance
@@ -0,0 +1,228 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from .types import ProjectEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    id TEXT NOT NULL,
+    base_game TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    entry TEXT NOT NULL,
+    UNIQUE (timestamp, id)
+);
+CREATE INDEX IF NOT EXISTS idx_projects_base_game ON projects (base_game, seq);
+CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at);
+
+CREATE TABLE IF NOT EXISTS project_genres (
+    genre TEXT NOT NULL,
+    seq INTEGER NOT NULL REFERENCES projects (seq) ON DELETE CASCADE,
+    PRIMARY KEY (genre, seq)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_schema_lock = Lock()
+_initialized: set[str] = set()
+
+
+def session_created_at(timestamp: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a session timestamp like "20251205_202015"."""
+    try:
+        return datetime.strptime(timestamp or "", "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+
+class GameCatalog:
+    """
+    Indexed SQLite store for ProjectEntry records.
+
+    Each project is a row keyed by (timestamp, id) holding the full entry as
+    JSON, with indexed columns for the session timestamp, base game and
+    creation time, and a genre table for genre filters. `seq` is the insertion
+    order and doubles as a stable cursor.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """A connection for one transaction (committed on success), closed afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        key = str(self.db_path.resolve())
+        with _schema_lock:
+            if key in _initialized:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(SCHEMA)
+            _initialized.add(key)
+
+    def upsert(self, entries: list[ProjectEntry], created_at: Optional[float] = None) -> int:
+        """
+        Insert or update projects in one transaction.
+
+        Args:
+            entries: Projects to store (an existing row with the same timestamp and id is updated)
+            created_at: Creation time for all entries; defaults to the session timestamp, then now
+
+        Returns:
+            seq of the last stored entry
+        """
+        last_seq = 0
+        with self._connect() as conn:
+            for entry in entries:
+                # A replaced entry keeps its seq (position) and creation time
+                last_seq = conn.execute(
+                    """
+                    INSERT INTO projects (timestamp, id, base_game, name, created_at, entry)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (timestamp, id) DO UPDATE SET
+                        base_game = excluded.base_game, name = excluded.name, entry = excluded.entry
+                    RETURNING seq
+                    """,
+                    (
+                        entry.timestamp or "",
+                        entry.id,
+                        entry.metadata.base_game,
+                        entry.metadata.name,
+                        created_at or session_created_at(entry.timestamp) or time.time(),
+                        entry.model_dump_json(),
+                    ),
+                ).fetchone()[0]
+                conn.execute("DELETE FROM project_genres WHERE seq = ?", (last_seq,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO project_genres (genre, seq) VALUES (?, ?)",
+                    [(genre, last_seq) for genre in entry.metadata.genre],
+                )
+        return last_seq
+
+    def delete(self, keys: list[tuple[str, str]]) -> list[int]:
+        """
+        Remove projects by (timestamp, id) in one transaction.
+
+        Returns:
+            seqs of the removed projects
+        """
+        removed = []
+        with self._connect() as conn:
+            for timestamp, project_id in keys:
+                row = conn.execute(
+                    "DELETE FROM projects WHERE timestamp = ? AND id = ? RETURNING seq", (timestamp, project_id)
+                ).fetchone()
+                if row:
+                    removed.append(row[0])
+        return removed
+
+    def query(
+        self,
+        base_game: Optional[str] = None,
+        genre: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        after_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> list[tuple[int, ProjectEntry]]:
+        """
+        Filtered projects in insertion order (or newest first).
+
+        Returns:
+            (seq, entry) pairs; pass the last seq as after_seq to get the next page
+        """
+        clauses, params = [], []
+        if base_game is not None:
+            clauses.append("p.base_game = ?")
+            params.append(base_game)
+        if genre is not None:
+            clauses.append("p.seq IN (SELECT seq FROM project_genres WHERE genre = ?)")
+            params.append(genre)
+        if timestamp is not None:
+            clauses.append("p.timestamp = ?")
+            params.append(timestamp)
+        if created_after is not None:
+            clauses.append("p.created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("p.created_at < ?")
+            params.append(created_before)
+        if after_seq is not None:
+            clauses.append("p.seq < ?" if newest_first else "p.seq > ?")
+            params.append(after_seq)
+
+        sql = "SELECT p.seq, p.entry FROM projects p"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.seq DESC" if newest_first else " ORDER BY p.seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [(seq, ProjectEntry.model_validate_json(entry)) for seq, entry in rows]
+
+    def get(self, timestamp: str, project_id: str) -> Optional[ProjectEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT entry FROM projects WHERE timestamp = ? AND id = ?", (timestamp, project_id)
+            ).fetchone()
+        return ProjectEntry.model_validate_json(row[0]) if row else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def facets(self) -> dict:
+        """Project counts per base game, genre and session."""
+        with self._connect() as conn:
+            return {
+                "base_game": dict(conn.execute(
+                    "SELECT base_game, COUNT(*) FROM projects GROUP BY base_game ORDER BY base_game"
+                ).fetchall()),
+                "genre": dict(conn.execute(
+                    "SELECT genre, COUNT(*) FROM project_genres GROUP BY genre ORDER BY genre"
+                ).fetchall()),
+                "timestamp": dict(conn.execute(
+                    "SELECT timestamp, COUNT(*) FROM projects GROUP BY timestamp ORDER BY timestamp"
+                ).fetchall()),
+            }
+
+    def last_seq(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM projects").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
@@ -0,0 +1,293 @@
+import base64
+import binascii
+import json
+import math
+from bisect import bisect_right, insort
+from threading import Lock
+from typing import Optional
+
+from .search import SearchIndex
+from .types import ProjectEntry
+
+ProjectKey = tuple[str, str]  # (timestamp, id)
+
+# Sort orders: each maps an entry to a unique, totally ordered key (seq breaks ties)
+SORT_KEYS = {
+    "oldest": lambda seq, entry: (seq,),
+    "newest": lambda seq, entry: (-seq,),
+    "name": lambda seq, entry: (entry["metadata"]["name"].lower(), seq),
+    "cover": lambda seq, entry: (0 if entry.get("path_to_cover_art") else 1, seq),
+}
+
+# Element types of each sort's keys (the seq appended to every key included),
+# so a cursor from another sort or a forged one is rejected instead of compared
+SORT_KEY_TYPES = {
+    "oldest": (int, int),
+    "newest": (int, int),
+    "name": (str, int, int),
+    "cover": (int, int, int),
+}
+
+
+def encode_cursor(sort_key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> tuple:
+    """
+    Decode a cursor and check it has the shape of the keys it is compared with.
+
+    Args:
+        cursor: Opaque cursor from encode_cursor
+        types: Expected type of each key element (int accepts only integers,
+            float any finite number)
+
+    Raises:
+        ValueError: Malformed cursor, or one made for a different ordering
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    def matches(value, expected: type) -> bool:
+        if isinstance(value, bool):
+            return False
+        if expected is float:
+            return isinstance(value, (int, float)) and math.isfinite(value)
+        return isinstance(value, expected)
+
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(matches(value, expected) for value, expected in zip(key, types))
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(key)
+
+
+def project_fields(entry: dict, fields: Optional[list[str]] = None, exclude: Optional[list[str]] = None) -> dict:
+    """
+    Apply a field projection to a serialized entry.
+
+    Args:
+        entry: ProjectEntry.model_dump()
+        fields: Dotted paths to keep (e.g., ["id", "metadata.name"]); everything if omitted
+        exclude: Dotted paths to drop (e.g., ["job_report.summary"])
+    """
+    if fields:
+        projected: dict = {}
+        for path in fields:
+            source, target = entry, projected
+            parts = path.split(".")
+            for part in parts[:-1]:
+                if not isinstance(source, dict) or not isinstance(source.get(part), dict):
+                    break
+                source = source[part]
+                target = target.setdefault(part, {})
+            else:
+                if isinstance(source, dict) and parts[-1] in source:
+                    target[parts[-1]] = source[parts[-1]]
+        entry = projected
+    else:
+        entry = json.loads(json.dumps(entry))
+
+    for path in exclude or []:
+        target = entry
+        parts = path.split(".")
+        for part in parts[:-1]:
+            target = target.get(part) if isinstance(target, dict) else None
+        if isinstance(target, dict):
+            target.pop(parts[-1], None)
+
+    return entry
+
+
+class GameIndex:
+    """
+    In-memory index over the game catalog for the /games API.
+
+    Holds every entry once, per-field posting sets (base game, genre, session)
+    for filters, and one sorted key list per sort order, so a page is a bisect
+    to the cursor plus a walk over matching entries, and a full-text
+    SearchIndex over the metadata. GameInterface.add_project feeds new and
+    updated projects in as they are written.
+    """
+
+    def __init__(self, rows: list[tuple[int, ProjectEntry]] = ()):
+        self._lock = Lock()
+        self._entries: dict[int, dict] = {}
+        self._seq_by_key: dict[ProjectKey, int] = {}
+        self._by_base_game: dict[str, set[int]] = {}
+        self._by_genre: dict[str, set[int]] = {}
+        self._by_session: dict[str, set[int]] = {}
+        self._orders: dict[str, list[tuple]] = {name: [] for name in SORT_KEYS}
+        self._search = SearchIndex()
+
+        with self._lock:
+            for seq, entry in rows:
+                self._add_locked(seq, entry)
+
+    def add(self, seq: int, entry: ProjectEntry):
+        """Index a new project, or re-index an updated one."""
+        with self._lock:
+            self._add_locked(seq, entry)
+
+    def remove(self, seq: int):
+        """Drop a project that was deleted from the catalog."""
+        with self._lock:
+            if seq in self._entries:
+                self._remove_locked(seq)
+
+    def _add_locked(self, seq: int, entry: ProjectEntry):
+        if seq in self._entries:
+            self._remove_locked(seq)
+
+        data = entry.model_dump()
+        self._entries[seq] = data
+        self._seq_by_key[(entry.timestamp or "", entry.id)] = seq
+        self._by_base_game.setdefault(entry.metadata.base_game, set()).add(seq)
+        for genre in entry.metadata.genre:
+            self._by_genre.setdefault(genre, set()).add(seq)
+        self._by_session.setdefault(entry.timestamp or "", set()).add(seq)
+        for name, sort_key in SORT_KEYS.items():
+            insort(self._orders[name], sort_key(seq, data) + (seq,))
+        self._search.add(seq, data["metadata"])
+
+    def _remove_locked(self, seq: int):
+        data = self._entries.pop(seq)
+        self._seq_by_key.pop((data.get("timestamp") or "", data["id"]), None)
+        self._by_base_game.get(data["metadata"]["base_game"], set()).discard(seq)
+        for genre in data["metadata"]["genre"]:
+            self._by_genre.get(genre, set()).discard(seq)
+        self._by_session.get(data.get("timestamp") or "", set()).discard(seq)
+        for name, sort_key in SORT_KEYS.items():
+            self._orders[name].remove(sort_key(seq, data) + (seq,))
+        self._search.remove(seq)
+
+    def _candidates_locked(
+        self,
+        base_game: Optional[str],
+        genre: Optional[str],
+        session: Optional[str],
+        include: Optional[list[ProjectKey]],
+        exclude: Optional[list[ProjectKey]],
+    ) -> Optional[set[int]]:
+        """seqs matching the filters, or None for "every entry"."""
+        sets = []
+        if base_game is not None:
+            sets.append(self._by_base_game.get(base_game, set()))
+        if genre is not None:
+            sets.append(self._by_genre.get(genre, set()))
+        if session is not None:
+            sets.append(self._by_session.get(session, set()))
+        if include is not None:
+            sets.append({self._seq_by_key[key] for key in include if key in self._seq_by_key})
+
+        candidates = set.intersection(*sets) if sets else None
+        if exclude:
+            excluded = {self._seq_by_key[key] for key in exclude if key in self._seq_by_key}
+            candidates = (set(self._entries) if candidates is None else candidates) - excluded
+        return candidates
+
+    def query(
+        self,
+        base_game: Optional[str] = None,
+        genre: Optional[str] = None,
+        session: Optional[str] = None,
+        include: Optional[list[ProjectKey]] = None,
+        exclude: Optional[list[ProjectKey]] = None,
+        sort: str = "oldest",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str], int]:
+        """
+        One page of projects.
+
+        Args:
+            base_game / genre / session: Exact-match filters
+            include: Only these (timestamp, id) projects
+            exclude: Never these (timestamp, id) projects
+            sort: One of SORT_KEYS
+            cursor: next_cursor from the previous page
+            limit: Page size
+
+        Returns:
+            (entries, next_cursor or None, total number of matching projects)
+
+        Raises:
+            ValueError: Unknown sort, or a malformed cursor or one from another sort
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort}. Expected one of {', '.join(SORT_KEYS)}")
+        after = decode_cursor(cursor, SORT_KEY_TYPES[sort]) if cursor else None
+
+        with self._lock:
+            candidates = self._candidates_locked(base_game, genre, session, include, exclude)
+            total = len(self._entries) if candidates is None else len(candidates)
+
+            order = self._orders[sort]
+            start = bisect_right(order, after) if after is not None else 0
+            page, last_key = [], None
+            for position in range(start, len(order)):
+                key = order[position]
+                seq = key[-1]
+                if candidates is not None and seq not in candidates:
+                    continue
+                if len(page) == limit:
+                    return page, encode_cursor(last_key), total
+                page.append(self._entries[seq])
+                last_key = key
+
+        return page, None, total
+
+    def search(
+        self,
+        text: str,
+        base_game: Optional[str] = None,
+        genre: Optional[str] = None,
+        session: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str], int]:
+        """
+        One page of projects matching a full-text query, best match first.
+
+        Args:
+            text: Search text, matched against name, genre, base game, prompt and summary
+            base_game / genre / session: Exact-match filters
+            cursor: next_cursor from the previous page; it holds the last
+                game's (score, seq), and scores don't change as games are
+                added, so it keeps its place like the query() cursors
+            limit: Page size
+
+        Returns:
+            (entries, next_cursor or None, total number of matching projects)
+
+        Raises:
+            ValueError: Malformed cursor, or one from query()
+        """
+        after = decode_cursor(cursor, (float, int)) if cursor else None
+
+        with self._lock:
+            candidates = self._candidates_locked(base_game, genre, session, None, None)
+            scores = self._search.search(text, candidates)
+            # Best score first, newest first among equal scores (stable sorts;
+            # scores tie a lot, which makes this much cheaper than a heap)
+            ranked = sorted(sorted(scores, reverse=True), key=scores.__getitem__, reverse=True)
+            rank_key = lambda seq: (-scores[seq], -seq)
+            start = bisect_right(ranked, after, key=rank_key) if after is not None else 0
+            page_seqs = ranked[start:start + limit]
+            page = [self._entries[seq] for seq in page_seqs]
+
+        next_cursor = encode_cursor(rank_key(page_seqs[-1])) if start + limit < len(ranked) else None
+        return page, next_cursor, len(scores)
+
+    def facets(self) -> dict:
+        """Project counts per base game, genre and session."""
+        with self._lock:
+            return {
+                "base_game": {name: len(seqs) for name, seqs in sorted(self._by_base_game.items()) if seqs},
+                "genre": {name: len(seqs) for name, seqs in sorted(self._by_genre.items()) if seqs},
+                "session": {name: len(seqs) for name, seqs in sorted(self._by_session.items()) if seqs},
+            }
@@ -1,40 +1,206 @@
 import json
+import os
 import re
+import time
 from pathlib import Path
+from threading import Lock
+from typing import Optional
 from .types import ProjectEntry
+from .catalog import GameCatalog
+from .index import GameIndex
+from .manifests import write_manifests, publish_entry
+from services.s3interface import get_storage, S3Storage
+
+# Re-export the manifests once this many projects were added since the last
+# export, or on the first add once the export is this many seconds old
+EXPORT_EVERY = int(os.getenv("MANIFEST_EXPORT_EVERY", "16"))
+EXPORT_INTERVAL = float(os.getenv("MANIFEST_EXPORT_INTERVAL", "3600"))
+
+# GameInterface is instantiated per call; imports and exports share one lock
+_manifest_lock = Lock()
+
+# In-memory index behind the /games API, built from the catalog on first use
+_index_lock = Lock()
+_game_index: Optional[GameIndex] = None
+
+
+def get_game_index() -> GameIndex:
+    global _game_index
+    with _index_lock:
+        if _game_index is None:
+            _game_index = GameIndex(GameInterface().catalog.query())
+        return _game_index
+
 
 class GameInterface:
+    """
+    The game catalog, stored in an indexed SQLite database (projects/catalog.sqlite3).
+
+    add_project is one small transaction, and the query methods filter by
+    session, base game, genre and creation time without reading the whole
+    catalog. For static hosting the catalog is exported periodically as one
+    manifest per session plus a root index (projects/index.json), see
+    services.packages.game.manifests.
+
+    On first use the catalog imports the existing single-file manifest.json.
+    """
+
     def __init__(self):
         # Get the path relative to the backend directory
         backend_dir = Path(__file__).parent.parent.parent.parent
+        self.projects_dir = backend_dir / "projects"
+        # Legacy single-file manifest, only read by the one-time import
         self.manifest_path = backend_dir / "projects" / "manifest.json"
+        self.catalog = GameCatalog(backend_dir / "projects" / "catalog.sqlite3")
+        self._import_legacy()
 
     def add_project(self, project: ProjectEntry):
         # Extract timestamp from path if not already set
         if not project.timestamp:
             project.timestamp = self._extract_timestamp(project.path_to_index_html)
-        manifest = self._load_manifest()
-        manifest.append(project)
-        self._save_manifest(manifest)
+
+        seq = self.catalog.upsert([project], created_at=time.time())
+        with _index_lock:
+            if _game_index is not None:
+                _game_index.add(seq, project)
+        self._publish(project)
+        if self._should_export():
+            self.export_manifests()
+
+    def remove_projects(self, keys: list[tuple[str, str]]) -> int:
+        """
+        Delete projects from the catalog (and the /games index).
+
+        Args:
+            keys: (timestamp, id) of each project
+
+        Returns:
+            Number of projects removed
+        """
+        removed = self.catalog.delete(keys)
+        with _index_lock:
+            if _game_index is not None:
+                for seq in removed:
+                    _game_index.remove(seq)
+        return len(removed)
+
+    def list_projects(self) -> list[ProjectEntry]:
+        """Every project in the catalog, in the order they were added."""
+        return [entry for _, entry in self.catalog.query()]
+
+    def get_project(self, timestamp: str, project_id: str) -> Optional[ProjectEntry]:
+        return self.catalog.get(timestamp, project_id)
+
+    def find_projects(
+        self,
+        base_game: Optional[str] = None,
+        genre: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> list[ProjectEntry]:
+        """
+        Projects matching every given filter.
+
+        Args:
+            base_game: Base game name (e.g., "snake")
+            genre: A genre the project is tagged with
+            timestamp: Session timestamp (e.g., "20251205_202015")
+            created_after: Epoch seconds, inclusive
+            created_before: Epoch seconds, exclusive
+            limit: Maximum number of projects to return
+            newest_first: Order by most recently added instead of oldest first
+        """
+        return [
+            entry for _, entry in self.catalog.query(
+                base_game=base_game,
+                genre=genre,
+                timestamp=timestamp,
+                created_after=created_after,
+                created_before=created_before,
+                limit=limit,
+                newest_first=newest_first,
+            )
+        ]
+
+    def export_manifests(self) -> int:
+        """
+        Write the per-session manifests and the root index now.
+
+        Sessions whose content hasn't changed since the last export are not rewritten.
+
+        Returns:
+            Number of projects exported
+        """
+        with _manifest_lock:
+            last_seq = self.catalog.last_seq()
+            sessions: dict[str, list[dict]] = {}
+            for entry in self.list_projects():
+                if not entry.timestamp:
+                    print(f"Not exporting project {entry.id}: no session timestamp")
+                    continue
+                sessions.setdefault(entry.timestamp, []).append(entry.model_dump())
+            records = write_manifests(self.projects_dir, sessions)
+            self.catalog.set_meta("exported_seq", str(last_seq))
+            self.catalog.set_meta("exported_at", str(time.time()))
+            return sum(record["count"] for record in records)
+
+    def _publish(self, project: ProjectEntry):
+        """
+        With S3 storage, add the project to the bucket's session manifest and root index.
+
+        Clients fetch manifests from the bucket there, and several workers may
+        publish at once; publish_entry uses conditional writes so none of them
+        overwrites another's entries.
+        """
+        storage = get_storage()
+        if not isinstance(storage, S3Storage) or not project.timestamp:
+            return
+        try:
+            record = publish_entry(storage, project.model_dump(mode="json"))
+            print(f"Published {project.timestamp}/{project.id} to storage ({record['count']} games in session)")
+        except Exception as e:
+            # The project stays in the catalog but is missing from the bucket's manifests until republished
+            print(f"Error publishing {project.timestamp}/{project.id} to storage: {e}")
 
     def _extract_timestamp(self, path: str) -> str:
         """Extract timestamp from path like './projects/20251205_202015/1/index.html'"""
         match = re.search(r'projects/(\d{8}_\d{6})/', path)
         return match.group(1) if match else ''
 
+    def _to_entry(self, entry: dict) -> ProjectEntry:
+        # Backfill timestamp for existing entries that don't have it
+        if 'timestamp' not in entry or not entry['timestamp']:
+            entry['timestamp'] = self._extract_timestamp(entry.get('path_to_index_html', ''))
+        return ProjectEntry(**entry)
+
+    def _import_legacy(self):
+        """Seed the catalog from the single-file manifest.json, once."""
+        with _manifest_lock:
+            if self.catalog.get_meta("imported_at") is not None:
+                return
+
+            entries = self._load_manifest()
+            if entries:
+                self.catalog.upsert(entries)
+                print(f"Imported {len(entries)} manifest entries into the game catalog")
+            self.catalog.set_meta("imported_at", str(time.time()))
+            self.catalog.set_meta("exported_seq", "0")
+
     def _load_manifest(self) -> list[ProjectEntry]:
-        with open(self.manifest_path, "r") as f:
-            manifest = json.load(f)
-
-        entries = []
-        for entry in manifest:
-            # Backfill timestamp for existing entries that don't have it
-            if 'timestamp' not in entry or not entry['timestamp']:
-                entry['timestamp'] = self._extract_timestamp(entry.get('path_to_index_html', ''))
-            entries.append(ProjectEntry(**entry))
-        return entries
-
-    def _save_manifest(self, manifest: list[ProjectEntry]):
-        manifest_dict = [entry.model_dump() for entry in manifest]
-        with open(self.manifest_path, "w") as f:
-            json.dump(manifest_dict, f, indent=2)
\ No newline at end of file
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return []
+
+        return [self._to_entry(entry) for entry in manifest]
+
+    def _should_export(self) -> bool:
+        exported_seq = int(self.catalog.get_meta("exported_seq") or 0)
+        if self.catalog.last_seq() - exported_seq >= EXPORT_EVERY:
+            return True
+        exported_at = float(self.catalog.get_meta("exported_at") or 0)
+        return time.time() - exported_at >= EXPORT_INTERVAL
@@ -0,0 +1,301 @@
+"""
+Sharded manifests for static hosting.
+
+Instead of one manifest.json covering every game, each session gets its own
+manifest, and a small root index lists the sessions:
+
+    projects/index.json                              short-lived, a few bytes per session
+    projects/<timestamp>/manifest.json               latest manifest of the session
+    projects/<timestamp>/manifest.<hash>.json        same content, named by its hash; immutable
+
+The root index points at the hashed files, so clients fetch the index and then
+only the sessions they show, and every session manifest can be cached forever
+(a session that changes gets a new hash, older sessions are never rewritten).
+
+write_manifests exports the whole catalog to a local directory. publish_entry
+adds one game to the copies in shared storage (S3) instead: each document is
+updated with a conditional write against the ETag it was read with, and
+retried on conflict, so several workers can publish at once without a lock.
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from services.s3interface import StorageInterface, PreconditionFailedError
+
+INDEX_FILENAME = "index.json"
+SESSION_MANIFEST = "manifest.json"
+INDEX_VERSION = 1
+HASH_LENGTH = 16
+
+# Hashed manifests kept per session: the current one plus the one older
+# root indexes (cached for up to a minute) may still point at
+KEEP_VERSIONS = 2
+
+# Conditional write attempts per document before giving up, and the backoff between them
+UPDATE_ATTEMPTS = int(os.getenv("MANIFEST_UPDATE_ATTEMPTS", "10"))
+UPDATE_BACKOFF = 0.05
+UPDATE_MAX_BACKOFF = 2.0
+
+# Published versions in storage are only pruned once this old (seconds): a
+# concurrent publisher may have just written one it hasn't pointed the root
+# index at yet, and a cached index may still point at a superseded one
+PRUNE_GRACE = float(os.getenv("MANIFEST_PRUNE_GRACE", "300"))
+
+
+def manifest_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def write_atomic(path: Path, content: str):
+    """Write via a temp file + rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_session_manifest(projects_dir: Path, timestamp: str, entries: list[dict]) -> dict:
+    """
+    Write one session's manifest (stable and hashed names), skipping files that are already current.
+
+    Args:
+        projects_dir: The projects/ directory
+        timestamp: Session timestamp (e.g., "20251205_202015")
+        entries: The session's project entries, in order
+
+    Returns:
+        The session's record for the root index
+    """
+    session_dir = Path(projects_dir) / timestamp
+    content = json.dumps(entries, indent=2)
+    digest = manifest_hash(content)
+    hashed_path = session_dir / f"manifest.{digest}.json"
+
+    if hashed_path.exists():
+        # Current again (e.g. A -> B -> A): newest for pruning, which goes by mtime
+        os.utime(hashed_path)
+    else:
+        write_atomic(hashed_path, content)
+        _prune_versions(session_dir, keep=hashed_path)
+
+    # Independent of the hashed copy, which may be left over from an earlier version
+    stable_path = session_dir / SESSION_MANIFEST
+    try:
+        current = stable_path.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if current != content:
+        write_atomic(stable_path, content)
+
+    return {
+        "timestamp": timestamp,
+        "count": len(entries),
+        "hash": digest,
+        "manifest": f"{timestamp}/{hashed_path.name}",
+    }
+
+
+def _prune_versions(session_dir: Path, keep: Path):
+    versions = sorted(
+        (path for path in session_dir.glob("manifest.*.json") if path != keep),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in versions[KEEP_VERSIONS - 1:]:
+        path.unlink(missing_ok=True)
+
+
+def write_root_index(projects_dir: Path, sessions: list[dict]):
+    """Write projects/index.json from write_session_manifest records."""
+    sessions = sorted(sessions, key=lambda session: session["timestamp"])
+    index = {
+        "version": INDEX_VERSION,
+        "generated_at": time.time(),
+        "total_count": sum(session["count"] for session in sessions),
+        "sessions": sessions,
+    }
+    write_atomic(Path(projects_dir) / INDEX_FILENAME, json.dumps(index, indent=2))
+
+
+def write_manifests(projects_dir: Path, entries_by_session: dict[str, list[dict]]) -> list[dict]:
+    """
+    Write every session manifest plus the root index.
+
+    Returns:
+        The session records written to the root index
+    """
+    sessions = [
+        write_session_manifest(projects_dir, timestamp, entries)
+        for timestamp, entries in entries_by_session.items()
+        if entries
+    ]
+    write_root_index(projects_dir, sessions)
+    return sessions
+
+
+def update_json(storage: StorageInterface, path: str, update: Callable[[Optional[Any]], Any]) -> Any:
+    """
+    Read-modify-write a JSON document with optimistic concurrency.
+
+    `update` gets the current document (None if it doesn't exist) and returns
+    the new one. If another writer changed the document in the meantime, it is
+    read again and `update` reapplied, with jittered exponential backoff.
+
+    Args:
+        storage: Storage backend supporting read_versioned / save_if_match
+        path: Storage key of the document
+        update: Pure function from the current document to the new one
+
+    Returns:
+        The document as written
+
+    Raises:
+        PreconditionFailedError: If every attempt lost a race
+    """
+    for attempt in range(UPDATE_ATTEMPTS):
+        data, etag = storage.read_versioned(path)
+        document = update(json.loads(data) if data is not None else None)
+        try:
+            storage.save_if_match(path, json.dumps(document, indent=2).encode("utf-8"), etag, "application/json")
+            return document
+        except PreconditionFailedError:
+            time.sleep(random.uniform(0, min(UPDATE_MAX_BACKOFF, UPDATE_BACKOFF * 2 ** attempt)))
+    raise PreconditionFailedError(f"{path}: gave up after {UPDATE_ATTEMPTS} conflicting updates")
+
+
+def store_session_version(storage: StorageInterface, prefix: str, timestamp: str, content: str) -> dict:
+    """
+    Write a session manifest's hashed copy to storage.
+
+    Args:
+        storage: Storage backend
+        prefix: Storage prefix holding the manifests
+        timestamp: Session timestamp
+        content: The session manifest as stored
+
+    Returns:
+        The session's record for the root index
+    """
+    digest = manifest_hash(content)
+    hashed_key = f"{prefix}/{timestamp}/manifest.{digest}.json"
+    data = content.encode("utf-8")
+    try:
+        storage.save_if_match(hashed_key, data, None, "application/json")
+    except PreconditionFailedError:
+        # Named by content, so it already holds exactly this; rewrite it
+        # anyway so it counts as newest for pruning (current again, A -> B -> A)
+        storage.save_binary(hashed_key, data, "application/json")
+    return {
+        "timestamp": timestamp,
+        "count": len(json.loads(content)),
+        "hash": digest,
+        "manifest": f"{timestamp}/manifest.{digest}.json",
+    }
+
+
+def merge_session_record(index: Optional[dict], record: dict) -> dict:
+    """Root index with one session's record added or replaced (an update_json callback)."""
+    sessions = [session for session in (index or {}).get("sessions", []) if session["timestamp"] != record["timestamp"]]
+    sessions = sorted(sessions + [dict(record)], key=lambda session: session["timestamp"])
+    return {
+        "version": INDEX_VERSION,
+        "generated_at": time.time(),
+        "total_count": sum(session["count"] for session in sessions),
+        "sessions": sessions,
+    }
+
+
+def publish_entry(storage: StorageInterface, entry: dict, prefix: str = "projects") -> dict:
+    """
+    Add or replace one project in the session manifest and root index in storage.
+
+    Args:
+        storage: Storage backend supporting conditional writes
+        entry: A serialized ProjectEntry (with timestamp)
+        prefix: Storage prefix holding the manifests
+
+    Returns:
+        The session's record in the root index
+    """
+    timestamp = entry["timestamp"]
+    session_key = f"{prefix}/{timestamp}/{SESSION_MANIFEST}"
+
+    def upsert_entry(entries: Optional[list]) -> list:
+        entries = list(entries or [])
+        for position, existing in enumerate(entries):
+            if existing.get("id") == entry["id"]:
+                entries[position] = entry
+                return entries
+        return entries + [entry]
+
+    content = json.dumps(update_json(storage, session_key, upsert_entry), indent=2)
+    index_key = f"{prefix}/{INDEX_FILENAME}"
+
+    for _ in range(UPDATE_ATTEMPTS):
+        record = store_session_version(storage, prefix, timestamp, content)
+        update_json(storage, index_key, lambda index: merge_session_record(index, record))
+
+        # Whichever index write lands last must describe the latest session
+        # manifest. A writer that changed the session after our read may have
+        # updated the index before we did, so check and publish its version
+        data, _ = storage.read_versioned(session_key)
+        if data is None or manifest_hash(data.decode("utf-8")) == record["hash"]:
+            break
+        content = data.decode("utf-8")
+    else:
+        raise PreconditionFailedError(f"{index_key}: session {timestamp} kept changing")
+
+    try:
+        prune_stored_versions(storage, prefix, timestamp, keep_hash=record["hash"])
+    except Exception as e:
+        print(f"Error pruning manifest versions of {timestamp}: {e}")
+    return record
+
+
+def prune_stored_versions(storage: StorageInterface, prefix: str, timestamp: str, keep_hash: str) -> int:
+    """
+    Delete a session's hashed manifests in storage beyond the newest KEEP_VERSIONS.
+
+    The storage counterpart of _prune_versions; versions younger than
+    PRUNE_GRACE are never deleted.
+
+    Args:
+        storage: Storage backend
+        prefix: Storage prefix holding the manifests
+        timestamp: Session timestamp
+        keep_hash: Hash of the current version, which is always kept
+
+    Returns:
+        Number of versions deleted
+    """
+    session_prefix = f"{prefix}/{timestamp}/"
+    versions = sorted(
+        (
+            (modified, key)
+            for key, modified in storage.list_modified(f"{session_prefix}manifest.").items()
+            if _is_hashed_manifest(key[len(session_prefix):]) and key != f"{session_prefix}manifest.{keep_hash}.json"
+        ),
+        reverse=True,
+    )
+    cutoff = time.time() - PRUNE_GRACE
+    stale = [key for modified, key in versions[KEEP_VERSIONS - 1:] if modified < cutoff]
+    if not stale:
+        return 0
+    return sum(storage.delete_many(stale).values())
+
+
+def _is_hashed_manifest(name: str) -> bool:
+    digest = name[len("manifest."):-len(".json")]
+    return (
+        name.startswith("manifest.") and name.endswith(".json")
+        and len(digest) == HASH_LENGTH and all(c in "0123456789abcdef" for c in digest)
+    )
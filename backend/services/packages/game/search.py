@@ -0,0 +1,135 @@
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Optional
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# How much a term counts depending on where it appears
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "genre": 2.0,
+    "base_game": 2.0,
+    "prompt": 1.0,
+    "summary": 0.5,
+}
+
+# A query term also matches longer terms starting with it (e.g. "dung" -> "dungeon"),
+# at a discount, once it's at least this long; at most this many terms are expanded
+PREFIX_MIN_LENGTH = 2
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_TERMS = 64
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    Inverted index over game metadata (name, genre, base game, prompt, summary).
+
+    Each term maps to the games containing it with a field-weighted score, and
+    a sorted vocabulary makes prefix matches a bisect. Queries match games
+    containing every query term (exactly or as a prefix), ranked by the summed
+    weights. A game's score depends only on its own metadata and the query, not
+    on the rest of the index (no IDF), so it stays put as games are added and
+    search cursors keep their place.
+
+    Not thread-safe on its own; GameIndex calls it under its lock.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, float]] = {}
+        self._doc_terms: dict[int, set[str]] = {}
+        self._vocabulary: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, seq: int, metadata: dict):
+        """Index a game's metadata (a serialized GameMetadata), replacing what was indexed for seq."""
+        self.remove(seq)
+
+        weights: dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = metadata.get(field) or ""
+            text = " ".join(value) if isinstance(value, list) else str(value)
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            # Dampen repeated terms so long summaries don't dominate
+            postings[seq] = 1.0 + math.log(weight)
+        self._doc_terms[seq] = set(weights)
+
+    def remove(self, seq: int):
+        for term in self._doc_terms.pop(seq, ()):
+            postings = self._postings[term]
+            postings.pop(seq, None)
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def _expand(self, token: str) -> list[tuple[str, float]]:
+        """Index terms a query token matches, with their match weight."""
+        matches = [(token, 1.0)] if token in self._postings else []
+        if len(token) < PREFIX_MIN_LENGTH:
+            return matches
+
+        position = bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[position:position + MAX_PREFIX_TERMS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, candidates: Optional[set[int]] = None) -> dict[int, float]:
+        """
+        Games matching every term of the query.
+
+        Args:
+            query: Free text, e.g. "dungeon fish"
+            candidates: Only consider these seqs (from filters); None for all
+
+        Returns:
+            seq -> relevance score (higher is better)
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return {}
+
+        scores: Optional[dict[int, float]] = None
+        # Rarest token first, so the running intersection stays small
+        expanded = sorted(
+            (self._expand(token) for token in tokens),
+            key=lambda terms: sum(len(self._postings[term]) for term, _ in terms),
+        )
+        for terms in expanded:
+            token_scores: dict[int, float] = {}
+            for term, match_weight in terms:
+                postings = self._postings[term]
+                if scores is not None:
+                    postings = {seq: postings[seq] for seq in scores.keys() & postings.keys()}
+                if not token_scores:
+                    token_scores = {seq: weight * match_weight for seq, weight in postings.items()}
+                    continue
+                for seq, weight in postings.items():
+                    score = weight * match_weight
+                    if score > token_scores.get(seq, 0.0):
+                        token_scores[seq] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {seq: scores[seq] + score for seq, score in token_scores.items()}
+            if candidates is not None:
+                scores = {seq: score for seq, score in scores.items() if seq in candidates}
+            if not scores:
+                return {}
+
+        return scores
@@ -0,0 +1,146 @@
+"""
+Project Index
+
+A small per-project index (entry point, file list, cartridge art) written to
+storage when a job completes, plus an in-memory lookup table in front of it.
+This lets /get-entry-point and /get-asset-url answer without head_object,
+list_files or rglob calls.
+
+Usage:
+    from services.project_index import build_project_index, write_project_index, get_project_index
+
+    write_project_index(build_project_index("./projects/20231123_120000/1", "20231123_120000", 1))
+    index = get_project_index("20231123_120000", 1)
+    index.entry_point  # "index.html"
+"""
+
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from pydantic import BaseModel, PrivateAttr, ValidationError
+
+from services.s3interface import get_storage
+
+INDEX_FILENAME = "project_index.json"
+
+# How long a missing index is remembered before storage is asked again (the
+# job may still be running, or another process may write it meanwhile)
+MISS_TTL = 10.0
+MAX_MISSES = 1024  # expired misses are dropped once this many are remembered
+
+
+class ProjectIndex(BaseModel):
+    timestamp: str
+    job_id: str
+    entry_point: Optional[str] = None  # Relative to the project root, e.g. "index.html"
+    files: list[str] = []  # Every file in the project, relative to the project root
+    art_files: list[str] = []  # File names under cartridge_arts/<timestamp>/<job_id>/
+
+    _file_set: set[str] = PrivateAttr(default_factory=set)
+
+    def model_post_init(self, __context):
+        self._file_set = set(self.files)
+
+    def has_file(self, relative_path: str) -> bool:
+        return relative_path in self._file_set
+
+    def has_art(self, filename: str) -> bool:
+        return filename in self.art_files
+
+
+_lock = Lock()
+_indexes: dict[tuple[str, str], ProjectIndex] = {}
+_misses: dict[tuple[str, str], float] = {}  # key -> monotonic time of the failed lookup
+
+
+def index_path(timestamp: str, job_id) -> str:
+    return f"projects/{timestamp}/{job_id}/{INDEX_FILENAME}"
+
+
+def build_project_index(local_project_path: str, timestamp: str, job_id) -> ProjectIndex:
+    """
+    Build the index for a finished project from its local directory.
+
+    The entry point is the root index.html if present, otherwise the
+    shallowest index.html found. Cartridge art is looked up once in storage.
+    """
+    local_path = Path(local_project_path)
+    files = []
+    if local_path.exists():
+        for file_path in local_path.rglob("*"):
+            if file_path.is_file() and file_path.name != INDEX_FILENAME:
+                files.append(str(file_path.relative_to(local_path)).replace("\\", "/"))
+    files.sort()
+
+    entry_points = sorted(
+        (f for f in files if f == "index.html" or f.endswith("/index.html")),
+        key=lambda f: (f.count("/"), f),
+    )
+
+    art_prefix = f"cartridge_arts/{timestamp}/{job_id}/"
+    art_files = sorted(key[len(art_prefix):] for key in get_storage().list_files(art_prefix))
+
+    return ProjectIndex(
+        timestamp=timestamp,
+        job_id=str(job_id),
+        entry_point=entry_points[0] if entry_points else None,
+        files=files,
+        art_files=art_files,
+    )
+
+
+def write_project_index(index: ProjectIndex) -> str:
+    """Save the index to storage and make it the in-memory answer for its project."""
+    url = get_storage().save_text(
+        index_path(index.timestamp, index.job_id),
+        index.model_dump_json(),
+        content_type="application/json",
+    )
+    with _lock:
+        _indexes[(index.timestamp, index.job_id)] = index
+        _misses.pop((index.timestamp, index.job_id), None)
+    return url
+
+
+def get_project_index(timestamp: str, job_id) -> Optional[ProjectIndex]:
+    """
+    Look up a project's index.
+
+    Served from memory; the first lookup of a project written by an earlier
+    process reads its index from storage once. A project without an index
+    (still running, or created before indexes existed) is remembered as
+    missing for MISS_TTL seconds, then storage is checked again.
+    """
+    key = (timestamp, str(job_id))
+    with _lock:
+        if key in _indexes:
+            return _indexes[key]
+        missed_at = _misses.get(key)
+        if missed_at is not None and time.monotonic() - missed_at < MISS_TTL:
+            return None
+
+    index = None
+    content = get_storage().read_text(index_path(timestamp, job_id))
+    if content:
+        try:
+            index = ProjectIndex.model_validate(json.loads(content))
+        except (json.JSONDecodeError, ValidationError) as e:
+            print(f"Invalid project index for {timestamp}/{job_id}: {e}")
+
+    with _lock:
+        if index is None:
+            # Don't hide an index written while we were reading
+            if key in _indexes:
+                return _indexes[key]
+            now = time.monotonic()
+            if len(_misses) >= MAX_MISSES:
+                for stale in [k for k, t in _misses.items() if now - t >= MISS_TTL]:
+                    del _misses[stale]
+            _misses[key] = now
+            return None
+        _misses.pop(key, None)
+        # Don't clobber an index written while we were reading
+        return _indexes.setdefault(key, index)
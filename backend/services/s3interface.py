@@ -15,22 +15,274 @@ Usage:
 
     # Get URLs for serving
     url = storage.get_url("path/to/file.png")
+
+    # From async routes, use the non-blocking wrapper
+    storage = get_async_storage()
+    data = await storage.read_binary("path/to/file.png")
 """
 
 import os
 import io
+import re
+import gzip
+import json
+import hashlib
+import mmap
+import fcntl
+import time
+import functools
+import posixpath
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Iterator
 from pathlib import Path
+from threading import Lock, get_ident
 from dotenv import load_dotenv
+import anyio
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from services import tracing
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip variants are produced
+    brotli = None
+
 load_dotenv()
 
+# Chunk size used when streaming object bodies to clients
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Cached presigned URLs are replaced once less than this many seconds of validity remain
+PRESIGN_REFRESH_SECONDS = 300
+PRESIGN_CACHE_SIZE = 10_000
+
+
+CONTENT_TYPES = {
+    ".html": "text/html",
+    ".htm": "text/html",
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".json": "application/json",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".ico": "image/x-icon",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".ttf": "font/ttf",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+}
+
+# Text formats stored alongside precompressed variants, and the suffix used per encoding
+COMPRESSIBLE_EXTENSIONS = {".html", ".htm", ".js", ".css", ".json", ".svg"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def split_encoded_path(path: str) -> tuple[str, Optional[str]]:
+    """
+    Split a precompressed variant path into the original path and its encoding.
+
+    "projects/1/index.html.gz" -> ("projects/1/index.html", "gzip")
+    "projects/1/index.html" -> ("projects/1/index.html", None)
+    Archives that aren't variants of a compressible file (e.g. "bundle.zip.gz")
+    are left alone.
+    """
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        if path.endswith(suffix):
+            original = path[:-len(suffix)]
+            if is_compressible(original):
+                return original, encoding
+    return path, None
+
+
+def is_compressible(path: str) -> bool:
+    return Path(path).suffix.lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def guess_content_type(path: str) -> str:
+    """MIME type from the file extension; variants report the original file's type."""
+    original, _ = split_encoded_path(path)
+    return CONTENT_TYPES.get(Path(original).suffix.lower(), "application/octet-stream")
+
+
+def compress_variants(data: bytes) -> dict[str, bytes]:
+    """
+    Precompress a body with every available encoding.
+
+    Returns:
+        Mapping of Content-Encoding to compressed body, only for encodings that
+        actually make the body smaller
+    """
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+class InvalidRangeError(Exception):
+    """Raised when a requested byte range can't be satisfied (HTTP 416)."""
+
+    def __init__(self, object_size: Optional[int] = None):
+        super().__init__(f"Requested range not satisfiable (object size: {object_size})")
+        self.object_size = object_size
+
+
+class NotModifiedError(Exception):
+    """Raised by conditional reads when the stored object still matches the given ETag."""
+
+
+class PreconditionFailedError(Exception):
+    """Raised by conditional writes when the object changed (or appeared) since it was read."""
+
+
+@dataclass
+class StorageStream:
+    """An open object body, read lazily in chunks."""
+
+    chunks: Iterator[bytes]
+    content_length: int
+    content_type: Optional[str] = None
+    content_range: Optional[str] = None  # Set for partial (206) responses, e.g. "bytes 0-99/1000"
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+def iter_body(body, chunk_size: int = STREAM_CHUNK_SIZE, remaining: Optional[int] = None) -> Iterator[bytes]:
+    """Yield a file-like body in chunks, closing it when exhausted or abandoned."""
+    try:
+        while remaining is None or remaining > 0:
+            chunk = body.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        body.close()
+
+
+@contextmanager
+def map_file(file_path):
+    """
+    Map a local file read-only for the duration of the block.
+
+    Yields a buffer usable anywhere a bytes-like object is accepted (hashlib,
+    zlib/gzip, brotli, slicing) without copying the file into Python memory.
+    Empty files, which can't be mapped, yield b"".
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def replace_file(file_path, data: bytes, fsync: bool = False):
+    """
+    Write a file through a temp file renamed over it, never in place.
+
+    Readers never see a partial file, and a path that is a hardlink (e.g. to a
+    content-addressed blob) gets a new file instead of modifying the shared one.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header against an object size.
+
+    Args:
+        range_header: Header value (e.g., "bytes=0-99", "bytes=100-", "bytes=-500")
+        size: Total object size in bytes
+
+    Returns:
+        Inclusive (start, end) offsets, or None to serve the whole object
+        (no header, or a multi-range request which is ignored)
+
+    Raises:
+        InvalidRangeError: If the range is malformed or outside the object
+    """
+    if not range_header:
+        return None
+
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+    if not match:
+        if range_header.strip().startswith("bytes=") and "," in range_header:
+            return None
+        raise InvalidRangeError(size)
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        raise InvalidRangeError(size)
+
+    if start >= size or start > end:
+        raise InvalidRangeError(size)
+
+    return start, end
+
+
+def _traced_operation(method):
+    """Wrap a storage method in a tracing span tagged with the backend and path."""
+    name = f"storage.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self, path, *args, **kwargs):
+        with tracing.span(name, {"storage.backend": self.backend_name, "storage.path": path}):
+            return method(self, path, *args, **kwargs)
+
+    return wrapper
+
+
+def _traced_batch_operation(method):
+    """Wrap a batch storage method in a tracing span tagged with the number of keys."""
+    name = f"storage.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self, items, *args, **kwargs):
+        with tracing.span(name, {"storage.backend": self.backend_name, "storage.count": len(items)}):
+            return method(self, items, *args, **kwargs)
+
+    return wrapper
+
+
 class StorageInterface(ABC):
     """Abstract base class for storage backends."""
 
+    backend_name = "unknown"
+
     @abstractmethod
     def save_binary(self, path: str, data: bytes, content_type: Optional[str] = None) -> str:
         """
@@ -113,6 +365,19 @@ class StorageInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_modified(self, prefix: str) -> dict[str, float]:
+        """
+        List files whose key starts with a prefix, with their modification times.
+
+        Args:
+            prefix: Key prefix, not necessarily a whole directory (e.g., "projects/20231123_120000/manifest.")
+
+        Returns:
+            Mapping of path to last-modified time (epoch seconds)
+        """
+        pass
+
     @abstractmethod
     def copy(self, source_path: str, dest_path: str) -> str:
         """
@@ -153,10 +418,143 @@ class StorageInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def open_stream(
+        self, path: str, byte_range: Optional[str] = None, if_none_match: Optional[str] = None
+    ) -> Optional[StorageStream]:
+        """
+        Open a file for streaming, optionally restricted to a byte range.
+
+        Args:
+            path: Relative path to the file
+            byte_range: Optional HTTP Range header value (e.g., "bytes=0-1023")
+            if_none_match: Optional ETag; skip the body if the object still matches it
+
+        Returns:
+            StorageStream yielding the body in chunks, or None if not found
+
+        Raises:
+            InvalidRangeError: If the range can't be satisfied
+            NotModifiedError: If the object's ETag equals if_none_match
+        """
+        pass
+
+    def local_path(self, path: str) -> Optional[Path]:
+        """
+        Filesystem path of a stored file, for backends that keep files on local disk.
+
+        Lets callers hand the file to FileResponse (sendfile/pathsend) instead
+        of reading it into memory.
+
+        Args:
+            path: Relative path to the file
+
+        Returns:
+            Absolute path, or None if the file doesn't exist or isn't stored locally
+        """
+        return None
+
+    # Conditional operations, for read-modify-write without a global lock:
+    # read an object with its ETag, then write only if it is still current.
+
+    @abstractmethod
+    def read_versioned(self, path: str) -> tuple[Optional[bytes], Optional[str]]:
+        """
+        Read a file along with its ETag.
+
+        Args:
+            path: Relative path to the file
+
+        Returns:
+            (data, etag), or (None, None) if not found
+        """
+        pass
+
+    @abstractmethod
+    def save_if_match(
+        self, path: str, data: bytes, etag: Optional[str], content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Save binary data only if the stored object is unchanged.
+
+        Args:
+            path: Relative path for the file
+            data: Binary data to save
+            etag: ETag from read_versioned; None to save only if the file doesn't exist yet
+            content_type: Optional MIME type
+
+        Returns:
+            The new ETag
+
+        Raises:
+            PreconditionFailedError: If the file was changed, created or deleted in the meantime
+        """
+        pass
+
+    # Batch operations. The defaults loop over the single-object methods;
+    # backends override them where the store offers something cheaper.
+
+    def delete_many(self, paths: list[str]) -> dict[str, bool]:
+        """
+        Delete several files.
+
+        Args:
+            paths: Relative paths to delete
+
+        Returns:
+            Mapping of path to True if deleted, False otherwise
+        """
+        return {path: self.delete(path) for path in paths}
+
+    def exists_many(self, paths: list[str]) -> dict[str, bool]:
+        """
+        Check whether several files exist.
+
+        Args:
+            paths: Relative paths to check
+
+        Returns:
+            Mapping of path to True if it exists
+        """
+        return {path: self.exists(path) for path in paths}
+
+    def save_many(self, files: dict[str, bytes], content_type: Optional[str] = None) -> list[str]:
+        """
+        Save several binary files.
+
+        Args:
+            files: Mapping of relative path to binary data
+            content_type: Optional MIME type for all files (guessed per file if omitted)
+
+        Returns:
+            URLs or paths to access the saved files, in input order
+        """
+        return [self.save_binary(path, data, content_type) for path, data in files.items()]
+
+    def copy_prefix(self, source_prefix: str, dest_prefix: str) -> list[str]:
+        """
+        Copy every file under a prefix to another prefix.
+
+        Args:
+            source_prefix: Source prefix (e.g., "projects/20231123/1")
+            dest_prefix: Destination prefix (e.g., "projects/20231124/1")
+
+        Returns:
+            URLs or paths to the copied files
+        """
+        source_prefix = source_prefix.rstrip("/") + "/"
+        dest_prefix = dest_prefix.rstrip("/") + "/"
+        return [
+            self.copy(path, dest_prefix + path[len(source_prefix):])
+            for path in self.list_files(source_prefix)
+        ]
+
 
 class S3Storage(StorageInterface):
     """AWS S3 storage backend."""
 
+    backend_name = "s3"
+
     def __init__(
         self,
         bucket_name: str,
@@ -165,6 +563,9 @@ class S3Storage(StorageInterface):
         aws_secret_access_key: Optional[str] = None,
         custom_endpoint: Optional[str] = None,
         cloudfront_domain: Optional[str] = None,
+        max_concurrency: int = 10,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        presign_expires_in: int = 3600,
     ):
         """
         Initialize S3 storage.
@@ -176,15 +577,34 @@ class S3Storage(StorageInterface):
             aws_secret_access_key: AWS secret key (uses env/IAM if not provided)
             custom_endpoint: Custom S3-compatible endpoint (for MinIO, R2, etc.)
             cloudfront_domain: Optional CloudFront domain for serving files
+            max_concurrency: Files transferred in parallel by batch operations and upload_directory
+            multipart_threshold: Files at least this large are uploaded in parallel parts
+            presign_expires_in: Lifetime in seconds of presigned GET URLs
         """
         self.bucket_name = bucket_name
         self.region = region
         self.cloudfront_domain = cloudfront_domain
 
+        # Worker threads used by batch operations (boto3 clients are thread-safe)
+        self.max_concurrency = max_concurrency
+
+        # Each concurrent file may itself upload several parts at once
+        parts_per_file = 4
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_threshold,
+            max_concurrency=parts_per_file,
+            use_threads=True,
+        )
+
         # Configure boto3 client
         client_kwargs = {
             "service_name": "s3",
             "region_name": region,
+            "config": Config(
+                max_pool_connections=max_concurrency * parts_per_file,
+                retries={"max_attempts": 10, "mode": "adaptive"},
+            ),
         }
 
         if aws_access_key_id and aws_secret_access_key:
@@ -197,57 +617,46 @@ class S3Storage(StorageInterface):
         self.client = boto3.client(**client_kwargs)
         self.bucket_name = bucket_name
 
+        # Presigned URLs are reused until shortly before expiry, so browsers see a
+        # stable URL per object and can cache the body
+        self.presign_expires_in = max(presign_expires_in, PRESIGN_REFRESH_SECONDS * 2)
+        self._presign_lock = Lock()
+        self._presigned: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+
     def _get_content_type(self, path: str, provided_type: Optional[str] = None) -> str:
         """Determine content type from file extension or provided type."""
         if provided_type:
             return provided_type
+        return guess_content_type(path)
 
-        extension = Path(path).suffix.lower()
-        content_types = {
-            ".html": "text/html",
-            ".htm": "text/html",
-            ".css": "text/css",
-            ".js": "application/javascript",
-            ".json": "application/json",
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".svg": "image/svg+xml",
-            ".webp": "image/webp",
-            ".ico": "image/x-icon",
-            ".woff": "font/woff",
-            ".woff2": "font/woff2",
-            ".ttf": "font/ttf",
-            ".mp3": "audio/mpeg",
-            ".wav": "audio/wav",
-            ".mp4": "video/mp4",
-            ".webm": "video/webm",
-        }
-        return content_types.get(extension, "application/octet-stream")
+    def _put_metadata(self, path: str, content_type: Optional[str] = None) -> dict:
+        """ContentType, plus ContentEncoding for precompressed variants (e.g. index.html.gz)."""
+        metadata = {"ContentType": self._get_content_type(path, content_type)}
+        _, encoding = split_encoded_path(path)
+        if encoding:
+            metadata["ContentEncoding"] = encoding
+        return metadata
 
+    @_traced_operation
     def save_binary(self, path: str, data: bytes, content_type: Optional[str] = None) -> str:
         """Save binary data to S3."""
-        content_type = self._get_content_type(path, content_type)
-
         self.client.put_object(
             Bucket=self.bucket_name,
             Key=path,
             Body=data,
-            ContentType=content_type,
+            **self._put_metadata(path, content_type),
         )
 
         return self.get_url(path)
 
+    @_traced_operation
     def save_text(self, path: str, content: str, content_type: Optional[str] = None) -> str:
         """Save text content to S3."""
-        content_type = self._get_content_type(path, content_type)
-
         self.client.put_object(
             Bucket=self.bucket_name,
             Key=path,
             Body=content.encode("utf-8"),
-            ContentType=content_type,
+            **self._put_metadata(path, content_type),
         )
 
         return self.get_url(path)
@@ -258,6 +667,48 @@ class S3Storage(StorageInterface):
             return f"https://{self.cloudfront_domain}/{path}"
         return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{path}"
 
+    def presigned_url(
+        self, path: str, content_type: Optional[str] = None, content_encoding: Optional[str] = None
+    ) -> str:
+        """
+        Get a presigned GET URL for an object in a private bucket.
+
+        URLs are cached and reused until less than PRESIGN_REFRESH_SECONDS of
+        validity remain, so a URL handed out is always good for at least that long.
+
+        Args:
+            path: Relative path to the object
+            content_type: Content-Type S3 should respond with (overrides the stored metadata)
+            content_encoding: Content-Encoding S3 should respond with
+
+        Returns:
+            Presigned URL
+        """
+        cache_key = (path, content_type, content_encoding)
+        now = time.time()
+        with self._presign_lock:
+            cached = self._presigned.get(cache_key)
+            if cached and cached[1] - now > PRESIGN_REFRESH_SECONDS:
+                self._presigned.move_to_end(cache_key)
+                return cached[0]
+
+        params = {"Bucket": self.bucket_name, "Key": path}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if content_encoding:
+            params["ResponseContentEncoding"] = content_encoding
+        url = self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.presign_expires_in
+        )
+
+        with self._presign_lock:
+            self._presigned[cache_key] = (url, now + self.presign_expires_in)
+            self._presigned.move_to_end(cache_key)
+            while len(self._presigned) > PRESIGN_CACHE_SIZE:
+                self._presigned.popitem(last=False)
+        return url
+
+    @_traced_operation
     def exists(self, path: str) -> bool:
         """Check if an object exists in S3."""
         try:
@@ -268,6 +719,7 @@ class S3Storage(StorageInterface):
                 return False
             raise
 
+    @_traced_operation
     def delete(self, path: str) -> bool:
         """Delete an object from S3."""
         try:
@@ -276,6 +728,7 @@ class S3Storage(StorageInterface):
         except ClientError:
             return False
 
+    @_traced_operation
     def list_files(self, prefix: str) -> list[str]:
         """List all objects under a prefix in S3."""
         files = []
@@ -287,6 +740,17 @@ class S3Storage(StorageInterface):
 
         return files
 
+    @_traced_operation
+    def list_modified(self, prefix: str) -> dict[str, float]:
+        """List objects under a key prefix in S3 with their LastModified times."""
+        files = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                files[obj["Key"]] = obj["LastModified"].timestamp()
+        return files
+
+    @_traced_operation
     def copy(self, source_path: str, dest_path: str) -> str:
         """Copy an object within S3."""
         self.client.copy_object(
@@ -296,6 +760,7 @@ class S3Storage(StorageInterface):
         )
         return self.get_url(dest_path)
 
+    @_traced_operation
     def read_binary(self, path: str) -> Optional[bytes]:
         """Read binary data from S3."""
         try:
@@ -306,6 +771,7 @@ class S3Storage(StorageInterface):
                 return None
             raise
 
+    @_traced_operation
     def read_text(self, path: str) -> Optional[str]:
         """Read text content from S3."""
         data = self.read_binary(path)
@@ -313,10 +779,156 @@ class S3Storage(StorageInterface):
             return None
         return data.decode("utf-8")
 
+    @_traced_operation
+    def read_versioned(self, path: str) -> tuple[Optional[bytes], Optional[str]]:
+        """Read an S3 object with its ETag."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=path)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                return None, None
+            raise
+        return response["Body"].read(), response["ETag"]
+
+    @_traced_operation
+    def save_if_match(
+        self, path: str, data: bytes, etag: Optional[str], content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Save with S3's conditional PUT (If-Match, or If-None-Match: * when etag is None)."""
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            response = self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=path,
+                Body=data,
+                **condition,
+                **self._put_metadata(path, content_type),
+            )
+        except ClientError as e:
+            # 409 ConditionalRequestConflict: a concurrent conditional write to the same key won
+            if e.response["Error"]["Code"] in ("PreconditionFailed", "ConditionalRequestConflict", "NoSuchKey"):
+                raise PreconditionFailedError(path)
+            raise
+        return response.get("ETag")
+
+    @_traced_operation
+    def open_stream(
+        self, path: str, byte_range: Optional[str] = None, if_none_match: Optional[str] = None
+    ) -> Optional[StorageStream]:
+        """Open an S3 object body for streaming. Ranges and ETags are passed through to S3."""
+        request = {"Bucket": self.bucket_name, "Key": path}
+        if byte_range:
+            request["Range"] = byte_range
+        if if_none_match:
+            request["IfNoneMatch"] = if_none_match
+
+        try:
+            response = self.client.get_object(**request)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code == "NoSuchKey":
+                return None
+            if code in ("304", "NotModified"):
+                raise NotModifiedError(path)
+            if code == "InvalidRange":
+                size = e.response["Error"].get("ActualObjectSize")
+                raise InvalidRangeError(int(size) if size else None)
+            raise
+
+        return StorageStream(
+            chunks=iter_body(response["Body"]),
+            content_length=response["ContentLength"],
+            content_type=response.get("ContentType"),
+            content_range=response.get("ContentRange"),
+            etag=response.get("ETag"),
+            last_modified=response.get("LastModified"),
+        )
+
+    def _map_concurrently(self, func, items: list) -> list:
+        """Run func over items on a bounded thread pool, preserving order."""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    @_traced_batch_operation
+    def delete_many(self, paths: list[str]) -> dict[str, bool]:
+        """Delete objects with DeleteObjects, 1000 keys per request."""
+        results = {path: True for path in paths}
+
+        for start in range(0, len(paths), 1000):
+            chunk = paths[start:start + 1000]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": path} for path in chunk], "Quiet": True},
+                )
+            except ClientError:
+                results.update({path: False for path in chunk})
+                continue
+
+            for error in response.get("Errors", []):
+                results[error["Key"]] = False
+
+        return results
+
+    @_traced_batch_operation
+    def exists_many(self, paths: list[str]) -> dict[str, bool]:
+        """
+        Check many keys at once.
+
+        Keys sharing a parent "directory" with several others are answered with
+        a single delimited listing of that directory; the rest use concurrent
+        head_object calls.
+        """
+        by_parent: dict[str, list[str]] = {}
+        for path in paths:
+            by_parent.setdefault(posixpath.dirname(path), []).append(path)
+
+        results = {}
+        singles = []
+        for parent, group in by_parent.items():
+            if len(group) < 4:
+                singles.extend(group)
+                continue
+
+            listed = set()
+            paginator = self.client.get_paginator("list_objects_v2")
+            prefix = f"{parent}/" if parent else ""
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter="/"):
+                listed.update(obj["Key"] for obj in page.get("Contents", []))
+            results.update({path: path in listed for path in group})
+
+        results.update(zip(singles, self._map_concurrently(self.exists, singles)))
+        return {path: results[path] for path in paths}
+
+    @_traced_batch_operation
+    def save_many(self, files: dict[str, bytes], content_type: Optional[str] = None) -> list[str]:
+        """Upload several objects concurrently."""
+        return self._map_concurrently(
+            lambda item: self.save_binary(item[0], item[1], content_type),
+            list(files.items()),
+        )
+
+    @_traced_operation
+    def copy_prefix(self, source_prefix: str, dest_prefix: str) -> list[str]:
+        """Server-side copy of every object under a prefix, run concurrently."""
+        source_prefix = source_prefix.rstrip("/") + "/"
+        dest_prefix = dest_prefix.rstrip("/") + "/"
+        return self._map_concurrently(
+            lambda path: self.copy(path, dest_prefix + path[len(source_prefix):]),
+            self.list_files(source_prefix),
+        )
+
+    @_traced_operation
     def upload_directory(self, local_dir: str, s3_prefix: str) -> list[str]:
         """
         Upload an entire local directory to S3.
 
+        Files are streamed from disk by the boto3 transfer manager (no full
+        read into memory), several at a time on a bounded thread pool, and
+        files above the multipart threshold are split into parallel parts.
+
         Args:
             local_dir: Local directory path
             s3_prefix: S3 prefix/path for the uploaded files
@@ -324,24 +936,29 @@ class S3Storage(StorageInterface):
         Returns:
             List of uploaded file URLs
         """
-        uploaded = []
         local_path = Path(local_dir)
+        files = [file_path for file_path in local_path.rglob("*") if file_path.is_file()]
 
-        for file_path in local_path.rglob("*"):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(local_path)
-                s3_path = f"{s3_prefix}/{relative_path}".replace("\\", "/")
+        def upload(file_path: Path) -> str:
+            relative_path = file_path.relative_to(local_path)
+            s3_path = f"{s3_prefix}/{relative_path}".replace("\\", "/")
+            self.client.upload_file(
+                str(file_path),
+                self.bucket_name,
+                s3_path,
+                ExtraArgs=self._put_metadata(s3_path),
+                Config=self.transfer_config,
+            )
+            return self.get_url(s3_path)
 
-                with open(file_path, "rb") as f:
-                    url = self.save_binary(s3_path, f.read())
-                    uploaded.append(url)
-
-        return uploaded
+        return self._map_concurrently(upload, files)
 
 
 class LocalStorage(StorageInterface):
     """Local filesystem storage backend (for development/backwards compatibility)."""
 
+    backend_name = "local"
+
     def __init__(self, base_path: str = ".", base_url: str = ""):
         """
         Initialize local storage.
@@ -357,24 +974,24 @@ class LocalStorage(StorageInterface):
         """Get full filesystem path."""
         return self.base_path / path
 
+    @_traced_operation
     def save_binary(self, path: str, data: bytes, content_type: Optional[str] = None) -> str:
         """Save binary data to local filesystem."""
         full_path = self._full_path(path)
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(full_path, "wb") as f:
-            f.write(data)
+        replace_file(full_path, data)
 
         print(f"File saved to: {full_path}")
         return self.get_url(path)
 
+    @_traced_operation
     def save_text(self, path: str, content: str, content_type: Optional[str] = None) -> str:
         """Save text content to local filesystem."""
         full_path = self._full_path(path)
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(full_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        replace_file(full_path, content.encode("utf-8"))
 
         print(f"File saved to: {full_path}")
         return self.get_url(path)
@@ -385,10 +1002,12 @@ class LocalStorage(StorageInterface):
             return f"{self.base_url}/{path}"
         return f"/{path}"
 
+    @_traced_operation
     def exists(self, path: str) -> bool:
         """Check if a file exists locally."""
         return self._full_path(path).exists()
 
+    @_traced_operation
     def delete(self, path: str) -> bool:
         """Delete a local file."""
         try:
@@ -397,6 +1016,7 @@ class LocalStorage(StorageInterface):
         except FileNotFoundError:
             return False
 
+    @_traced_operation
     def list_files(self, prefix: str) -> list[str]:
         """List all files under a directory."""
         full_path = self._full_path(prefix)
@@ -411,6 +1031,23 @@ class LocalStorage(StorageInterface):
 
         return files
 
+    @_traced_operation
+    def list_modified(self, prefix: str) -> dict[str, float]:
+        """List local files whose path starts with a prefix, with their mtimes."""
+        directory = self._full_path(prefix)
+        if not prefix.endswith("/"):
+            directory = directory.parent
+        if not directory.is_dir():
+            return {}
+
+        files = {}
+        for file_path in directory.rglob("*"):
+            key = str(file_path.relative_to(self.base_path)).replace("\\", "/")
+            if key.startswith(prefix) and file_path.is_file():
+                files[key] = file_path.stat().st_mtime
+        return files
+
+    @_traced_operation
     def copy(self, source_path: str, dest_path: str) -> str:
         """Copy a local file."""
         import shutil
@@ -422,6 +1059,7 @@ class LocalStorage(StorageInterface):
         shutil.copy2(source, dest)
         return self.get_url(dest_path)
 
+    @_traced_operation
     def read_binary(self, path: str) -> Optional[bytes]:
         """Read binary data from local filesystem."""
         try:
@@ -430,6 +1068,7 @@ class LocalStorage(StorageInterface):
         except FileNotFoundError:
             return None
 
+    @_traced_operation
     def read_text(self, path: str) -> Optional[str]:
         """Read text content from local filesystem."""
         try:
@@ -438,6 +1077,116 @@ class LocalStorage(StorageInterface):
         except FileNotFoundError:
             return None
 
+    @staticmethod
+    def _content_etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    @contextmanager
+    def _directory_lock(self, directory: Path):
+        """Exclusive flock on a directory, shared by every thread and process writing into it."""
+        directory.mkdir(parents=True, exist_ok=True)
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    @_traced_operation
+    def read_versioned(self, path: str) -> tuple[Optional[bytes], Optional[str]]:
+        """Read a local file with an ETag derived from its content."""
+        data = self.read_binary(path)
+        if data is None:
+            return None, None
+        return data, self._content_etag(data)
+
+    @_traced_operation
+    def save_if_match(
+        self, path: str, data: bytes, etag: Optional[str], content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Compare and swap under a lock on the parent directory; the file is replaced atomically."""
+        full_path = self._full_path(path)
+        with self._directory_lock(full_path.parent):
+            current = self.read_binary(path)
+            current_etag = self._content_etag(current) if current is not None else None
+            if current_etag != etag:
+                raise PreconditionFailedError(path)
+
+            replace_file(full_path, data, fsync=True)
+        return self._content_etag(data)
+
+    def local_path(self, path: str) -> Optional[Path]:
+        """Absolute path of a local file, refusing paths that escape base_path."""
+        base = self.base_path.resolve()
+        full_path = self._full_path(path).resolve()
+        if full_path != base and base not in full_path.parents:
+            return None
+        return full_path if full_path.is_file() else None
+
+    @_traced_operation
+    def open_stream(
+        self, path: str, byte_range: Optional[str] = None, if_none_match: Optional[str] = None
+    ) -> Optional[StorageStream]:
+        """Open a local file for streaming, seeking to the requested range."""
+        full_path = self._full_path(path)
+        try:
+            f = open(full_path, "rb")
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+        try:
+            stat = os.fstat(f.fileno())
+            # Weak validator from mtime and size, like StaticFiles uses
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if if_none_match and if_none_match == etag:
+                raise NotModifiedError(path)
+            byte_span = parse_byte_range(byte_range, stat.st_size)
+        except BaseException:
+            f.close()
+            raise
+
+        last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        if byte_span is None:
+            return StorageStream(
+                chunks=iter_body(f),
+                content_length=stat.st_size,
+                etag=etag,
+                last_modified=last_modified,
+            )
+
+        start, end = byte_span
+        f.seek(start)
+        return StorageStream(
+            chunks=iter_body(f, remaining=end - start + 1),
+            content_length=end - start + 1,
+            content_range=f"bytes {start}-{end}/{stat.st_size}",
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    @_traced_batch_operation
+    def delete_many(self, paths: list[str]) -> dict[str, bool]:
+        """Delete several local files."""
+        return {path: self.delete(path) for path in paths}
+
+    @_traced_batch_operation
+    def exists_many(self, paths: list[str]) -> dict[str, bool]:
+        """Check several local files (a stat each, no round trips)."""
+        return {path: self._full_path(path).exists() for path in paths}
+
+    @_traced_operation
+    def copy_prefix(self, source_prefix: str, dest_prefix: str) -> list[str]:
+        """Copy a local directory tree in one copytree call."""
+        import shutil
+
+        source = self._full_path(source_prefix.rstrip("/"))
+        if not source.is_dir():
+            return []
+
+        shutil.copytree(source, self._full_path(dest_prefix.rstrip("/")), dirs_exist_ok=True)
+        return [self.get_url(path) for path in self.list_files(dest_prefix.rstrip("/"))]
+
+    @_traced_operation
     def copy_directory(self, source_dir: str, dest_dir: str) -> bool:
         """
         Copy an entire directory locally.
@@ -465,8 +1214,599 @@ class LocalStorage(StorageInterface):
             raise
 
 
-# Storage instance singleton
+# Keys rewritten in place (by this node or others): never trusted from the local
+# disk tier without revalidation, and never written back lazily
+MUTABLE_KEY_PATTERNS = [
+    re.compile(r"(^|/)manifest\.json$"),
+    re.compile(r"^projects/[^/]+\.json$"),
+]
+
+
+def is_mutable_key(path: str) -> bool:
+    return any(pattern.search(path) for pattern in MUTABLE_KEY_PATTERNS)
+
+
+@dataclass
+class _TierEntry:
+    size: int
+    etag: Optional[str] = None  # S3 ETag of the cached body, when known
+    validated_at: float = 0.0  # When the body was last fetched or confirmed against S3
+    pending_writes: int = 0  # Write-back uploads queued for this key; pinned while > 0
+
+
+class TieredStorage(S3Storage):
+    """
+    S3Storage with a size-bounded local disk cache in front of it.
+
+    Reads (read_binary, read_text, exists) are answered from a LocalStorage
+    directory when the object is cached and fill it on a miss, so anything this
+    node just wrote or read is never fetched from S3 again. The least recently
+    used objects are evicted once the cache grows past max_bytes.
+
+    Writes land on disk and reach S3 either before returning
+    (write_mode="through") or from a background worker (write_mode="back");
+    flush() waits for queued uploads.
+
+    Consistency rules:
+        - Project files, art and blobs are written once, so cached copies are trusted
+        - Mutable keys (manifest.json, projects/*.json) are always written through,
+          and cached copies older than mutable_ttl are revalidated against S3 by
+          ETag, so updates from other nodes show up
+        - Objects with uploads still queued are never evicted, and operations that
+          read S3 directly (listings, copies, streaming reads) wait for them first
+
+    It is an S3Storage, so code that branches on the backend type, URLs,
+    streaming and directory uploads behave exactly as before.
+    """
+
+    backend_name = "tiered"
+
+    def __init__(
+        self,
+        bucket_name: str,
+        cache_path: str,
+        cache_max_bytes: int = 1024 * 1024 * 1024,
+        write_mode: str = "through",
+        mutable_ttl: float = 5.0,
+        **kwargs,
+    ):
+        """
+        Args:
+            bucket_name: S3 bucket name
+            cache_path: Directory for the local disk tier
+            cache_max_bytes: Size bound of the local disk tier
+            write_mode: "through" (upload before returning) or "back" (upload in the background)
+            mutable_ttl: Seconds a cached mutable key is trusted before revalidating it
+            **kwargs: Passed on to S3Storage
+        """
+        if write_mode not in ("through", "back"):
+            raise ValueError(f"write_mode must be 'through' or 'back', got {write_mode!r}")
+
+        super().__init__(bucket_name, **kwargs)
+        self.disk = LocalStorage(base_path=cache_path)
+        self.cache_max_bytes = cache_max_bytes
+        self.write_mode = write_mode
+        self.mutable_ttl = mutable_ttl
+
+        self._tier_lock = Lock()
+        self._entries: OrderedDict[str, _TierEntry] = OrderedDict()
+        self._size = 0
+        self._failed_writes: dict[str, tuple] = {}
+        # One worker keeps uploads (and the deletes behind them) in submission order
+        self._writer = ThreadPoolExecutor(max_workers=1) if write_mode == "back" else None
+
+        self._load_existing()
+
+    def _load_existing(self):
+        """Adopt files left in the cache directory by a previous process, oldest first."""
+        base = self.disk.base_path
+        if not base.exists():
+            return
+
+        files = []
+        for file_path in base.rglob("*"):
+            if file_path.is_file() and not file_path.name.endswith(".tmp"):
+                stat = file_path.stat()
+                files.append((stat.st_mtime, str(file_path.relative_to(base)).replace("\\", "/"), stat.st_size))
+
+        with self._tier_lock:
+            for _, path, size in sorted(files):
+                self._entries[path] = _TierEntry(size=size)
+                self._size += size
+            self._evict_locked()
+
+    # -- local tier ---------------------------------------------------------
+
+    def _read_local(self, path: str) -> Optional[bytes]:
+        try:
+            with open(self.disk.base_path / path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _store(self, path: str, data: bytes, etag: Optional[str], pending: bool = False):
+        """Write a body to the disk tier (atomically) and account for it."""
+        with self._tier_lock:
+            entry = self._entries.get(path)
+            pinned = pending or (entry is not None and entry.pending_writes > 0)
+        if len(data) > self.cache_max_bytes and not pinned:
+            self._drop(path)
+            return
+
+        full_path = self.disk.base_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = full_path.with_name(f"{full_path.name}.{os.getpid()}.{get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, full_path)
+
+        with self._tier_lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[path] = _TierEntry(
+                size=len(data),
+                etag=etag,
+                validated_at=time.time(),
+                pending_writes=(old.pending_writes if old else 0) + (1 if pending else 0),
+            )
+            self._size += len(data)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Drop least recently used entries (skipping pinned ones) until under the size bound."""
+        if self._size <= self.cache_max_bytes:
+            return
+        for path in list(self._entries):
+            if self._size <= self.cache_max_bytes:
+                break
+            entry = self._entries[path]
+            if entry.pending_writes:
+                continue
+            del self._entries[path]
+            self._size -= entry.size
+            (self.disk.base_path / path).unlink(missing_ok=True)
+
+    def _drop(self, path: str):
+        with self._tier_lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._size -= entry.size
+        (self.disk.base_path / path).unlink(missing_ok=True)
+
+    def _lookup(self, path: str) -> Optional[_TierEntry]:
+        """Cached entry for a key, marked as recently used."""
+        with self._tier_lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+            return entry
+
+    def _is_fresh(self, path: str, entry: _TierEntry) -> bool:
+        if entry.pending_writes or not is_mutable_key(path):
+            return True
+        return time.time() - entry.validated_at < self.mutable_ttl
+
+    # -- write-back ---------------------------------------------------------
+
+    def _submit(self, path: str, func, *args):
+        self._writer.submit(self._write_back, path, func, args)
+
+    def _write_back(self, path: str, func, args: tuple):
+        try:
+            func(*args)
+            failed = False
+        except Exception as e:
+            print(f"Write-back upload of {path} failed: {e}")
+            failed = True
+
+        with self._tier_lock:
+            if failed:
+                self._failed_writes[path] = (func, args)
+            entry = self._entries.get(path)
+            if entry is not None and not failed:
+                entry.pending_writes = max(entry.pending_writes - 1, 0)
+
+    def _drain(self):
+        """Wait until every queued upload has been attempted."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def flush(self) -> int:
+        """
+        Retry failed background uploads once and wait for the write-back queue to empty.
+
+        Returns:
+            Number of uploads that are still failing
+        """
+        if self._writer is None:
+            return 0
+
+        with self._tier_lock:
+            retries = self._failed_writes
+            self._failed_writes = {}
+        for path, (func, args) in retries.items():
+            self._submit(path, func, *args)
+        self._drain()
+
+        with self._tier_lock:
+            return len(self._failed_writes)
+
+    def get_tier_stats(self) -> dict:
+        with self._tier_lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.cache_max_bytes,
+                "pending_writes": sum(entry.pending_writes for entry in self._entries.values()),
+                "failed_writes": len(self._failed_writes),
+                "write_mode": self.write_mode,
+            }
+
+    # -- StorageInterface ---------------------------------------------------
+
+    @_traced_operation
+    def save_binary(self, path: str, data: bytes, content_type: Optional[str] = None) -> str:
+        """Save to the disk tier and to S3 (now, or from the write-back queue)."""
+        # Single-part PutObject ETags are the body's MD5
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if self._writer is None or is_mutable_key(path):
+            url = super().save_binary(path, data, content_type)
+            self._store(path, data, etag)
+            return url
+
+        self._store(path, data, etag, pending=True)
+        self._submit(path, super().save_binary, path, data, content_type)
+        return self.get_url(path)
+
+    @_traced_operation
+    def save_text(self, path: str, content: str, content_type: Optional[str] = None) -> str:
+        """Save text through the disk tier (see save_binary)."""
+        return self.save_binary(path, content.encode("utf-8"), content_type)
+
+    @_traced_operation
+    def read_binary(self, path: str) -> Optional[bytes]:
+        """Read from the disk tier, falling back to (and filling it from) S3."""
+        entry = self._lookup(path)
+        if entry is not None and self._is_fresh(path, entry):
+            data = self._read_local(path)
+            if data is not None:
+                return data
+
+        try:
+            stream = super().open_stream(path, if_none_match=entry.etag if entry else None)
+        except NotModifiedError:
+            data = self._read_local(path)
+            if data is not None:
+                with self._tier_lock:
+                    entry.validated_at = time.time()
+                return data
+            stream = super().open_stream(path)
+
+        if stream is None:
+            self._drop(path)
+            return None
+
+        data = b"".join(stream.chunks)
+        self._store(path, data, stream.etag)
+        return data
+
+    @_traced_operation
+    def exists(self, path: str) -> bool:
+        """Cached keys exist; anything else is checked in S3."""
+        entry = self._lookup(path)
+        if entry is not None and self._is_fresh(path, entry):
+            return True
+        return super().exists(path)
+
+    @_traced_batch_operation
+    def exists_many(self, paths: list[str]) -> dict[str, bool]:
+        """Answer cached keys locally and check the rest in S3."""
+        results = {}
+        for path in paths:
+            entry = self._lookup(path)
+            if entry is not None and self._is_fresh(path, entry):
+                results[path] = True
+
+        remaining = [path for path in paths if path not in results]
+        if remaining:
+            results.update(super().exists_many(remaining))
+        return {path: results[path] for path in paths}
+
+    @_traced_operation
+    def delete(self, path: str) -> bool:
+        self._drain()
+        self._drop(path)
+        return super().delete(path)
+
+    @_traced_batch_operation
+    def delete_many(self, paths: list[str]) -> dict[str, bool]:
+        self._drain()
+        for path in paths:
+            self._drop(path)
+        return super().delete_many(paths)
+
+    @_traced_operation
+    def list_files(self, prefix: str) -> list[str]:
+        self._drain()
+        return super().list_files(prefix)
+
+    @_traced_operation
+    def list_modified(self, prefix: str) -> dict[str, float]:
+        self._drain()
+        return super().list_modified(prefix)
+
+    @_traced_operation
+    def copy(self, source_path: str, dest_path: str) -> str:
+        self._drain()
+        self._drop(dest_path)
+        return super().copy(source_path, dest_path)
+
+    @_traced_operation
+    def read_versioned(self, path: str) -> tuple[Optional[bytes], Optional[str]]:
+        """Always read from S3 (a cached copy may be stale), refreshing the disk tier."""
+        entry = self._lookup(path)
+        if entry is not None and entry.pending_writes:
+            self._drain()
+        data, etag = super().read_versioned(path)
+        if data is None:
+            self._drop(path)
+        else:
+            self._store(path, data, etag)
+        return data, etag
+
+    @_traced_operation
+    def save_if_match(
+        self, path: str, data: bytes, etag: Optional[str], content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Conditional writes always go straight to S3; the disk tier is updated on success."""
+        new_etag = super().save_if_match(path, data, etag, content_type)
+        self._store(path, data, new_etag)
+        return new_etag
+
+    @_traced_operation
+    def open_stream(
+        self, path: str, byte_range: Optional[str] = None, if_none_match: Optional[str] = None
+    ) -> Optional[StorageStream]:
+        entry = self._lookup(path)
+        if entry is not None and entry.pending_writes:
+            self._drain()
+        return super().open_stream(path, byte_range, if_none_match)
+
+    @_traced_operation
+    def upload_directory(self, local_dir: str, s3_prefix: str) -> list[str]:
+        """Upload straight to S3 and forget any cached copies the upload replaced."""
+        urls = super().upload_directory(local_dir, s3_prefix)
+        prefix = s3_prefix.rstrip("/") + "/"
+        with self._tier_lock:
+            replaced = [path for path in self._entries if path.startswith(prefix)]
+        for path in replaced:
+            self._drop(path)
+        return urls
+
+
+class AsyncStorage:
+    """
+    Non-blocking wrapper around a StorageInterface for use from async routes.
+
+    Every storage method is exposed as a coroutine that runs the blocking call
+    (boto3 or filesystem I/O) in a worker thread, so one slow object never stalls
+    the event loop. Concurrent offloaded calls are bounded by a capacity limiter
+    so a burst of requests can't exhaust the thread pool. Plain attributes
+    (bucket_name, region, ...) are passed through unchanged.
+    """
+
+    def __init__(self, storage: StorageInterface, max_concurrency: int = 32):
+        """
+        Args:
+            storage: The synchronous backend to wrap
+            max_concurrency: Maximum number of storage calls running in threads at once
+        """
+        self.storage = storage
+        self.max_concurrency = max_concurrency
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+
+    def _get_limiter(self) -> anyio.CapacityLimiter:
+        # Created lazily: a limiter must be built inside a running event loop
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_concurrency)
+        return self._limiter
+
+    async def run(self, func, *args, **kwargs):
+        """Run any blocking callable in a bounded worker thread."""
+        return await anyio.to_thread.run_sync(
+            functools.partial(func, *args, **kwargs),
+            limiter=self._get_limiter(),
+        )
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.storage, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def offloaded(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return offloaded
+
+
+class ContentAddressedStore:
+    """
+    Deduplicated layout for project files on top of a storage backend.
+
+    Each unique file body is stored once under blobs/<sha256[:2]>/<sha256>, and
+    each project gets a content manifest (projects/<ts>/<id>/content_manifest.json)
+    mapping its relative paths to digests. Syncing a project uploads only the
+    blobs storage doesn't already have, so the resources/ building blocks,
+    shared libraries and repeated sprites are stored once across all projects.
+    Reads resolve project paths to blobs through the manifest; paths missing
+    from it (and projects synced before the layout was enabled) fall back to
+    their plain keys.
+
+    With LocalStorage the project directory being synced usually is the
+    stored copy (./projects/<ts>/<id> under base_path "."), which the static
+    mount keeps serving. Those files are then replaced by hardlinks to their
+    blobs, so identical files share one copy on disk instead of gaining a
+    second one under blobs/. Synced projects must not be edited in place
+    afterwards, since that would change the shared blob.
+    """
+
+    BLOB_PREFIX = "blobs"
+    MANIFEST_FILENAME = "content_manifest.json"
+    UPLOAD_BATCH_SIZE = 64  # Blobs read into memory per save_many call
+
+    # How long a missing manifest is remembered before storage is asked again
+    # (another process may sync the project meanwhile), and how many are kept;
+    # prefixes come from request paths, so misses must not grow without bound
+    MISS_TTL = 10.0
+    MAX_MISSES = 1024
+
+    def __init__(self, storage: StorageInterface):
+        self.storage = storage
+        self._lock = Lock()
+        self._manifests: dict[str, dict[str, str]] = {}
+        self._misses: OrderedDict[str, float] = OrderedDict()  # prefix -> monotonic time of the failed lookup
+
+    @staticmethod
+    def file_digest(file_path) -> str:
+        """SHA-256 of a local file, hashed from a memory map."""
+        with map_file(file_path) as data:
+            return hashlib.sha256(data).hexdigest()
+
+    def blob_key(self, digest: str) -> str:
+        return f"{self.BLOB_PREFIX}/{digest[:2]}/{digest}"
+
+    def manifest_key(self, prefix: str) -> str:
+        return f"{prefix.rstrip('/')}/{self.MANIFEST_FILENAME}"
+
+    def upload_directory(self, local_dir: str, prefix: str) -> dict[str, str]:
+        """
+        Store a local project directory as blobs plus a content manifest.
+
+        Args:
+            local_dir: Local directory path (e.g., "./projects/20231123/1")
+            prefix: Project prefix in storage (e.g., "projects/20231123/1")
+
+        Returns:
+            The manifest: relative path -> SHA-256 digest
+        """
+        prefix = prefix.rstrip("/")
+        local_path = Path(local_dir)
+        files = {
+            str(file_path.relative_to(local_path)).replace("\\", "/"): file_path
+            for file_path in sorted(local_path.rglob("*"))
+            if file_path.is_file() and file_path.name != self.MANIFEST_FILENAME
+        }
+        manifest = {relative: self.file_digest(file_path) for relative, file_path in files.items()}
+
+        # One local source file per unique blob
+        sources = {}
+        for relative, digest in manifest.items():
+            sources.setdefault(self.blob_key(digest), files[relative])
+
+        existing = self.storage.exists_many(list(sources)) if sources else {}
+        missing = [key for key, found in existing.items() if not found]
+        for start in range(0, len(missing), self.UPLOAD_BATCH_SIZE):
+            batch = missing[start:start + self.UPLOAD_BATCH_SIZE]
+            self.storage.save_many(
+                {key: sources[key].read_bytes() for key in batch},
+                content_type="application/octet-stream",
+            )
+
+        self.storage.save_text(self.manifest_key(prefix), json.dumps(manifest), content_type="application/json")
+        with self._lock:
+            self._manifests[prefix] = manifest
+            self._misses.pop(prefix, None)
+
+        if isinstance(self.storage, LocalStorage):
+            self._link_local_files(files, manifest, prefix)
+
+        print(f"Content store: {prefix} has {len(manifest)} files, "
+              f"{len(sources)} unique blobs, {len(missing)} uploaded")
+        return manifest
+
+    def _link_local_files(self, files: dict[str, Path], manifest: dict[str, str], prefix: str):
+        """Replace stored copies of a project's files with hardlinks to their blobs."""
+        linked = 0
+        for relative, file_path in files.items():
+            # Only files that are the storage copy of the project (not a working dir elsewhere)
+            if self.storage.local_path(f"{prefix}/{relative}") != file_path.resolve():
+                continue
+            blob_path = self.storage.local_path(self.blob_key(manifest[relative]))
+            if blob_path is None or os.path.samefile(blob_path, file_path):
+                continue
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.link")
+            try:
+                os.link(blob_path, tmp_path)
+                os.replace(tmp_path, file_path)
+                linked += 1
+            except OSError as e:
+                # e.g. blobs/ on another filesystem: keep the plain copy
+                tmp_path.unlink(missing_ok=True)
+                print(f"Content store: could not link {file_path} to its blob: {e}")
+                return
+        if linked:
+            print(f"Content store: {prefix} linked {linked} files to shared blobs")
+
+    def get_manifest(self, prefix: str) -> Optional[dict[str, str]]:
+        """
+        A project's content manifest, or None if it wasn't stored deduplicated.
+
+        Manifests are read from storage once per process, then served from
+        memory. A missing one is remembered for MISS_TTL seconds, then storage
+        is checked again, so projects synced by another process show up.
+        """
+        prefix = prefix.rstrip("/")
+        with self._lock:
+            if prefix in self._manifests:
+                return self._manifests[prefix]
+            missed_at = self._misses.get(prefix)
+            if missed_at is not None and time.monotonic() - missed_at < self.MISS_TTL:
+                return None
+
+        manifest = None
+        content = self.storage.read_text(self.manifest_key(prefix))
+        if content:
+            try:
+                manifest = json.loads(content)
+            except json.JSONDecodeError as e:
+                print(f"Invalid content manifest for {prefix}: {e}")
+
+        with self._lock:
+            if manifest is None:
+                # Don't hide a manifest written while we were reading
+                if prefix in self._manifests:
+                    return self._manifests[prefix]
+                self._misses.pop(prefix, None)
+                self._misses[prefix] = time.monotonic()
+                while len(self._misses) > self.MAX_MISSES:
+                    self._misses.popitem(last=False)
+                return None
+            self._misses.pop(prefix, None)
+            # Don't clobber a manifest written while we were reading
+            return self._manifests.setdefault(prefix, manifest)
+
+    def resolve(self, key: str) -> str:
+        """
+        Storage key holding the body of a file.
+
+        "projects/<ts>/<id>/<path>" resolves to its blob when the project's
+        manifest lists the path; every other key is returned unchanged.
+        """
+        parts = key.split("/", 3)
+        if len(parts) < 4 or parts[0] != "projects":
+            return key
+
+        manifest = self.get_manifest("/".join(parts[:3]))
+        digest = manifest.get(parts[3]) if manifest else None
+        return self.blob_key(digest) if digest else key
+
+
+# Storage instance singletons
 _storage_instance: Optional[StorageInterface] = None
+_async_storage_instance: Optional[AsyncStorage] = None
+_content_store_instance: Optional[ContentAddressedStore] = None
 
 
 def get_storage() -> StorageInterface:
@@ -481,6 +1821,12 @@ def get_storage() -> StorageInterface:
     - AWS_SECRET_ACCESS_KEY: AWS secret key
     - S3_ENDPOINT: Custom endpoint for S3-compatible services
     - CLOUDFRONT_DOMAIN: Optional CloudFront distribution domain
+    - S3_MAX_CONCURRENCY: Parallel transfers for uploads and batch operations (default: 10)
+    - S3_PRESIGN_EXPIRES: Lifetime of presigned GET URLs in seconds (default: 3600)
+    - S3_LOCAL_CACHE_PATH: Directory for a local disk tier in front of S3 (TieredStorage; off if unset)
+    - S3_LOCAL_CACHE_MAX_BYTES: Size bound of the disk tier (default: 1 GiB)
+    - S3_WRITE_MODE: "through" or "back" for the disk tier (default: "through")
+    - S3_LOCAL_CACHE_MUTABLE_TTL: Seconds cached manifests are trusted before revalidating (default: 5)
     - LOCAL_STORAGE_PATH: Base path for local storage (default: ".")
     - LOCAL_STORAGE_URL: Base URL for local file serving
 
@@ -499,14 +1845,28 @@ def get_storage() -> StorageInterface:
         if not bucket_name:
             raise ValueError("S3_BUCKET_NAME environment variable is required for S3 storage")
 
-        _storage_instance = S3Storage(
+        s3_kwargs = dict(
             bucket_name=bucket_name,
             region=os.getenv("S3_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
             custom_endpoint=os.getenv("S3_ENDPOINT"),
             cloudfront_domain=os.getenv("CLOUDFRONT_DOMAIN"),
+            max_concurrency=int(os.getenv("S3_MAX_CONCURRENCY", "10")),
+            presign_expires_in=int(os.getenv("S3_PRESIGN_EXPIRES", "3600")),
         )
+
+        cache_path = os.getenv("S3_LOCAL_CACHE_PATH")
+        if cache_path:
+            _storage_instance = TieredStorage(
+                cache_path=cache_path,
+                cache_max_bytes=int(os.getenv("S3_LOCAL_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))),
+                write_mode=os.getenv("S3_WRITE_MODE", "through").lower(),
+                mutable_ttl=float(os.getenv("S3_LOCAL_CACHE_MUTABLE_TTL", "5")),
+                **s3_kwargs,
+            )
+        else:
+            _storage_instance = S3Storage(**s3_kwargs)
     else:
         _storage_instance = LocalStorage(
             base_path=os.getenv("LOCAL_STORAGE_PATH", "."),
@@ -516,7 +1876,52 @@ def get_storage() -> StorageInterface:
     return _storage_instance
 
 
+def get_async_storage() -> AsyncStorage:
+    """
+    Get the configured storage backend wrapped for async routes.
+
+    Environment:
+    - STORAGE_IO_CONCURRENCY: Max storage calls offloaded to threads at once (default: 32)
+
+    Returns:
+        AsyncStorage wrapping the get_storage() backend
+    """
+    global _async_storage_instance
+
+    if _async_storage_instance is None:
+        _async_storage_instance = AsyncStorage(
+            get_storage(),
+            max_concurrency=int(os.getenv("STORAGE_IO_CONCURRENCY", "32")),
+        )
+
+    return _async_storage_instance
+
+
+def get_content_store() -> Optional[ContentAddressedStore]:
+    """
+    Get the deduplicated project layout, if enabled.
+
+    Environment:
+    - CONTENT_ADDRESSED_STORAGE: "true" to store project files as shared blobs (default: "false");
+      with local storage, synced project files become hardlinks to their blobs
+
+    Returns:
+        ContentAddressedStore over the get_storage() backend, or None if disabled
+    """
+    global _content_store_instance
+
+    if os.getenv("CONTENT_ADDRESSED_STORAGE", "false").lower() != "true":
+        return None
+
+    if _content_store_instance is None:
+        _content_store_instance = ContentAddressedStore(get_storage())
+
+    return _content_store_instance
+
+
 def reset_storage():
-    """Reset the storage singleton (useful for testing)."""
-    global _storage_instance
+    """Reset the storage singletons (useful for testing)."""
+    global _storage_instance, _async_storage_instance, _content_store_instance
     _storage_instance = None
+    _async_storage_instance = None
+    _content_store_instance = None
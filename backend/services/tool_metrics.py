@@ -0,0 +1,176 @@
+# Tool Call Metrics (functional style)
+# Pairs tool-use blocks with their tool-result blocks from the agent message stream and
+# aggregates latency, payload size and error counts per tool, per job and globally.
+
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Dict
+
+from claude_agent_sdk import AssistantMessage, UserMessage, ToolUseBlock, ToolResultBlock
+
+from services import tracing
+
+_lock = Lock()
+
+# Per-job stats kept for the most recent jobs only (job ids restart every session)
+MAX_TRACKED_JOBS = int(os.getenv("TOOL_METRICS_MAX_JOBS", "200"))
+
+_metrics = {
+    "current_job": None,  # (session, job_id)
+    "pending": {},  # tool_use_id -> in-flight call info
+    "jobs": OrderedDict(),  # (session, job_id) -> {tool_name: stats}, oldest first
+    "global": {},  # tool_name -> stats
+}
+
+
+def _payload_size(payload) -> int:
+    """Approximate payload size in bytes as it travels over the wire."""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+
+def _empty_stats() -> Dict:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "unanswered": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "input_bytes": 0,
+        "output_bytes": 0,
+    }
+
+
+def _record(tool_stats: Dict, name: str, duration_ms: float, input_bytes: int, output_bytes: int, is_error: bool):
+    stats = tool_stats.setdefault(name, _empty_stats())
+    stats["calls"] += 1
+    stats["errors"] += 1 if is_error else 0
+    stats["total_ms"] += duration_ms
+    stats["max_ms"] = max(stats["max_ms"], duration_ms)
+    stats["input_bytes"] += input_bytes
+    stats["output_bytes"] += output_bytes
+
+
+def _current_job_stats() -> Dict:
+    jobs = _metrics["jobs"]
+    key = _metrics["current_job"]
+    if key not in jobs:
+        jobs[key] = {}
+        while len(jobs) > MAX_TRACKED_JOBS:
+            jobs.popitem(last=False)
+    return jobs[key]
+
+
+def start_job(job_id, session: Optional[str] = None):
+    """
+    Start attributing tool calls to a job.
+
+    Args:
+        job_id: The job's idea id
+        session: The session timestamp the job runs in (ids repeat across sessions)
+    """
+    with _lock:
+        key = (session, job_id)
+        _metrics["current_job"] = key
+        _metrics["pending"] = {}
+        _metrics["jobs"].pop(key, None)
+        _current_job_stats()
+
+
+def observe_message(msg):
+    """Inspect one streamed SDK message for tool calls and tool results."""
+    if isinstance(msg, AssistantMessage):
+        now_ns = time.time_ns()
+        with _lock:
+            for block in msg.content:
+                if isinstance(block, ToolUseBlock):
+                    _metrics["pending"][block.id] = {
+                        "name": block.name,
+                        "started_ns": now_ns,
+                        "started": time.perf_counter(),
+                        "input_bytes": _payload_size(block.input),
+                    }
+
+    elif isinstance(msg, UserMessage) and isinstance(msg.content, list):
+        finished = []
+        with _lock:
+            job_stats = _current_job_stats()
+            for block in msg.content:
+                if not isinstance(block, ToolResultBlock):
+                    continue
+                call = _metrics["pending"].pop(block.tool_use_id, None)
+                if call is None:
+                    continue
+
+                duration_ms = (time.perf_counter() - call["started"]) * 1000
+                output_bytes = _payload_size(block.content)
+                is_error = bool(block.is_error)
+                for tool_stats in (job_stats, _metrics["global"]):
+                    _record(tool_stats, call["name"], duration_ms, call["input_bytes"], output_bytes, is_error)
+                finished.append((call, output_bytes, is_error))
+
+        for call, output_bytes, is_error in finished:
+            tracing.record_span(f"tool.{call['name']}", call["started_ns"], attributes={
+                "tool.name": call["name"],
+                "tool.input_bytes": call["input_bytes"],
+                "tool.output_bytes": output_bytes,
+                "tool.is_error": is_error,
+            })
+
+
+def finish_job():
+    """Count tool calls that never received a result before the stream ended."""
+    with _lock:
+        job_stats = _current_job_stats()
+        for call in _metrics["pending"].values():
+            for tool_stats in (job_stats, _metrics["global"]):
+                tool_stats.setdefault(call["name"], _empty_stats())["unanswered"] += 1
+        _metrics["pending"] = {}
+
+
+def _summarize(tool_stats: Dict) -> Dict:
+    summary = {}
+    for name, stats in sorted(tool_stats.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        summary[name] = {
+            **stats,
+            "total_ms": round(stats["total_ms"], 2),
+            "max_ms": round(stats["max_ms"], 2),
+            "avg_ms": round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0,
+        }
+    return summary
+
+
+def get_tool_stats(job_id: Optional[int] = None, session: Optional[str] = None) -> Dict:
+    """
+    Per-tool stats, sorted by total time. Global totals unless a job id is given.
+
+    Args:
+        job_id: Only this job
+        session: Session timestamp of the job; the most recent run of job_id if omitted
+    """
+    with _lock:
+        if job_id is not None:
+            matches = [
+                (job_session, stats)
+                for (job_session, jid), stats in _metrics["jobs"].items()
+                if jid == job_id and (session is None or job_session == session)
+            ]
+            job_session, stats = matches[-1] if matches else (session, {})
+            return {
+                "job_id": job_id,
+                "session": job_session,
+                "tools": _summarize(stats),
+            }
+        return {
+            "tools": _summarize(_metrics["global"]),
+            "jobs": {
+                f"{job_session}/{jid}" if job_session else str(jid): _summarize(stats)
+                for (job_session, jid), stats in _metrics["jobs"].items()
+            },
+        }
@@ -0,0 +1,178 @@
+"""
+Tracing
+
+Opt-in OpenTelemetry tracing for the job pipeline. Spans are exported to the
+console or to a local JSON-lines file, so a slow game can be broken down in a
+trace viewer without any collector running.
+
+Every span opened while a job is bound (see `job_context`) carries a `job.id`
+attribute, which links agent, Gemini, MCP tool and storage spans together.
+
+Environment:
+    TRACING_ENABLED: "1"/"true" to turn tracing on (default: off)
+    TRACING_EXPORTER: "file" or "console" (default: "file")
+    TRACING_FILE: Output path for the file exporter (default: "traces.jsonl")
+    TRACING_SERVICE_NAME: service.name resource attribute (default: "cc-forever")
+
+Requires the optional `opentelemetry-sdk` package; when it is missing or
+tracing is disabled every helper here is a cheap no-op.
+
+Usage:
+    from services import tracing
+
+    with tracing.job_context(job_id), tracing.span("run_once"):
+        ...
+
+    @tracing.traced("gemini.generate")
+    def generate(...):
+        ...
+"""
+
+import os
+import time
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Optional
+
+_lock = Lock()
+_initialized = False
+_tracer = None
+_provider = None
+
+# Job currently being worked on in this context (thread / task)
+_job_id: ContextVar[Optional[str]] = ContextVar("tracing_job_id", default=None)
+
+
+def is_enabled() -> bool:
+    return os.getenv("TRACING_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+def _get_tracer():
+    """Lazily build the tracer provider on first use. Returns None when disabled."""
+    global _initialized, _tracer, _provider
+
+    if _initialized:
+        return _tracer
+
+    with _lock:
+        if _initialized:
+            return _tracer
+        _initialized = True
+
+        if not is_enabled():
+            return None
+
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        except ImportError:
+            print("TRACING_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+            return None
+
+        service_name = os.getenv("TRACING_SERVICE_NAME", "cc-forever")
+        _provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+
+        if os.getenv("TRACING_EXPORTER", "file").lower() == "console":
+            exporter = ConsoleSpanExporter()
+        else:
+            # One JSON span per line, readable offline or importable into a trace viewer
+            trace_file = open(os.getenv("TRACING_FILE", "traces.jsonl"), "a", encoding="utf-8")
+            exporter = ConsoleSpanExporter(
+                out=trace_file,
+                formatter=lambda s: s.to_json(indent=None) + os.linesep,
+            )
+
+        _provider.add_span_processor(BatchSpanProcessor(exporter))
+        trace.set_tracer_provider(_provider)
+        _tracer = trace.get_tracer("cc-forever")
+        return _tracer
+
+
+def _clean_attributes(attributes: Optional[dict]) -> dict:
+    """Drop None values and coerce anything OpenTelemetry can't store to str."""
+    cleaned = {}
+    job_id = _job_id.get()
+    if job_id is not None:
+        cleaned["job.id"] = job_id
+
+    for key, value in (attributes or {}).items():
+        if value is None:
+            continue
+        if not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        cleaned[key] = value
+    return cleaned
+
+
+@contextmanager
+def job_context(job_id):
+    """Bind a job id to every span opened inside this block."""
+    token = _job_id.set(str(job_id))
+    try:
+        yield
+    finally:
+        _job_id.reset(token)
+
+
+@contextmanager
+def span(name: str, attributes: Optional[dict] = None):
+    """Open a span as the current span. Yields the span, or None when tracing is off."""
+    tracer = _get_tracer()
+    if tracer is None:
+        yield None
+        return
+
+    with tracer.start_as_current_span(name, attributes=_clean_attributes(attributes)) as current:
+        yield current
+
+
+def record_span(name: str, start_ns: int, end_ns: Optional[int] = None, attributes: Optional[dict] = None):
+    """Record an already-finished interval (e.g. waiting on a streamed message) as a span."""
+    tracer = _get_tracer()
+    if tracer is None:
+        return
+
+    finished = tracer.start_span(name, start_time=start_ns, attributes=_clean_attributes(attributes))
+    finished.end(end_time=end_ns if end_ns is not None else time.time_ns())
+
+
+def annotate(attributes: dict):
+    """Add attributes to the current span, if any."""
+    if _get_tracer() is None:
+        return
+
+    from opentelemetry import trace
+
+    current = trace.get_current_span()
+    for key, value in _clean_attributes(attributes).items():
+        current.set_attribute(key, value)
+
+
+def traced(name: str, attributes: Optional[dict] = None):
+    """Decorator wrapping a sync or async function in a span."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def shutdown():
+    """Flush pending spans. Safe to call when tracing is disabled."""
+    if _provider is not None:
+        _provider.shutdown()
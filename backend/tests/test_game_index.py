@@ -0,0 +1,144 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import games_routes
+from services.packages.game.index import GameIndex, encode_cursor
+from services.packages.game.types import GameMetadata, ProjectEntry
+
+
+def make_entry(project_id: str, name: str, timestamp: str = "20251205_202015", **metadata) -> ProjectEntry:
+    fields = {"summary": "", "base_game": "snake", "genre": [], "prompt": "", **metadata}
+    return ProjectEntry(
+        id=project_id,
+        timestamp=timestamp,
+        path_to_index_html=f"{timestamp}/{project_id}/index.html",
+        metadata=GameMetadata(name=name, **fields),
+    )
+
+
+@pytest.fixture
+def index() -> GameIndex:
+    names = ["Zeta", "alpha", "Mango", "beta", "Kiwi", "delta", "Omega"]
+    return GameIndex([(seq, make_entry(str(seq), name)) for seq, name in enumerate(names, start=1)])
+
+
+@pytest.mark.parametrize("sort", ["oldest", "newest", "name", "cover"])
+def test_query_pages_cover_every_entry_once(index, sort):
+    seen, cursor = [], None
+    while True:
+        page, cursor, total = index.query(sort=sort, cursor=cursor, limit=3)
+        seen += [entry["id"] for entry in page]
+        if cursor is None:
+            break
+    assert total == 7
+    assert sorted(seen) == sorted(str(seq) for seq in range(1, 8))
+
+
+def test_query_cursor_keeps_position_when_entries_are_added(index):
+    page, cursor, _ = index.query(sort="oldest", limit=3)
+    index.add(8, make_entry("8", "Late"))
+    rest, _, total = index.query(sort="oldest", cursor=cursor, limit=10)
+    assert [entry["id"] for entry in page + rest] == [str(seq) for seq in range(1, 9)]
+    assert total == 8
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encode_cursor(("a",)),
+    encode_cursor((1, 2, 3)),
+    encode_cursor(("1", 1)),
+    encode_cursor((True, 1)),
+])
+def test_query_rejects_malformed_cursors(index, cursor):
+    with pytest.raises(ValueError):
+        index.query(sort="oldest", cursor=cursor)
+
+
+def test_query_rejects_cursor_from_another_sort(index):
+    _, name_cursor, _ = index.query(sort="name", limit=2)
+    with pytest.raises(ValueError):
+        index.query(sort="oldest", cursor=name_cursor)
+    _, oldest_cursor, _ = index.query(sort="oldest", limit=2)
+    with pytest.raises(ValueError):
+        index.query(sort="name", cursor=oldest_cursor)
+
+
+@pytest.fixture
+def search_index() -> GameIndex:
+    # Scores differ by where "dungeon" appears and tie within each group
+    entries = []
+    for seq in range(1, 13):
+        if seq % 3 == 0:
+            fields = {"name": f"Dungeon {seq}"}
+        elif seq % 3 == 1:
+            fields = {"name": f"Game {seq}", "genre": ["Dungeon"]}
+        else:
+            fields = {"name": f"Game {seq}", "summary": "A dungeon crawler"}
+        entries.append((seq, make_entry(str(seq), **fields)))
+    return GameIndex(entries)
+
+
+def search_all(index: GameIndex, text: str, limit: int = 5, between_pages=None) -> list[str]:
+    seen, cursor = [], None
+    while True:
+        page, cursor, _ = index.search(text, cursor=cursor, limit=limit)
+        seen += [entry["id"] for entry in page]
+        if cursor is None:
+            return seen
+        if between_pages:
+            between_pages()
+
+
+def test_search_pages_cover_every_match_once(search_index):
+    seen = search_all(search_index, "dungeon")
+    assert sorted(seen, key=int) == [str(seq) for seq in range(1, 13)]
+    # Name matches rank first, newest first among equal scores
+    assert seen[:4] == ["12", "9", "6", "3"]
+    assert search_all(search_index, "dungeon", limit=100) == seen
+
+
+def test_search_cursor_keeps_position_when_games_are_added(search_index):
+    added = iter(range(100, 110))
+
+    def add_games():
+        # Unrelated games change how rare "dungeon" is, but not the scores
+        for _ in range(3):
+            seq = next(added)
+            search_index.add(seq, make_entry(str(seq), f"Racer {seq}"))
+
+    seen = search_all(search_index, "dungeon", limit=3, between_pages=add_games)
+    assert seen == search_all(search_index, "dungeon", limit=100)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encode_cursor(("a",)),
+    encode_cursor(("a", 1)),
+    encode_cursor((True, 1)),
+    encode_cursor((1.5, 2.5)),
+    encode_cursor(("Mango", 3, 3)),
+])
+def test_search_rejects_malformed_cursors(search_index, cursor):
+    with pytest.raises(ValueError):
+        search_index.search("dungeon", cursor=cursor)
+
+
+def test_search_rejects_cursor_from_name_sort(search_index):
+    _, name_cursor, _ = search_index.query(sort="name", limit=2)
+    with pytest.raises(ValueError):
+        search_index.search("dungeon", cursor=name_cursor)
+
+
+def test_search_route_answers_bad_cursors_with_400(search_index, monkeypatch):
+    monkeypatch.setattr(games_routes, "get_game_index", lambda: search_index)
+    app = FastAPI()
+    app.include_router(games_routes.games_router)
+    client = TestClient(app)
+
+    response = client.get("/games/search", params={"q": "dungeon", "limit": 5})
+    assert response.status_code == 200
+    assert response.json()["total_count"] == 12
+
+    response = client.get("/games/search", params={"q": "dungeon", "cursor": encode_cursor(("a",))})
+    assert response.status_code == 400
@@ -0,0 +1,166 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import anyio
+import pytest
+from openai import AsyncOpenAI
+
+import generate_manifest
+from generate_manifest import AnalysisCache, TokenBucket, scan_projects_folder
+
+TIMESTAMP = "20251205_202015"
+
+# Folder name -> <title>; no base game in the titles, so every project needs the model
+PROJECTS = {"1": "Alpha Quest", "2": "Bravo Rush", "3": "Charlie Drift", "10": "Delta Bloom"}
+
+
+class StubCompletions(BaseHTTPRequestHandler):
+    """
+    OpenAI-compatible chat completions endpoint.
+
+    The first request for each game is answered 429 and the second 500, then
+    the requested fields are returned. Earlier games answer slower, so
+    results arrive out of folder order.
+    """
+
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        title = re.search(r"Title: (.+)", request["messages"][-1]["content"]).group(1)
+        with self.lock:
+            attempt = self.attempts[title] = self.attempts.get(title, 0) + 1
+
+        error = {"error": {"message": "stub error", "type": "stub", "code": None}}
+        if attempt == 1:
+            return self.reply(429, error, {"Retry-After": "0"})
+        if attempt == 2:
+            return self.reply(500, error)
+
+        time.sleep(0.05 * (len(PROJECTS) - list(PROJECTS.values()).index(title)))
+        values = {"name": title, "summary": f"About {title}", "base_game": "snake", "genre": ["Puzzle"], "prompt": "p"}
+        fields = request["response_format"]["json_schema"]["schema"]["properties"]
+        self.reply(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps({field: values[field] for field in fields})},
+            }],
+        })
+
+
+@pytest.fixture
+def stub_url():
+    StubCompletions.attempts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCompletions)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def projects_path(tmp_path):
+    for project_id, title in PROJECTS.items():
+        project_dir = tmp_path / "projects" / TIMESTAMP / project_id
+        project_dir.mkdir(parents=True)
+        (project_dir / "index.html").write_text(
+            f'<html><head><title>{title}</title></head><body><script src="main.js"></script></body></html>'
+        )
+        (project_dir / "main.js").write_text("class Main extends Phaser.Scene {}")
+    return tmp_path / "projects"
+
+
+def test_scan_retries_and_keeps_folder_order(stub_url, projects_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_manifest, "INITIAL_BACKOFF", 0.01)
+
+    async def scan():
+        client = AsyncOpenAI(base_url=stub_url, api_key="stub", max_retries=0)
+        return await scan_projects_folder(
+            str(projects_path),
+            str(tmp_path / "cartridge_arts"),
+            client,
+            concurrency=4,
+            rate_limiter=TokenBucket(1000),
+            max_retries=3,
+        )
+
+    groups = anyio.run(scan)
+
+    assert [group.id for group in groups] == [TIMESTAMP]
+    projects = groups[0].projects
+    assert [project.id for project in projects] == list(PROJECTS)
+    assert [project.metadata.name for project in projects] == list(PROJECTS.values())
+    assert all(project.metadata.summary == f"About {project.metadata.name}" for project in projects)
+    # 429, then 500, then success for every game
+    assert StubCompletions.attempts == {title: 3 for title in PROJECTS.values()}
+
+
+def test_scan_gives_up_after_max_retries(stub_url, projects_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_manifest, "INITIAL_BACKOFF", 0.01)
+
+    async def scan():
+        client = AsyncOpenAI(base_url=stub_url, api_key="stub", max_retries=0)
+        return await scan_projects_folder(
+            str(projects_path), str(tmp_path / "cartridge_arts"), client,
+            rate_limiter=TokenBucket(1000), max_retries=1,
+        )
+
+    assert anyio.run(scan) == []
+    assert StubCompletions.attempts == {title: 2 for title in PROJECTS.values()}
+
+
+def test_incremental_scan_reanalyzes_games_whose_scripts_changed(stub_url, projects_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_manifest, "INITIAL_BACKOFF", 0.01)
+    cache = AnalysisCache(tmp_path / "cache.json")
+
+    async def scan():
+        client = AsyncOpenAI(base_url=stub_url, api_key="stub", max_retries=0)
+        return await scan_projects_folder(
+            str(projects_path), str(tmp_path / "cartridge_arts"), client,
+            rate_limiter=TokenBucket(1000), cache=cache, incremental=True,
+        )
+
+    assert sum(len(group.projects) for group in anyio.run(scan)) == len(PROJECTS)
+    assert anyio.run(scan) == []
+
+    # index.html is unchanged; only the script it loads was edited
+    (projects_path / TIMESTAMP / "2" / "main.js").write_text("class Boss extends Phaser.Scene {}")
+    StubCompletions.attempts = {}
+    groups = anyio.run(scan)
+    assert [project.id for group in groups for project in group.projects] == ["2"]
+    assert list(StubCompletions.attempts) == [PROJECTS["2"]]
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_token_bucket_rejects_non_positive_rates(rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
+
+
+def test_scan_rejects_zero_concurrency(projects_path, tmp_path):
+    with pytest.raises(ValueError):
+        anyio.run(lambda: scan_projects_folder(str(projects_path), str(tmp_path), None, concurrency=0))
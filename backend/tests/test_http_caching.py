@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services import http_caching
+from services.http_caching import DEFAULT, IMMUTABLE, CachingStaticFiles, cache_control_for
+
+KEY = "projects/20251205_202015/1/main.js"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Record the thread of every project index lookup; the job of project 1 has finished."""
+    threads = []
+
+    def get_project_index(timestamp, job_id):
+        threads.append(threading.get_ident())
+        return object() if job_id == "1" else None
+
+    monkeypatch.setattr(http_caching, "get_project_index", get_project_index)
+    return threads
+
+
+def test_cache_control_for_does_no_lookups(lookups):
+    assert cache_control_for(KEY) == DEFAULT
+    assert cache_control_for(KEY, finished=True) == IMMUTABLE
+    assert cache_control_for("projects/20251205_202015/manifest.0123456789abcdef.json") == IMMUTABLE
+    assert lookups == []
+
+
+def test_static_files_look_up_projects_off_the_event_loop(lookups, tmp_path):
+    for job_id in ["1", "2"]:
+        (tmp_path / "20251205_202015" / job_id).mkdir(parents=True)
+        (tmp_path / "20251205_202015" / job_id / "main.js").write_text("let x = 1;")
+
+    loop_threads = []
+    app = FastAPI()
+    app.mount("/projects", CachingStaticFiles(directory=str(tmp_path), prefix="projects"))
+
+    @app.get("/loop")
+    async def loop_thread():
+        loop_threads.append(threading.get_ident())
+
+    with TestClient(app) as client:
+        client.get("/loop")
+        finished = client.get("/projects/20251205_202015/1/main.js")
+        running = client.get("/projects/20251205_202015/2/main.js")
+
+    assert finished.headers["cache-control"] == IMMUTABLE
+    assert running.headers["cache-control"] == DEFAULT
+    assert len(lookups) == 2
+    assert loop_threads[0] not in lookups
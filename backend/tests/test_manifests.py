@@ -0,0 +1,114 @@
+import json
+
+from services.packages.game import manifests
+from services.packages.game.manifests import SESSION_MANIFEST, publish_entry, write_manifests, write_session_manifest
+from services.s3interface import LocalStorage, PreconditionFailedError
+
+TIMESTAMP = "20251205_202015"
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_session_manifest_follows_content_back_to_an_earlier_version(tmp_path):
+    version_a = [{"id": "1"}]
+    version_b = [{"id": "1"}, {"id": "2"}]
+
+    write_session_manifest(tmp_path, TIMESTAMP, version_a)
+    write_session_manifest(tmp_path, TIMESTAMP, version_b)
+    record = write_session_manifest(tmp_path, TIMESTAMP, version_a)
+
+    assert read_json(tmp_path / TIMESTAMP / SESSION_MANIFEST) == version_a
+    assert read_json(tmp_path / record["manifest"]) == version_a
+
+
+def test_pruning_keeps_the_version_that_became_current_again(tmp_path):
+    version_a, version_b, version_c = [{"id": "a"}], [{"id": "b"}], [{"id": "c"}]
+
+    record_a = write_session_manifest(tmp_path, TIMESTAMP, version_a)
+    write_session_manifest(tmp_path, TIMESTAMP, version_b)
+    write_session_manifest(tmp_path, TIMESTAMP, version_a)
+    record_c = write_session_manifest(tmp_path, TIMESTAMP, version_c)
+
+    # The current version plus the one older root indexes may still point at
+    assert (tmp_path / record_a["manifest"]).exists()
+    assert (tmp_path / record_c["manifest"]).exists()
+    assert len(list((tmp_path / TIMESTAMP).glob("manifest.*.json"))) == 2
+
+
+def test_root_index_points_at_hashed_manifests(tmp_path):
+    write_manifests(tmp_path, {TIMESTAMP: [{"id": "1"}], "20251206_101010": [{"id": "1"}, {"id": "2"}]})
+
+    index = read_json(tmp_path / "index.json")
+    assert index["total_count"] == 3
+    for session in index["sessions"]:
+        assert len(read_json(tmp_path / session["manifest"])) == session["count"]
+
+
+def test_publish_prunes_old_versions_in_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifests, "PRUNE_GRACE", 0)
+    storage = LocalStorage(str(tmp_path))
+
+    for project_id in ["1", "2", "3", "4"]:
+        record = publish_entry(storage, {"id": project_id, "timestamp": TIMESTAMP})
+
+    session_dir = tmp_path / "projects" / TIMESTAMP
+    assert len(list(session_dir.glob("manifest.*.json"))) == manifests.KEEP_VERSIONS
+    assert len(read_json(tmp_path / "projects" / record["manifest"])) == 4
+    assert len(read_json(session_dir / SESSION_MANIFEST)) == 4
+
+
+def test_publish_keeps_recent_versions_within_the_grace_period(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    for project_id in ["1", "2", "3", "4"]:
+        publish_entry(storage, {"id": project_id, "timestamp": TIMESTAMP})
+
+    assert len(list((tmp_path / "projects" / TIMESTAMP).glob("manifest.*.json"))) == 4
+
+
+class RacingStorage(LocalStorage):
+    """LocalStorage whose first root index write runs `race` first and then loses."""
+
+    def __init__(self, base_path, race):
+        super().__init__(base_path)
+        self.race = race
+        self.calls = []
+
+    def read_versioned(self, path):
+        self.calls.append(("read", path))
+        return super().read_versioned(path)
+
+    def save_if_match(self, path, data, etag, content_type=None):
+        self.calls.append(("save", path))
+        if path.endswith("/index.json") and self.race:
+            race, self.race = self.race, None
+            race()
+            raise PreconditionFailedError(path)
+        return super().save_if_match(path, data, etag, content_type)
+
+
+def test_publish_retries_index_conflicts_without_session_round_trips(tmp_path):
+    storage = RacingStorage(str(tmp_path), race=lambda: None)
+
+    publish_entry(storage, {"id": "1", "timestamp": TIMESTAMP})
+
+    session_calls = [call for call in storage.calls if f"{TIMESTAMP}/manifest." in call[1]]
+    # Session manifest: read + write; hashed copy: one write; final check: one read
+    assert len(session_calls) == 4
+    assert storage.calls.count(("save", "projects/index.json")) == 2
+
+
+def test_publish_catches_up_with_a_session_changed_during_the_index_update(tmp_path):
+    def concurrent_publish():
+        # Another writer adds a game and updates the index before we do
+        publish_entry(LocalStorage(str(tmp_path)), {"id": "2", "timestamp": TIMESTAMP})
+
+    storage = RacingStorage(str(tmp_path), race=concurrent_publish)
+    record = publish_entry(storage, {"id": "1", "timestamp": TIMESTAMP})
+
+    index = read_json(tmp_path / "projects" / "index.json")
+    assert index["sessions"] == [record]
+    assert [entry["id"] for entry in read_json(tmp_path / "projects" / record["manifest"])] == ["1", "2"]
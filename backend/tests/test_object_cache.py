@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from services.object_cache import ObjectCache
+from services.s3interface import LocalStorage
+
+KEY = "projects/20251205_202015/1/main.js"
+
+
+@pytest.fixture
+def storage(tmp_path) -> LocalStorage:
+    storage = LocalStorage(str(tmp_path / "storage"))
+    storage.save_text(KEY, "let x = 1;" * 1000)
+    return storage
+
+
+def read(stream) -> bytes:
+    return b"".join(stream.chunks)
+
+
+def test_concurrent_misses_store_an_intact_entry(storage, tmp_path):
+    cache = ObjectCache(storage, disk_path=str(tmp_path / "cache"))
+    expected = storage.read_binary(KEY)
+    barrier = threading.Barrier(8)
+    bodies = []
+
+    def miss():
+        barrier.wait()
+        bodies.append(read(cache.open(KEY)))
+
+    threads = [threading.Thread(target=miss) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert bodies == [expected] * 8
+    assert read(cache.open(KEY)) == expected
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == [cache._disk_file(KEY).name]
+
+
+def test_revalidated_entry_evicted_from_disk_is_fetched_again(storage, tmp_path):
+    cache = ObjectCache(storage, revalidate_after=0, disk_path=str(tmp_path / "cache"))
+    expected = read(cache.open(KEY))
+
+    # Another request evicted the body between the lookup and the 304
+    cache._disk_file(KEY).unlink()
+
+    assert read(cache.open(KEY)) == expected
+    assert cache._disk_file(KEY).exists()
+    assert read(cache.open(KEY, "bytes=0-9")) == expected[:10]
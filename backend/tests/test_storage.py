@@ -0,0 +1,91 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from services.s3interface import ContentAddressedStore, LocalStorage, PreconditionFailedError, S3Storage
+
+BUCKET = "test-bucket"
+KEY = "projects/index.json"
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, tmp_path, monkeypatch):
+    if request.param == "local":
+        yield LocalStorage(str(tmp_path))
+        return
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET)
+
+
+def test_read_versioned_missing_file(storage):
+    assert storage.read_versioned(KEY) == (None, None)
+
+
+def test_create_only_write_succeeds_when_missing(storage):
+    storage.save_if_match(KEY, b"v1", None)
+    data, etag = storage.read_versioned(KEY)
+    assert data == b"v1"
+    assert etag
+
+
+def test_create_only_write_conflicts_when_present(storage):
+    storage.save_if_match(KEY, b"v1", None)
+    with pytest.raises(PreconditionFailedError):
+        storage.save_if_match(KEY, b"v2", None)
+    assert storage.read_binary(KEY) == b"v1"
+
+
+def test_write_with_current_etag_succeeds(storage):
+    storage.save_if_match(KEY, b"v1", None)
+    _, etag = storage.read_versioned(KEY)
+    storage.save_if_match(KEY, b"v2", etag)
+    assert storage.read_binary(KEY) == b"v2"
+
+
+def test_write_with_stale_etag_conflicts(storage):
+    storage.save_if_match(KEY, b"v1", None)
+    _, stale_etag = storage.read_versioned(KEY)
+    storage.save_binary(KEY, b"v2")
+    with pytest.raises(PreconditionFailedError):
+        storage.save_if_match(KEY, b"v3", stale_etag)
+    assert storage.read_binary(KEY) == b"v2"
+
+
+def test_list_modified_matches_key_prefixes(storage):
+    storage.save_text("projects/1/manifest.json", "[]")
+    storage.save_text("projects/1/manifest.0123456789abcdef.json", "[]")
+    storage.save_text("projects/1/1/index.html", "")
+    storage.save_text("projects/10/manifest.json", "[]")
+
+    assert sorted(storage.list_modified("projects/1/manifest.")) == [
+        "projects/1/manifest.0123456789abcdef.json",
+        "projects/1/manifest.json",
+    ]
+    assert len(storage.list_modified("projects/1/")) == 3
+
+
+def test_content_manifest_miss_expires(tmp_path, monkeypatch):
+    storage = LocalStorage(str(tmp_path / "storage"))
+    reader, writer = ContentAddressedStore(storage), ContentAddressedStore(storage)
+    project = tmp_path / "work" / "1"
+    project.mkdir(parents=True)
+    (project / "main.js").write_text("let x = 1;")
+
+    assert reader.resolve("projects/20251205_202015/1/main.js") == "projects/20251205_202015/1/main.js"
+    # Synced by another process: the miss is remembered for MISS_TTL, then storage is read again
+    manifest = writer.upload_directory(str(project), "projects/20251205_202015/1")
+    assert reader.get_manifest("projects/20251205_202015/1") is None
+    monkeypatch.setattr(ContentAddressedStore, "MISS_TTL", 0)
+    assert reader.resolve("projects/20251205_202015/1/main.js") == reader.blob_key(manifest["main.js"])
+
+
+def test_content_manifest_misses_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(ContentAddressedStore, "MAX_MISSES", 4)
+    store = ContentAddressedStore(LocalStorage(str(tmp_path)))
+    for job_id in range(10):
+        assert store.get_manifest(f"projects/20251205_202015/{job_id}") is None
+    assert len(store._misses) == 4
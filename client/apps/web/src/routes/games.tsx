@@ -59,83 +59,46 @@ function getTimestamp(project: Project): string {
 
 const ITEMS_PER_PAGE = 12
 
-function isRecommended(project: Project): boolean {
-    return RECOMMENDED_GAMES.some(
-        rec => rec.timestamp === getTimestamp(project) && rec.id === project.id
-    )
-}
-
-function filterProjects(projects: Project[], filters: { genres: string[], baseGames: string[] }): Project[] {
-    let filtered = projects
-
-    if (filters.genres.length > 0) {
-        filtered = filtered.filter(project =>
-            project.metadata.genre.some(genre => filters.genres.includes(genre))
-        )
-    }
-
-    if (filters.baseGames.length > 0) {
-        filtered = filtered.filter(project =>
-            filters.baseGames.includes(project.metadata.base_game)
-        )
-    }
-
-    return filtered
-}
-
-async function fetchManifest(): Promise<{ recommended: Project[], notTested: Project[] }> {
-    const res = await fetch(`${ASSETS_BASE_URL}/projects/manifest.json`)
-    const allProjects: Project[] = await res.json()
-
-    // Partition into recommended and not tested
-    const recommended: Project[] = []
-    const notTested: Project[] = []
-
-    allProjects.forEach(project => {
-        if (isRecommended(project)) {
-            recommended.push(project)
-        } else {
-            notTested.push(project)
-        }
+// Card fields only; the job report and prompt are not needed for the grid
+const GAME_FIELDS = "id,timestamp,path_to_index_html,path_to_banner_art,path_to_cover_art,metadata.name,metadata.base_game,metadata.genre"
+
+const RECOMMENDED_KEYS = RECOMMENDED_GAMES.map(rec => `${rec.timestamp}:${rec.id}`).join(",")
+
+type Filters = { genres: string[], baseGames: string[] }
+
+// Filtering and pagination happen on the backend (/games); projects with cover art come first
+async function fetchGames(
+    selection: Record<string, string>,
+    filters: Filters,
+    cursor: string | null,
+): Promise<FetchResult> {
+    const params = new URLSearchParams({
+        ...selection,
+        sort: "cover",
+        limit: String(ITEMS_PER_PAGE),
+        fields: GAME_FIELDS,
     })
+    if (filters.genres.length > 0) params.set("genre", filters.genres[0])
+    if (filters.baseGames.length > 0) params.set("base_game", filters.baseGames[0])
+    if (cursor) params.set("cursor", cursor)
 
-    // Sort each list: projects with cover art first, then without
-    const sortByCoverArt = (a: Project, b: Project) => {
-        const aHasCover = a.path_to_cover_art ? 1 : 0
-        const bHasCover = b.path_to_cover_art ? 1 : 0
-        return bHasCover - aHasCover
-    }
-
-    recommended.sort(sortByCoverArt)
-    notTested.sort(sortByCoverArt)
-
-    return { recommended, notTested }
-}
-
-async function fetchRecommendedGames({ pageParam }: { pageParam: number }) {
-    const { recommended } = await fetchManifest()
-    const start = pageParam * ITEMS_PER_PAGE
-    const end = start + ITEMS_PER_PAGE
-    const projects = recommended.slice(start, end)
+    const res = await fetch(`${API_BASE_URL}/games?${params}`)
+    if (!res.ok) throw new Error(`Failed to load games (${res.status})`)
+    const page: { projects: Project[], next_cursor: string | null, total_count: number } = await res.json()
 
     return {
-        projects,
-        nextCursor: end < recommended.length ? pageParam + 1 : undefined,
-        totalCount: recommended.length
+        projects: page.projects,
+        nextCursor: page.next_cursor ?? undefined,
+        totalCount: page.total_count,
     }
 }
 
-async function fetchNotTestedGames({ pageParam }: { pageParam: number }) {
-    const { notTested } = await fetchManifest()
-    const start = pageParam * ITEMS_PER_PAGE
-    const end = start + ITEMS_PER_PAGE
-    const projects = notTested.slice(start, end)
+function fetchRecommendedGames({ pageParam, filters }: { pageParam: string | null, filters: Filters }) {
+    return fetchGames({ include: RECOMMENDED_KEYS }, filters, pageParam)
+}
 
-    return {
-        projects,
-        nextCursor: end < notTested.length ? pageParam + 1 : undefined,
-        totalCount: notTested.length
-    }
+function fetchNotTestedGames({ pageParam, filters }: { pageParam: string | null, filters: Filters }) {
+    return fetchGames({ exclude: RECOMMENDED_KEYS }, filters, pageParam)
 }
 
 export const Route = createFileRoute('/games')({
@@ -144,7 +107,7 @@ export const Route = createFileRoute('/games')({
 
 type FetchResult = {
     projects: Project[]
-    nextCursor?: number
+    nextCursor?: string
     totalCount: number
 }
 
@@ -156,8 +119,8 @@ function GameGrid({
 }: {
     title: string
     queryKey: string[]
-    queryFn: (context: { pageParam: number }) => Promise<FetchResult>
-    filters: { genres: string[], baseGames: string[] }
+    queryFn: (context: { pageParam: string | null, filters: Filters }) => Promise<FetchResult>
+    filters: Filters
 }) {
     const observerTarget = useRef<HTMLDivElement>(null)
     const navigate = useNavigate()
@@ -171,17 +134,11 @@ function GameGrid({
         status,
     } = useInfiniteQuery({
         queryKey: [...queryKey, filters],
-        queryFn: ({ pageParam }: { pageParam: number }) => queryFn({ pageParam }),
-        initialPageParam: 0,
+        queryFn: ({ pageParam }: { pageParam: string | null }) => queryFn({ pageParam, filters }),
+        initialPageParam: null as string | null,
         getNextPageParam: (lastPage: FetchResult) => lastPage.nextCursor,
     })
 
-    // Filter projects client-side
-    const filteredPages = data?.pages.map(page => ({
-        ...page,
-        projects: filterProjects(page.projects, filters)
-    }))
-
     // Infinite scroll observer
     useEffect(() => {
         const observer = new IntersectionObserver(
@@ -217,16 +174,15 @@ function GameGrid({
     }
 
     const totalCount = data.pages[0]?.totalCount || 0
-    const filteredCount = filteredPages?.reduce((acc, page) => acc + page.projects.length, 0) || 0
 
-    if (filteredCount === 0) {
+    if (totalCount === 0) {
         return null
     }
 
     return (
         <div className="mb-3">
             <h2 className="text-2xl font-bold mb-6">
-                {title} ({filteredCount}{filteredCount !== totalCount ? ` of ${totalCount}` : ''})
+                {title} ({totalCount})
             </h2>
 
             <div
@@ -235,7 +191,7 @@ function GameGrid({
                     imageRendering: 'pixelated',
                 }}
             >
-                {filteredPages?.map((page, pageIndex) => (
+                {data.pages.map((page, pageIndex) => (
                     <div key={pageIndex} className="contents">
                         {page.projects.map((project) => (
                             <div
@@ -325,22 +281,14 @@ function RouteComponent() {
     const [allGenres, setAllGenres] = useState<string[]>([])
     const [allBaseGames, setAllBaseGames] = useState<string[]>([])
 
-    // Fetch and extract all unique genres and base games
+    // Fetch all genres and base games (with counts) for the filter dropdowns
     useEffect(() => {
         const loadFilters = async () => {
-            const { recommended, notTested } = await fetchManifest()
-            const allProjects = [...recommended, ...notTested]
-
-            const genres = new Set<string>()
-            const baseGames = new Set<string>()
-
-            allProjects.forEach(project => {
-                project.metadata.genre.forEach(g => genres.add(g))
-                baseGames.add(project.metadata.base_game)
-            })
+            const res = await fetch(`${API_BASE_URL}/games/facets`)
+            const facets: { genre: Record<string, number>, base_game: Record<string, number> } = await res.json()
 
-            setAllGenres(Array.from(genres).sort())
-            setAllBaseGames(Array.from(baseGames).sort())
+            setAllGenres(Object.keys(facets.genre).sort())
+            setAllBaseGames(Object.keys(facets.base_game).sort())
         }
 
         loadFilters()